@@ -1,41 +1,81 @@
 #!/usr/bin/env python3
 import argparse
-import pandas as pd
-from conference_scheduling.checks import check_data
-from conference_scheduling.utils import fill_data, print_err
-from conference_scheduling.scheduler import (
-    StreamsScheduler,
-    AbstractsScheduler,
+import sys
+from conference_scheduling.utils import print_err
+from conference_scheduling.scheduler.pipeline import schedule_conference
+from conference_scheduling.decomposition import decomposed_schedule
+from conference_scheduling.repair import (
+    read_edits,
+    repair_schedule,
+    solution_ids,
+    solution_shapes,
 )
-from conference_scheduling.heuristics import (
-    greedy_hill_climbing,
-    simulated_annealing,
-    slot_tabu_search,
-    steady_state_genetic_algorithm,
-    streams_population,
+from conference_scheduling.exceptions import (
+    IncompatibleDimensionsError,
+    InvalidEditError,
 )
-from conference_scheduling.exceptions import IncompatibleDimensionsError
+from conference_scheduling.profiling import ProfileStats, collecting
+from conference_scheduling.telemetry import Trace, tracing
+from conference_scheduling.checkpoint import CheckpointWriter
 from conference_scheduling.config import (
     DEFAULT_INPUT_FILE,
     DEFAULT_OUTPUT_FILE,
     DEFAULT_MAXITERS,
     DEFAULT_MINSCORE,
+    DEFAULT_WEIGHTS,
+    DEFAULT_CHECKPOINT_INTERVAL,
     SOLUTION_STREAMS_SHEET,
     SOLUTION_ABSTRACTS_SHEET,
 )
-from conference_scheduling.utils import write_schedule
+from conference_scheduling.writers import write_schedule
+from conference_scheduling.readers import (
+    INSTANCE_SHEETS,
+    read_data,
+    read_sheets,
+)
 
 
 def main():
+    # the subcommands are only imported when they run
+    # pylint: disable=import-outside-toplevel
+    if sys.argv[1:2] == ['serve']:
+        from conference_scheduling.service import main as serve
+        serve(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['sweep']:
+        from conference_scheduling.sweep import main as sweep
+        sweep(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['generate']:
+        from conference_scheduling.generator import main as generate
+        generate(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['bench']:
+        from conference_scheduling.benchmarks import main as bench
+        bench(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['anytime']:
+        from conference_scheduling.anytime import main as anytime
+        anytime(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['check']:
+        from conference_scheduling.differential import main as check
+        check(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='Generate a schedule for a conference.')
     parser.add_argument('-i', '--input', type=str,
                         default=DEFAULT_INPUT_FILE,
-                        help=(f'The conference spreadsheet.'
+                        help=(f'The conference spreadsheet, a .json'
+                              f' document, a .parquet directory or a'
+                              f' directory of CSV files without an extension.'
                               f' Default: "{DEFAULT_INPUT_FILE}"'))
     parser.add_argument('-o', '--output', type=str,
                         default=DEFAULT_OUTPUT_FILE,
-                        help=(f'The schedule output path.'
+                        help=(f'The schedule output path: an .xlsx workbook,'
+                              f' a .json document, a .parquet directory or a'
+                              f' directory of CSV files without an extension.'
                               f' Default: "{DEFAULT_OUTPUT_FILE}"'))
     parser.add_argument('-s', '--saved', type=str,
                         help='Continue from a previously generatred \
@@ -43,6 +83,20 @@ def main():
     parser.add_argument('-m', '--maxiters', type=int,
                         default=DEFAULT_MAXITERS,
                         help='Maximum number of iterations.')
+    parser.add_argument('--streams-hotspots', action='store_true',
+                        help="Draw the moves of the streams search towards"
+                             " the streams that carry the most penalty.")
+    parser.add_argument('--lns-iters', type=int, default=0,
+                        help="Iterations of a large neighbourhood search"
+                             " after the tabu search of the abstracts,"
+                             " which ruins and recreates whole timeblocks,"
+                             " streams or room-days, and swaps chains of"
+                             " clashing talks between timeblocks."
+                             " Default: 0")
+    parser.add_argument('--polish', action='store_true',
+                        help="Repack the sessions of every stream at the"
+                             " end of the abstracts search, keeping the"
+                             " repackings that improve the schedule.")
     parser.add_argument('-f', '--minscore', type=int,
                         default=DEFAULT_MINSCORE,
                         help="Minimum value of the Objective function")
@@ -62,24 +116,64 @@ def main():
         11. Abstracts vs Abstracts
         12. Consecutive sessions
         """,
-                        default=[1, 10, 1, 100, 1, 10, 1,
-                                 10000, 1000, 100, 10, 1])
+                        default=DEFAULT_WEIGHTS)
+    parser.add_argument('-d', '--decompose', action='store_true',
+                        help="Schedule every day of the conference"
+                             " in parallel and repair the stitched schedule."
+                             " Ignores the saved solution.")
+    parser.add_argument('-p', '--processes', type=int,
+                        help="Number of worker processes"
+                             " for the decomposition. Default: all cores")
+    parser.add_argument('-e', '--edits', type=str,
+                        help="A JSON list of edits to the instance."
+                             " Repairs the saved solution instead of"
+                             " scheduling from scratch.")
+    parser.add_argument('--disruption', type=float, default=0,
+                        help="Penalty for every published talk moved"
+                             " when repairing a saved solution. Default: 0")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print the time spent in every penalty"
+                             " component and in the local searches."
+                             " Work done in worker processes is not"
+                             " profiled.")
+    parser.add_argument('--verify-period', type=int,
+                        help="Check the incremental evaluation of the"
+                             " searches against a full evaluation every"
+                             " this many accepted moves.")
+    parser.add_argument('--trace', type=str,
+                        help="Record every search iteration to this file,"
+                             " see conference_scheduling.telemetry.read_trace")
+    parser.add_argument('-c', '--checkpoint', type=str,
+                        help="Keep the best schedule found so far in this"
+                             " .xlsx or .json file, which can be passed"
+                             " to --saved."
+                             " Ignored with --decompose and --edits.")
+    parser.add_argument('--checkpoint-interval', type=float,
+                        default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help="Minimum number of seconds between two writes"
+                             " of the checkpoint."
+                             f" Default: {DEFAULT_CHECKPOINT_INTERVAL}")
 
     args = parser.parse_args()
 
-    input_data = pd.read_excel(args.input, sheet_name=None)
-    fill_data(input_data)
-    check_data(input_data)
+    try:
+        input_data = read_data(args.input)
+    except KeyError as error:
+        print_err(f"The conference file: {args.input} is missing the"
+                  f" sheet {error}, it should contain the following sheets:"
+                  f" {', '.join(INSTANCE_SHEETS)}")
+        exit(1)
 
     saved_streams = None
     saved_abstracts = None
     if args.saved:
         try:
-            saved = pd.read_excel(args.saved,
-                                  sheet_name=[
-                                      SOLUTION_STREAMS_SHEET,
-                                      SOLUTION_ABSTRACTS_SHEET
-                                  ])
+            saved = read_sheets(args.saved,
+                                [
+                                    SOLUTION_STREAMS_SHEET,
+                                    SOLUTION_ABSTRACTS_SHEET
+                                ],
+                                index_col=0)
             saved_streams = saved[SOLUTION_STREAMS_SHEET]
             saved_abstracts = saved[SOLUTION_ABSTRACTS_SHEET]
         except KeyError:
@@ -88,47 +182,104 @@ def main():
                       f" '{SOLUTION_STREAMS_SHEET}' and"
                       f" '{SOLUTION_ABSTRACTS_SHEET}'")
             exit(1)
-        except IncompatibleDimensionsError:
-            print_err("The dimensions of the provided"
-                      " streams saved solution"
-                      " are not compatible with the instance data.")
+
+    stats = ProfileStats() if args.profile else None
+    trace = Trace(args.trace) if args.trace else None
+    checkpoint = None
+    if args.checkpoint and not (args.edits or args.decompose):
+        checkpoint = CheckpointWriter(args.checkpoint, input_data,
+                                      interval=args.checkpoint_interval)
+    # the checkpoint and the trace are closed even when scheduling fails,
+    # so that the best schedule so far and the trace are written out
+    try:
+        with collecting(stats), tracing(trace):
+            input_data, streams_scheduler, abstracts_scheduler = schedule(
+                args, input_data, saved_streams, saved_abstracts, checkpoint)
+
+        write_schedule(args.output,
+                       streams_scheduler, abstracts_scheduler,
+                       input_data['abstracts'],
+                       input_data['streams'],
+                       input_data['sessions'],
+                       input_data['rooms'])
+    except IncompatibleDimensionsError as error:
+        print_err(f"The provided saved solution: {args.saved}"
+                  f" is not compatible with the instance data: {error}")
+        exit(1)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if trace is not None:
+            trace.close()
+    if stats is not None:
+        print('Profile:')
+        print(stats.report())
+
+
+def schedule(args, input_data, saved_streams, saved_abstracts, checkpoint):
+    """schedules the conference as requested by the command line,
+    returns the instance data and the streams and abstracts schedulers
+    """
+    if args.edits:
+        if saved_streams is None:
+            print_err("Repairing a schedule after edits"
+                      " requires a saved solution.")
             exit(1)
+        try:
+            input_data, streams_scheduler, abstracts_scheduler = repair_schedule(
+                input_data, args.weights,
+                saved_streams, saved_abstracts,
+                read_edits(args.edits),
+                disruption=args.disruption)
+        except InvalidEditError as error:
+            print_err(f"The edits file: {args.edits} does not fit"
+                      f" the conference: {error}")
+            exit(1)
+        print(f"Abstracts score: {abstracts_scheduler.score}")
+        print("Moved talks:"
+              f" {abstracts_scheduler.moved(abstracts_scheduler.solution)}")
+    elif args.decompose:
+        streams_scheduler, abstracts_scheduler = decomposed_schedule(
+            input_data, args.weights,
+            max_iters=args.maxiters,
+            processes=args.processes)
+        print(f"Streams score: {streams_scheduler.score}")
+        print(f"Abstracts score: {abstracts_scheduler.score}")
+    else:
+        streams_solution = abstracts_solution = None
+        if saved_streams is not None:
+            streams_shape, abstracts_shape = solution_shapes(input_data)
+            streams_solution = solution_ids(
+                saved_streams, list(input_data['streams']['Streams']),
+                streams_shape)
+            abstracts_solution = solution_ids(
+                saved_abstracts, list(input_data['abstracts']['Reference']),
+                abstracts_shape)
+
+        def prepare(phase, scheduler):
+            print(f"{phase.capitalize()}:")
+            scheduler.verify(period=args.verify_period)
+            scheduler.checkpoint(checkpoint, phase)
+            print(f"Initial score: {scheduler.score}")
+
+        def finish(phase, scheduler):
+            print(f"Final score: {scheduler.score}")
+            if checkpoint is not None:
+                checkpoint.submit(phase, scheduler.solution)
+
+        streams_scheduler, abstracts_scheduler = schedule_conference(
+            input_data, args.weights,
+            streams_solution=streams_solution,
+            abstracts_solution=abstracts_solution,
+            max_iters=args.maxiters,
+            streams_hotspots=args.streams_hotspots,
+            lns_iters=args.lns_iters,
+            polish=args.polish,
+            report_period=max(1, args.maxiters//10),
+            prepare=prepare,
+            finish=finish)
 
-    print('Streams:')
-    streams_scheduler = StreamsScheduler(input_data,
-                                         args.weights,
-                                         initial_streams=saved_streams)
-    if saved_streams is None:
-        streams_scheduler.initialize()
-    print(f"Initial score: {streams_scheduler.score}")
-    streams_scheduler.improve(steady_state_genetic_algorithm,
-                              streams_population(input_data, 40),
-                              report_period=max(1, args.maxiters//10),
-                              max_iters=args.maxiters)
-    print(f"Final score: {streams_scheduler.score}")
-
-    print('Abstracts:')
-    abstracts_scheduler = AbstractsScheduler(input_data, args.weights,
-                                             streams_scheduler.solution,
-                                             initial_abstracts=saved_abstracts)
-    if saved_abstracts is None:
-        abstracts_scheduler.initialize()
-    print(f"Initial score: {abstracts_scheduler.score}")
-    abstracts_scheduler.improve(slot_tabu_search,
-                                explore_size=150,
-                                items_length=250,
-                                pos_length=100,
-                                idle_threshold=0.1,
-                                report_period=max(1, args.maxiters//10),
-                                max_iters=args.maxiters)
-    print(f"Final score: {abstracts_scheduler.score}")
-
-    write_schedule(args.output,
-                   streams_scheduler, abstracts_scheduler,
-                   input_data['abstracts'],
-                   input_data['streams'],
-                   input_data['sessions'],
-                   input_data['rooms'])
+    return input_data, streams_scheduler, abstracts_scheduler
 
 
 if __name__ == '__main__':
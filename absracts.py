@@ -1,11 +1,13 @@
-from collections import deque
+from collections import defaultdict, deque
 import numpy as np
 from ..utils import (
     unique_scheduled_elements,
-    scheduled_1d
+    column_run_lengths
 )
+from ..profiling import profiled
 
 
+@profiled
 def evaluate_abstracts_sessions(solution, streams_solution,
                                 timeblock_to_timeslots,
                                 sessions_df,
@@ -30,6 +32,7 @@ def evaluate_abstracts_sessions(solution, streams_solution,
     return penalty
 
 
+@profiled
 def partial_abstracts_sessions(solution, new_solution, changed,
                                timeslot_to_timeblock,
                                sessions_df,
@@ -52,12 +55,45 @@ def partial_abstracts_sessions(solution, new_solution, changed,
     return partial_penalty
 
 
+@profiled
 def evaluate_abstracts_order(solution, streams_solution, streams,
                              abstracts_df,
                              session_to_timeslots,
                              violations=False):
     penalty = 0
     violations_list = []
+
+    # the runs of ordered abstracts in each (timeblock, room) of the
+    # streams, found with a single pass over the cells of their sessions
+    streams = list(streams)
+    session_timeblocks, session_rooms = np.nonzero(
+        np.isin(streams_solution, streams))
+    bounds = np.array([session_to_timeslots[timeblock]
+                       for timeblock in session_timeblocks],
+                      dtype=np.int64).reshape(-1, 2)
+    session_lengths = bounds[:, 1] - bounds[:, 0]
+    session_offsets = np.cumsum(session_lengths) - session_lengths
+    cell_timeslots = (np.repeat(bounds[:, 0], session_lengths)
+                      + np.arange(session_lengths.sum())
+                      - np.repeat(session_offsets, session_lengths))
+    cell_rooms = np.repeat(session_rooms, session_lengths)
+    cells = solution[cell_timeslots, cell_rooms]
+    starts, _lengths, abstracts, _columns = column_run_lengths(
+        cells[:, None], breaks=session_offsets)
+    scheduled = abstracts != -1
+    starts, abstracts = starts[scheduled], abstracts[scheduled]
+    orders = abstracts_df["Order"].to_numpy()[abstracts]
+    ordered = orders != 0
+    starts, abstracts, orders = (starts[ordered], abstracts[ordered],
+                                 orders[ordered])
+    run_sessions = np.searchsorted(session_offsets, starts, side='right') - 1
+    ordered_runs = defaultdict(list)
+    for session, timeslot, abstract, order in zip(
+            run_sessions, cell_timeslots[starts], abstracts, orders):
+        ordered_runs[session_timeblocks[session],
+                     session_rooms[session]].append((timeslot, abstract,
+                                                     order))
+
     for stream in streams:
         timeblocks, rooms = np.nonzero(streams_solution == stream)
         stream_orders = deque()
@@ -66,12 +102,9 @@ def evaluate_abstracts_order(solution, streams_solution, streams,
             assoc_rooms = rooms[np.flatnonzero(timeblocks == timeblock)]
             timeblock_orders = [[] for _timeslot in range(start, end)]
             for room in assoc_rooms:
-                abstracts = solution[start:end, room]
-                for timeslot, _length in scheduled_1d(abstracts):
-                    abstract = solution[start + timeslot, room]
-                    order = abstracts_df.at[abstract, "Order"]
-                    if order != 0:
-                        timeblock_orders[timeslot].append((abstract, order))
+                for timeslot, abstract, order in ordered_runs[timeblock, room]:
+                    timeblock_orders[timeslot - start].append((abstract,
+                                                               order))
             stream_orders.extend(timeblock_orders)
         while stream_orders:
             for abstract, order in stream_orders.popleft():
@@ -87,6 +120,7 @@ def evaluate_abstracts_order(solution, streams_solution, streams,
     return penalty
 
 
+@profiled
 def partial_abstracts_order(solution, new_solution, changed,
                             streams_solution,
                             abstracts_df,
@@ -107,6 +141,7 @@ def partial_abstracts_order(solution, new_solution, changed,
                                        session_to_timeslots))
 
 
+@profiled
 def evaluate_scheduled(solution, abstracts, violations=False):
     solution_abstracts = solution.ravel()
     num_slots = len(solution_abstracts)
@@ -122,6 +157,7 @@ def evaluate_scheduled(solution, abstracts, violations=False):
     return len(unscheduled)
 
 
+@profiled
 def partial_scheduled(solution, new_solution, changed):
     changed_abstracts = unique_scheduled_elements(changed,
                                                   solution, new_solution)
@@ -130,6 +166,7 @@ def partial_scheduled(solution, new_solution, changed):
             - evaluate_scheduled(solution, changed_abstracts))
 
 
+@profiled
 def evaluate_abstracts_abstracts(solution,
                                  abstracts, abstracts_df,
                                  timeslot_to_timeblock,
@@ -160,6 +197,7 @@ def evaluate_abstracts_abstracts(solution,
     return penalty
 
 
+@profiled
 def partial_abstracts_abstracts(solution, new_solution, changed,
                                 abstracts_df,
                                 timeslot_to_session, session_to_timeslots):
@@ -1,8 +1,17 @@
+import random
+from collections import defaultdict
 import numpy as np
 
 from .scheduler import Scheduler
-from ..operators import abstracts_solution_neighbourhood
+from ..operators import abstracts_solution_neighbourhood, apply_changes
+from ..operators.buckets import AbstractsBuckets
+from ..operators.ruin import RuinAndRecreate
+from ..operators.packing import SessionPacker
+from ..operators.kempe import KempeChains
+from .hotspots import AbstractsHotspots
+from .placement import AbstractsPlacement
 from ..penalties import evaluate_abstracts, partial_evaluate_abstracts
+from ..penalties.bounds import abstracts_lower_bound
 from ..utils import session_to_timeslots_map
 from ..exceptions import IncompatibleDimensionsError
 
@@ -10,15 +19,24 @@ from ..exceptions import IncompatibleDimensionsError
 class AbstractsScheduler(Scheduler):
     def __init__(self, input_data, weights,
                  streams_solution,
-                 initial_abstracts=None):
+                 initial_abstracts=None,
+                 exploration=0.2):
         super().__init__(input_data, weights)
         self.streams_solution = streams_solution
         self._num_slots = self._sessions['Max number of talks'].sum()
+        self._lengths = self._abstracts['Required Timeslots'].to_numpy(
+            dtype=np.int32)
+        self._exploration = exploration
+        # the neighbourhood helpers, built on first use from the
+        # streams solution they were built for
+        self._helpers = {}
 
-        self.abstract_solution = None
+        # the solution is stored as an AbstractsPlacement,
+        # its grid is only materialized when it is read
+        self.placement = None
         if (initial_abstracts is not None
                 and initial_abstracts.shape == (self._num_slots, self._num_rooms)):
-            self.abstract_solution = np.full_like(initial_abstracts, -1)
+            solution = np.full(initial_abstracts.shape, -1, dtype=int)
             scheduled = initial_abstracts.notna()
             abstracts_map = dict(zip(
                 list(self._abstracts["Reference"]),
@@ -28,17 +46,22 @@ class AbstractsScheduler(Scheduler):
                 for room in range(self._num_rooms):
                     if scheduled.iloc[slot, room]:
                         abstract = initial_abstracts.iloc[slot, room]
-                        self.abstract_solution[slot, room] = (
-                            abstracts_map[abstract]
-                        )
+                        solution[slot, room] = abstracts_map[abstract]
+            self.solution = solution
         elif initial_abstracts is not None:
             raise IncompatibleDimensionsError
 
-    def initialize(self):
-        self.abstract_solution = initial_solution(self.streams_solution,
-                                                  self._abstracts,
-                                                  self._streams,
-                                                  self._sessions)
+    def initialize(self, best_fit=False):
+        build = best_fit_solution if best_fit else initial_solution
+        self.solution = build(self.streams_solution,
+                              self._abstracts,
+                              self._streams,
+                              self._sessions)
+
+    @property
+    def lower_bound(self):
+        """no abstracts schedule of the instance scores less"""
+        return abstracts_lower_bound(self._input_data, self._weights)
 
     def _weighted_penalty(self, penalties):
         return (self._weights[7] * penalties.scheduled
@@ -54,6 +77,18 @@ class AbstractsScheduler(Scheduler):
                                   self._sessions,
                                   violations=violations)
 
+    def _evaluate_cached(self, solution, _key):
+        # the totals of every component follow from its violations,
+        # so the violations fill both cache entries
+        return super()._evaluate_cached(solution, 'violations')
+
+    def _totals(self, violations):
+        return violations._replace(
+            scheduled=len(violations.scheduled),
+            order=sum(penalty for _, penalty in violations.order),
+            sessions=sum(penalty for *_, penalty in violations.sessions),
+            conflicts=len(violations.conflicts))
+
     def _partial_evaluate(self, solution, changes):
         return partial_evaluate_abstracts(solution, changes,
                                           self.streams_solution,
@@ -67,13 +102,156 @@ class AbstractsScheduler(Scheduler):
                                                 self._abstracts,
                                                 self._sessions)
 
+    def feasible_neighbourhood(self, solution):
+        """only proposes moves into free gaps of an abstract's own stream
+        and swaps between abstracts of the same stream and length
+        """
+        return self._buckets.neighbourhood(solution)
+
+    def hotspot_neighbourhood(self, solution):
+        """like `feasible_neighbourhood`, but moves abstracts drawn in
+        proportion to their penalty contributions, or uniformly
+        with probability `exploration`
+        """
+        # refreshed on the first neighbour, so that profiling
+        # times the refresh as neighbourhood time
+        hotspots = self._hotspots
+        hotspots.refresh(solution)
+        yield from self._buckets.neighbourhood(solution,
+                                               choose=hotspots.sample)
+
+    def ruin_neighbourhood(self, solution):
+        """destroys a random timeblock, stream or room-day
+        and greedily re-inserts its abstracts
+        """
+        return self._ruin.neighbourhood(solution)
+
+    def packing_neighbourhood(self, solution):
+        """repacks a random session of a stream,
+        or a session together with the next one of its stream
+        """
+        return self._packer.neighbourhood(solution)
+
+    def kempe_neighbourhood(self, solution):
+        """swaps whole chains of clashing abstracts
+        between two timeblocks
+        """
+        return self._kempe.neighbourhood(solution)
+
+    def large_neighbourhood(self, solution, kempe_prob=0.4, packing_prob=0.2):
+        """either swaps a chain of clashing abstracts between two
+        timeblocks, with probability `kempe_prob`, repacks a session
+        group, with probability `packing_prob`, or ruins and recreates
+        a region. Falls back on the others when the chosen one cannot
+        change the schedule, and stops when none can
+        """
+        ruin = self.ruin_neighbourhood(solution)
+        kempe = self.kempe_neighbourhood(solution)
+        packing = self.packing_neighbourhood(solution)
+        while True:
+            draw = random.random()
+            if draw < kempe_prob:
+                neighbourhoods = (kempe, packing, ruin)
+            elif draw < kempe_prob + packing_prob:
+                neighbourhoods = (packing, ruin, kempe)
+            else:
+                neighbourhoods = (ruin, kempe, packing)
+            changes = None
+            for neighbourhood in neighbourhoods:
+                changes = next(neighbourhood, None)
+                if changes is not None:
+                    break
+            if changes is None:
+                return
+            yield changes
+
+    @property
+    def _buckets(self):
+        return self._helper('buckets', lambda: AbstractsBuckets(
+            self.streams_solution,
+            self._streams,
+            self._abstracts,
+            self._sessions))
+
+    @property
+    def _hotspots(self):
+        return self._helper('hotspots', lambda: AbstractsHotspots(
+            self.streams_solution,
+            self._weights,
+            self._streams,
+            self._abstracts,
+            self._sessions,
+            exploration=self._exploration))
+
+    @property
+    def _ruin(self):
+        return self._helper('ruin', lambda: RuinAndRecreate(
+            self.streams_solution,
+            self._weights,
+            self._streams,
+            self._abstracts,
+            self._sessions))
+
+    @property
+    def _packer(self):
+        return self._helper('packer', lambda: SessionPacker(
+            self.streams_solution,
+            self._weights,
+            self._streams,
+            self._abstracts,
+            self._sessions))
+
+    @property
+    def _kempe(self):
+        return self._helper('kempe', lambda: KempeChains(
+            self.streams_solution,
+            self._streams,
+            self._abstracts,
+            self._sessions))
+
+    def _helper(self, name, build):
+        """the helper `name`, built by `build` on first use and again
+        whenever the streams solution has changed since
+        """
+        streams_solution, helper = self._helpers.get(name, (None, None))
+        if (streams_solution is None
+                or not np.array_equal(streams_solution,
+                                      self.streams_solution)):
+            helper = build()
+            self._helpers[name] = (np.copy(self.streams_solution), helper)
+        return helper
+
+    def polish(self, max_nodes=None, streams=None):
+        """Repacks every session group of every stream, or of the given
+        streams, keeping the repackings that improve the schedule.
+        The repacking is exact unless it is cut off after `max_nodes` nodes
+        """
+        packer = self._packer
+        packer.max_nodes = max_nodes
+        solution = np.copy(self.solution)
+        for sessions in packer.session_groups(streams):
+            changes = packer.repack(solution, sessions)
+            if (changes is not None
+                    and self._weighted_partial_evaluate(solution,
+                                                        changes) < 0):
+                apply_changes(solution, changes)
+        self.solution = solution
+
     @property
     def solution(self):
-        return self.abstract_solution
+        if self.placement is None:
+            return None
+        return self.placement.grid
 
     @solution.setter
     def solution(self, solution):
-        self.abstract_solution = solution
+        if solution is None:
+            self.placement = None
+        elif (self.placement is None
+              or solution is not self.placement.grid):
+            self.placement = AbstractsPlacement.from_grid(solution,
+                                                          self._lengths)
+        self._touch()
 
 
 def initial_solution(streams_solution, abstracts, streams, sessions):
@@ -123,3 +301,76 @@ def initial_solution(streams_solution, abstracts, streams, sessions):
                     break
                 # if the abstract cannot scheduled move to the next slot
     return solution
+
+
+def best_fit_solution(streams_solution, abstracts, streams, sessions):
+    """Builds an abstracts schedule from an index of the free gaps
+    in the sessions owned by each stream, ordered by time.
+    Ordered abstracts are placed first, in order, in the earliest gap
+    that fits; the others are placed best-fit, in the gap with the
+    cheapest timeblock that leaves the fewest timeslots free
+    """
+    total_timeslots = sessions['Max number of talks'].sum()
+    _num_sessions, num_rooms = streams_solution.shape
+    session_to_timeslots = session_to_timeslots_map(sessions)
+    session_names = list(sessions['Sessions'])
+    solution = np.full((total_timeslots, num_rooms), -1, dtype=int)
+
+    # [start, length, room, session] of the free gaps of each stream
+    gaps = defaultdict(list)
+    for session, room in np.argwhere(streams_solution != -1):
+        start, end = session_to_timeslots[session]
+        stream = streams_solution[session, room]
+        gaps[stream].append([start, end - start, room, session])
+
+    stream_ids = dict(zip(streams['Streams'], streams.index))
+    lengths = abstracts['Required Timeslots'].astype(int)
+    orders = abstracts['Order']
+
+    def place(abstract, gap):
+        start, _length, room, _session = gap
+        end = start + lengths[abstract]
+        solution[start:end, room] = abstract
+        gap[0] = end
+        gap[1] -= lengths[abstract]
+
+    def cost(abstract, gap):
+        return abstracts.at[abstract, session_names[gap[3]]]
+
+    for stream_name, stream_abstracts in abstracts.groupby('Stream').groups.items():
+        # the abstracts of an unknown stream cannot be scheduled
+        if stream_name not in stream_ids:
+            continue
+        stream_gaps = gaps[stream_ids[stream_name]]
+        ordered = sorted((abstract for abstract in stream_abstracts
+                          if orders[abstract] != 0),
+                         key=lambda abstract: orders[abstract])
+        # shortest first, every unscheduled abstract costs the same
+        unordered = sorted((abstract for abstract in stream_abstracts
+                            if orders[abstract] == 0),
+                           key=lambda abstract: lengths[abstract])
+
+        # keep ordered abstracts from starting before their predecessors
+        cursor = 0
+        for abstract in ordered:
+            fitting = [gap for gap in stream_gaps
+                       if gap[1] >= lengths[abstract]]
+            following = [gap for gap in fitting if gap[0] >= cursor]
+            if following:
+                gap = min(following,
+                          key=lambda gap: (gap[0], cost(abstract, gap)))
+                cursor = gap[0]
+                place(abstract, gap)
+            elif fitting:
+                place(abstract, min(fitting,
+                                    key=lambda gap: cost(abstract, gap)))
+
+        for abstract in unordered:
+            fitting = [gap for gap in stream_gaps
+                       if gap[1] >= lengths[abstract]]
+            if fitting:
+                place(abstract, min(fitting, key=lambda gap: (
+                    cost(abstract, gap),
+                    gap[1] - lengths[abstract],
+                    gap[0])))
+    return solution
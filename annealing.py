@@ -36,6 +36,8 @@ def simulated_annealing(solution, evaluate, partial_evaluate,
                         init_prob=0.95,
                         sat_prob=0.05,
                         report_period=None,
+                        lower_bound=None,
+                        callback=None,
                         idle_threshold=0.20,
                         min_iters=200,
                         max_iters=500):
@@ -50,6 +52,8 @@ def simulated_annealing(solution, evaluate, partial_evaluate,
                         evaluate, partial_evaluate, neighbourhood,
                         condition,
                         report_period=report_period,
+                        lower_bound=lower_bound,
+                        callback=callback,
                         idle_threshold=idle_threshold,
                         explore_size=1,
                         min_iters=min_iters,
@@ -0,0 +1,196 @@
+"""
+Solution quality against wall-clock time: every heuristic is run with
+fixed seeds on generated instances of several sizes, recording the
+best score over time, and the runs are summarized at several budgets
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .generator import generate_data
+from .benchmarks import SIZES
+from .scheduler import StreamsScheduler, AbstractsScheduler
+from .scheduler.assignment import assignment_streams_solution
+from .heuristics import (
+    greedy_hill_climbing,
+    simulated_annealing,
+    slot_tabu_search,
+    full_tabu_search,
+    steady_state_genetic_algorithm,
+    streams_population,
+)
+from .config import DEFAULT_WEIGHTS
+
+# the heuristics and their parameters, the local searches never
+# stop on their own (an idle threshold of 1) so that the budget does
+HEURISTICS = {
+    'greedy_hill_climbing': (greedy_hill_climbing, {
+        'idle_threshold': None}),
+    # the cooling schedule needs a number of iterations
+    'simulated_annealing': (simulated_annealing, {
+        'max_delta': 100, 'idle_threshold': None, 'max_iters': 20000}),
+    'slot_tabu_search': (slot_tabu_search, {
+        'explore_size': 150, 'items_length': 250, 'pos_length': 100}),
+    'full_tabu_search': (full_tabu_search, {
+        'explore_size': 150}),
+    'steady_state_genetic_algorithm': (steady_state_genetic_algorithm, {}),
+}
+
+UNBOUNDED_ITERS = 10 ** 9
+
+
+def run(size, heuristic, seed, budget, problem='streams',
+        weights=DEFAULT_WEIGHTS, instance_seed=0):
+    """Runs a heuristic with `seed` for `budget` seconds on the instance
+    of `size` generated with `instance_seed`,
+    returns its (seconds, best score) curve
+    """
+    input_data = generate_data(seed=instance_seed, **SIZES[size])
+    random.seed(seed)
+    np.random.seed(seed)
+
+    scheduler = StreamsScheduler(input_data, weights)
+    scheduler.solution = assignment_streams_solution(input_data, weights)
+    if problem == 'abstracts':
+        scheduler = AbstractsScheduler(input_data, weights, scheduler.solution)
+        scheduler.initialize(best_fit=True)
+    initial_score = scheduler.score
+
+    function, params = HEURISTICS[heuristic]
+    params = dict({'max_iters': UNBOUNDED_ITERS}, **params)
+    args = ()
+    if function is steady_state_genetic_algorithm:
+        args = (streams_population(input_data, 40),)
+
+    curve = [(0.0, initial_score)]
+    iterations = 0
+    start = time.perf_counter()
+
+    def callback(iteration, improvement):
+        nonlocal iterations
+        iterations = iteration
+        elapsed = time.perf_counter() - start
+        if initial_score - improvement < curve[-1][1]:
+            curve.append((elapsed, initial_score - improvement))
+        return elapsed < budget
+
+    scheduler.improve(function, *args, callback=callback, **params)
+    return {'size': size,
+            'heuristic': heuristic,
+            'seed': seed,
+            'problem': problem,
+            'iterations': iterations,
+            'elapsed': time.perf_counter() - start,
+            'final_score': scheduler.score,
+            'curve': curve}
+
+
+def best_at(curve, seconds):
+    """the best score of a curve after `seconds`"""
+    times = [point[0] for point in curve]
+    return curve[np.searchsorted(times, seconds, side='right') - 1][1]
+
+
+def area_under_curve(curve, budget):
+    """the mean best score over the first `budget` seconds"""
+    times = [min(point[0], budget) for point in curve] + [budget]
+    scores = [point[1] for point in curve]
+    return float(np.dot(np.diff(times), scores) / budget)
+
+
+def time_to_target(curve, target):
+    """the seconds until the best score reaches `target`,
+    None if it never does
+    """
+    return next((seconds for seconds, score in curve if score <= target),
+                None)
+
+
+def summarize(runs, budgets, target_gap=0.05):
+    """Summarizes every run at every budget: the best score, the area
+    under the curve and the time to come within `target_gap` of the
+    best score found on the instance by any run within the budgets
+    """
+    records = []
+    best = {}
+    for result in runs:
+        best[result['size']] = min(best.get(result['size'], np.inf),
+                                   best_at(result['curve'], max(budgets)))
+    for result in runs:
+        target = best[result['size']] + target_gap * abs(best[result['size']])
+        reached = time_to_target(result['curve'], target)
+        for budget in budgets:
+            records.append({
+                'size': result['size'],
+                'heuristic': result['heuristic'],
+                'seed': result['seed'],
+                'budget': budget,
+                'score': best_at(result['curve'], budget),
+                'auc': area_under_curve(result['curve'], budget),
+                'time_to_target': (reached if reached is not None
+                                   and reached <= budget else np.nan),
+            })
+    return pd.DataFrame(records)
+
+
+def anytime(sizes, heuristics, seeds, budgets, problem='streams',
+            processes=None):
+    """Runs every heuristic once per size and seed for the largest
+    budget, the smaller budgets are read off the same curves
+    """
+    if problem == 'abstracts':
+        # the population of the genetic algorithm is of streams schedules
+        heuristics = [heuristic for heuristic in heuristics
+                      if heuristic != 'steady_state_genetic_algorithm']
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(run, size, heuristic, seed,
+                                   max(budgets), problem)
+                   for size in sizes
+                   for heuristic in heuristics
+                   for seed in seeds]
+        runs = []
+        for future in futures:
+            runs.append(future.result())
+            print(f"{len(runs)}/{len(futures)} {runs[-1]['size']}"
+                  f" {runs[-1]['heuristic']} seed {runs[-1]['seed']}:"
+                  f" {runs[-1]['curve'][0][1]} -> {runs[-1]['final_score']}"
+                  f" in {runs[-1]['iterations']} iterations")
+    return runs
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule anytime',
+        description='Compare the heuristics over wall-clock budgets.')
+    parser.add_argument('-s', '--sizes', type=str, nargs='+',
+                        choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('-H', '--heuristics', type=str, nargs='+',
+                        choices=list(HEURISTICS), default=list(HEURISTICS))
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('-b', '--budgets', type=float, nargs='+',
+                        default=[1, 5, 30],
+                        help='Wall-clock budgets in seconds.')
+    parser.add_argument('--problem', type=str, default='streams',
+                        choices=['streams', 'abstracts'])
+    parser.add_argument('--target-gap', type=float, default=0.05,
+                        help='The target is this fraction above the best'
+                             ' score found on the instance. Default: 0.05')
+    parser.add_argument('-p', '--processes', type=int,
+                        help='Number of worker processes. Default: all cores')
+    parser.add_argument('-o', '--output', type=str,
+                        help='Write the curves and the summary as JSON.')
+    args = parser.parse_args(args)
+
+    runs = anytime(args.sizes, args.heuristics, args.seeds, args.budgets,
+                   problem=args.problem, processes=args.processes)
+    summary = summarize(runs, args.budgets, target_gap=args.target_gap)
+    print(summary.groupby(['size', 'budget', 'heuristic'])[
+        ['score', 'auc', 'time_to_target']].mean().to_string())
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'runs': runs,
+                       'summary': summary.to_dict(orient='records')},
+                      output_file, indent=2, default=float)
@@ -0,0 +1,113 @@
+"""
+A minimum-cost assignment warm start for the streams phase
+"""
+import numpy as np
+from ..utils import required_sessions_per_stream
+
+
+def assignment_streams_solution(input_data, weights):
+    """A streams solution that assigns the sessions required by each
+    stream to (session, room) cells with a minimum-cost assignment
+    over the combined stream/session, stream/room and session/room costs
+    """
+    streams = input_data['streams']
+    sessions = input_data['sessions']
+    num_streams = len(streams.index)
+    num_sessions = len(sessions.index)
+    num_rooms = len(input_data['rooms'].index)
+    costs = cell_costs(input_data, weights)
+
+    # one row for every session required by a stream
+    required_sessions = required_sessions_per_stream(
+        streams, input_data['abstracts'], sessions).astype(int)
+    required_sessions = np.maximum(required_sessions, 1)
+    row_streams = np.repeat(np.arange(num_streams), required_sessions)
+    costs = costs[row_streams]
+
+    # when there are more sessions than cells,
+    # schedule every stream at least once before any second session
+    first_sessions = np.cumsum(required_sessions) - required_sessions
+    costs[first_sessions] -= np.ptp(costs) + 1
+
+    rows, cells = linear_sum_assignment(costs)
+    solution = np.full((num_sessions, num_rooms), -1, dtype=int)
+    solution.flat[cells] = row_streams[rows]
+    return solution
+
+
+def cell_costs(input_data, weights):
+    """the combined stream/session, stream/room and session/room cost
+    of each stream in every cell of a streams solution,
+    as a (streams, sessions * rooms) array
+    """
+    num_streams = len(input_data['streams'].index)
+    num_sessions = len(input_data['sessions'].index)
+    num_rooms = len(input_data['rooms'].index)
+
+    # the penalty sheets are indexed by position, as in the evaluators
+    streams_sessions = input_data['streams_sessions|penalty'].iloc[
+        :num_streams, 1:num_sessions + 1].to_numpy(dtype=float)
+    streams_rooms = input_data['streams_rooms|penalty'].iloc[
+        :num_streams, 1:num_rooms + 1].to_numpy(dtype=float)
+    sessions_rooms = input_data['sessions_rooms|penalty'].iloc[
+        :num_sessions, 1:num_rooms + 1].to_numpy(dtype=float)
+    costs = (weights[3] * streams_sessions[:, :, None]
+             + weights[4] * streams_rooms[:, None, :]
+             + weights[5] * sessions_rooms[None, :, :])
+    return costs.reshape(num_streams, num_sessions * num_rooms)
+
+
+def linear_sum_assignment(costs):
+    """Solves the rectangular minimum-cost assignment problem
+    with the shortest augmenting path variant of the Hungarian algorithm.
+    Returns the (rows, columns) of the assigned pairs
+    """
+    costs = np.asarray(costs, dtype=float)
+    if costs.shape[0] > costs.shape[1]:
+        columns, rows = linear_sum_assignment(costs.T)
+        order = np.argsort(rows)
+        return rows[order], columns[order]
+
+    num_rows, num_columns = costs.shape
+    # potentials and matching are 1-based, column 0 is a virtual column
+    row_potentials = np.zeros(num_rows + 1)
+    column_potentials = np.zeros(num_columns + 1)
+    matched_rows = np.zeros(num_columns + 1, dtype=int)
+    previous_columns = np.zeros(num_columns + 1, dtype=int)
+
+    for row in range(1, num_rows + 1):
+        matched_rows[0] = row
+        column = 0
+        min_reduced = np.full(num_columns + 1, np.inf)
+        used = np.zeros(num_columns + 1, dtype=bool)
+        while matched_rows[column] != 0:
+            used[column] = True
+            current_row = matched_rows[column]
+            free = ~used
+            free[0] = False
+            reduced = (costs[current_row - 1]
+                       - row_potentials[current_row]
+                       - column_potentials[1:])
+            improved = np.flatnonzero(free[1:]
+                                      & (reduced < min_reduced[1:])) + 1
+            min_reduced[improved] = reduced[improved - 1]
+            previous_columns[improved] = column
+
+            next_column = np.argmin(np.where(free, min_reduced, np.inf))
+            delta = min_reduced[next_column]
+            used_columns = np.flatnonzero(used)
+            row_potentials[matched_rows[used_columns]] += delta
+            column_potentials[used_columns] -= delta
+            min_reduced[free] -= delta
+            column = next_column
+
+        # augment along the alternating path
+        while column != 0:
+            previous = previous_columns[column]
+            matched_rows[column] = matched_rows[previous]
+            column = previous
+
+    columns = np.flatnonzero(matched_rows[1:])
+    rows = matched_rows[columns + 1] - 1
+    order = np.argsort(rows)
+    return rows[order], columns[order]
@@ -0,0 +1,262 @@
+"""
+Micro-benchmarks of the full and partial evaluators on generated
+instances of increasing size, under random moves of the operators
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+import numpy as np
+from .generator import generate_data
+from .scheduler.abstracts import initial_solution
+from .heuristics import streams_population
+from .operators import apply_changes, swap_two_slots, swap_abstracts
+from .operators.buckets import abstracts_positions
+from .penalties.streams import (
+    evaluate_penalties,
+    partial_penalties,
+    evaluate_streams_streams,
+    partial_streams_streams,
+    evaluate_parallel_streams,
+    partial_parallel_streams,
+)
+from .penalties.abstracts import (
+    evaluate_abstracts_order,
+    partial_abstracts_order,
+    evaluate_abstracts_abstracts,
+    partial_abstracts_abstracts,
+)
+from .utils import (
+    required_sessions_per_stream,
+    session_to_timeslots_map,
+    timeslot_to_session_map,
+)
+
+# the knobs of `generate_data` for every size, smallest first
+SIZES = {
+    'small': dict(num_days=1, timeblocks_per_day=4, num_rooms=5,
+                  num_streams=10, num_abstracts=100),
+    'medium': dict(num_days=2, timeblocks_per_day=4, num_rooms=20,
+                   num_streams=45, num_abstracts=330),
+    'large': dict(num_days=3, timeblocks_per_day=4, num_rooms=30,
+                  num_streams=100, num_abstracts=2000),
+    'huge': dict(num_days=5, timeblocks_per_day=4, num_rooms=50,
+                 num_streams=200, num_abstracts=10000),
+}
+
+
+class Context:
+    """A generated instance with a random streams schedule,
+    its first-fit abstracts schedule and random moves of both
+    """
+
+    def __init__(self, size, num_moves=100, seed=0):
+        random.seed(seed)
+        np.random.seed(seed)
+        data = generate_data(seed=seed, **SIZES[size])
+        self.data = data
+        self.sessions = data['sessions']
+        self.abstracts = data['abstracts']
+        self.stream_ids = list(data['streams'].index)
+        self.required_sessions = required_sessions_per_stream(
+            data['streams'], self.abstracts, self.sessions)
+        self.session_to_timeslots = session_to_timeslots_map(self.sessions)
+        self.timeslot_to_session = timeslot_to_session_map(self.sessions)
+
+        self.streams_solution = streams_population(data, 1)[0]
+        self.abstracts_solution = initial_solution(self.streams_solution,
+                                                   self.abstracts,
+                                                   data['streams'],
+                                                   self.sessions)
+        self.streams_moves = self._moves(self.streams_solution,
+                                         self._streams_swaps(num_moves))
+        self.abstracts_moves = self._moves(self.abstracts_solution,
+                                           self._abstracts_swaps(num_moves))
+
+    @staticmethod
+    def _moves(solution, changes):
+        """the (new_solution, changed) of every change"""
+        return [(apply_changes(solution, change, inplace=False), change[1:])
+                for change in changes]
+
+    def _streams_swaps(self, num_moves):
+        num_sessions, num_rooms = self.streams_solution.shape
+        return [swap_two_slots(self.streams_solution,
+                               [random.randrange(num_sessions)
+                                for _ in range(2)],
+                               [random.randrange(num_rooms)
+                                for _ in range(2)])
+                for _ in range(num_moves)]
+
+    def _abstracts_swaps(self, num_moves):
+        """swaps of two scheduled abstracts of the same length"""
+        by_length = defaultdict(list)
+        for start, room, length in abstracts_positions(
+                self.abstracts_solution).values():
+            by_length[length].append((start, room))
+        lengths = [length for length, starts in by_length.items()
+                   if len(starts) > 1]
+        swaps = []
+        for _ in range(num_moves if lengths else 0):
+            length = random.choice(lengths)
+            (start, room), (other_start, other_room) = random.sample(
+                by_length[length], 2)
+            swaps.append(swap_abstracts(self.abstracts_solution,
+                                        start, room,
+                                        other_start, other_room,
+                                        length))
+        return swaps
+
+
+def evaluators(context):
+    """the name, kind, moves and call of every benchmarked evaluator,
+    a call takes the index of a move
+    """
+    data = context.data
+    streams_solution = context.streams_solution
+    abstracts_solution = context.abstracts_solution
+    streams_moves = context.streams_moves
+    abstracts_moves = context.abstracts_moves
+    sessions = range(streams_solution.shape[0])
+    abstracts = context.abstracts.index
+    sheets = (data['streams_sessions|penalty'],
+              data['streams_rooms|penalty'],
+              data['sessions_rooms|penalty'])
+    streams_streams = data['streams_streams|penalty']
+
+    return [
+        ('penalties', 'full', streams_moves,
+         lambda i: evaluate_penalties(streams_moves[i][0], *sheets)),
+        ('penalties', 'partial', streams_moves,
+         lambda i: partial_penalties(streams_solution, *streams_moves[i],
+                                     *sheets[::-1])),
+        ('streams_streams', 'full', streams_moves,
+         lambda i: evaluate_streams_streams(streams_moves[i][0], sessions,
+                                            streams_streams)),
+        ('streams_streams', 'partial', streams_moves,
+         lambda i: partial_streams_streams(streams_solution, *streams_moves[i],
+                                           streams_streams)),
+        ('parallel_streams', 'full', streams_moves,
+         lambda i: evaluate_parallel_streams(streams_moves[i][0],
+                                             context.stream_ids,
+                                             context.required_sessions)),
+        ('parallel_streams', 'partial', streams_moves,
+         lambda i: partial_parallel_streams(streams_solution, *streams_moves[i],
+                                            context.required_sessions)),
+        ('abstracts_order', 'full', abstracts_moves,
+         lambda i: evaluate_abstracts_order(abstracts_moves[i][0],
+                                            streams_solution,
+                                            context.stream_ids,
+                                            context.abstracts,
+                                            context.session_to_timeslots)),
+        ('abstracts_order', 'partial', abstracts_moves,
+         lambda i: partial_abstracts_order(abstracts_solution,
+                                           *abstracts_moves[i],
+                                           streams_solution,
+                                           context.abstracts,
+                                           context.timeslot_to_session,
+                                           context.session_to_timeslots)),
+        ('abstracts_abstracts', 'full', abstracts_moves,
+         lambda i: evaluate_abstracts_abstracts(abstracts_moves[i][0],
+                                                abstracts,
+                                                context.abstracts,
+                                                context.timeslot_to_session,
+                                                context.session_to_timeslots)),
+        ('abstracts_abstracts', 'partial', abstracts_moves,
+         lambda i: partial_abstracts_abstracts(abstracts_solution,
+                                               *abstracts_moves[i],
+                                               context.abstracts,
+                                               context.timeslot_to_session,
+                                               context.session_to_timeslots)),
+    ]
+
+
+def measure(call, num_moves, min_time=1.0, max_calls=10000):
+    """Calls `call` over the moves until `min_time` seconds or
+    `max_calls` calls, then once more per move under tracemalloc.
+    Returns the throughput, latency percentiles and peak memory
+    """
+    latencies = []
+    start = time.perf_counter()
+    while (len(latencies) < max_calls
+           and time.perf_counter() - start < min_time):
+        i = len(latencies) % num_moves
+        call_start = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - call_start)
+    latencies = np.array(latencies)
+
+    tracemalloc.start()
+    for i in range(min(num_moves, len(latencies))):
+        call(i)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e6
+    return {'calls': len(latencies),
+            'evals_per_sec': len(latencies) / latencies.sum(),
+            'p50_us': p50,
+            'p90_us': p90,
+            'p99_us': p99,
+            'peak_memory_kb': peak / 1024}
+
+
+def run_benchmarks(sizes=tuple(SIZES), names=None,
+                   num_moves=100, min_time=1.0, max_calls=10000, seed=0):
+    """Benchmarks every evaluator, or the named ones,
+    on every size, returns a record per (size, evaluator, kind)
+    """
+    results = []
+    for size in sizes:
+        context = Context(size, num_moves=num_moves, seed=seed)
+        shape = {'timeslots': context.abstracts_solution.shape[0],
+                 'rooms': context.abstracts_solution.shape[1],
+                 **SIZES[size]}
+        for name, kind, moves, call in evaluators(context):
+            if (names is not None and name not in names) or not moves:
+                continue
+            record = {'size': size, 'evaluator': name, 'kind': kind}
+            record.update(measure(call, len(moves), min_time=min_time,
+                                  max_calls=max_calls))
+            record['instance'] = shape
+            print(f"{size:>6} {kind:>7} {name:<20}"
+                  f" {record['evals_per_sec']:>12.1f}/s"
+                  f" p50 {record['p50_us']:>10.1f}µs"
+                  f" p99 {record['p99_us']:>10.1f}µs"
+                  f" peak {record['peak_memory_kb']:>8.1f}KiB")
+            results.append(record)
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule bench',
+        description='Benchmark the full and partial evaluators.')
+    parser.add_argument('-s', '--sizes', type=str, nargs='+',
+                        choices=list(SIZES), default=list(SIZES)[:3])
+    parser.add_argument('-e', '--evaluators', type=str, nargs='+',
+                        help='Only benchmark these evaluators.')
+    parser.add_argument('-n', '--moves', type=int, default=100,
+                        help='Number of random moves per instance.')
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help='Seconds spent on every evaluator.')
+    parser.add_argument('--max-calls', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=str,
+                        help='Write the results as JSON.')
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(args.sizes, names=args.evaluators,
+                             num_moves=args.moves,
+                             min_time=args.min_time,
+                             max_calls=args.max_calls,
+                             seed=args.seed)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'python': platform.python_version(),
+                       'numpy': np.__version__,
+                       'machine': platform.machine(),
+                       'results': results}, output_file, indent=2)
@@ -0,0 +1,41 @@
+"""
+Cheap lower bounds on the weighted penalties of an instance,
+used to stop a search once no better schedule can exist
+"""
+import numpy as np
+
+
+def abstracts_lower_bound(input_data, weights):
+    """A lower bound on the weighted penalty of an abstracts schedule:
+    at least `minimum_unscheduled_abstracts` abstracts are unscheduled
+    and every scheduled abstract is in its cheapest timeblock
+    """
+    abstracts = input_data['abstracts']
+    sessions = input_data['sessions']
+    num_rooms = len(input_data['rooms'].index)
+    num_unscheduled = minimum_unscheduled_abstracts(
+        abstracts['Required Timeslots'],
+        sessions['Max number of talks'].sum() * num_rooms)
+
+    # every abstract either costs its cheapest timeblock or is unscheduled,
+    # without sessions no abstract can be scheduled
+    scheduled_costs = weights[9] * abstracts[list(sessions['Sessions'])].to_numpy(
+        dtype=float).min(axis=1, initial=np.inf)
+    unscheduled_cost = weights[7]
+    # the abstracts that lose the least by being unscheduled
+    losses = np.sort(unscheduled_cost - scheduled_costs)
+    cheapest = np.minimum(scheduled_costs, unscheduled_cost)
+    forced = losses[losses > 0][:max(0, num_unscheduled
+                                     - np.count_nonzero(losses <= 0))]
+    return cheapest.sum() + forced.sum()
+
+
+def minimum_unscheduled_abstracts(lengths, capacity):
+    """the fewest abstracts that must be left out for the others
+    to fit in `capacity` timeslots
+    """
+    lengths = np.sort(np.asarray(lengths))[::-1]
+    excess = lengths.sum() - capacity
+    if excess <= 0:
+        return 0
+    return int(np.searchsorted(np.cumsum(lengths), excess) + 1)
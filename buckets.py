@@ -0,0 +1,200 @@
+"""
+A neighbourhood of an abstracts schedule that only
+proposes structurally valid moves
+"""
+import random
+from collections import defaultdict
+import numpy as np
+from .operators import swap_abstracts, schedule_in_slots, schedule_cells
+from ..utils import session_to_timeslots_map, run_lengths
+
+
+class AbstractsBuckets:
+    """Precomputed index buckets of an abstracts schedule:
+    the abstracts of each stream grouped by their required timeslots,
+    and the timeslot ranges of the sessions owned by each stream
+    """
+
+    def __init__(self, streams_solution, streams, abstracts, sessions,
+                 swap_prob=0.5):
+        stream_ids = dict(zip(streams['Streams'], streams.index))
+        self.swap_prob = swap_prob
+        self.abstracts = list(abstracts.index)
+        self.lengths = dict(zip(abstracts.index,
+                                abstracts['Required Timeslots'].astype(int)))
+        self.streams = dict(zip(abstracts.index,
+                                abstracts['Stream'].map(stream_ids)))
+
+        # swap partners: abstracts of the same stream and length
+        self.partners = defaultdict(list)
+        for abstract in self.abstracts:
+            key = (self.streams[abstract], self.lengths[abstract])
+            self.partners[key].append(abstract)
+
+        # (start, end, room) of every session owned by a stream
+        session_to_timeslots = session_to_timeslots_map(sessions)
+        self.sessions = defaultdict(list)
+        for session, room in np.argwhere(streams_solution != -1):
+            start, end = session_to_timeslots[session]
+            stream = streams_solution[session, room]
+            self.sessions[stream].append((start, end, room))
+
+    def neighbourhood(self, solution, choose=None):
+        """Yields moves that keep every abstract inside a session
+        of its own stream, and only swap abstracts of equal length.
+        `choose` picks the abstract to move, uniformly by default
+        """
+        if choose is None:
+            def choose():
+                return random.choice(self.abstracts)
+
+        positions = abstracts_positions(solution)
+        gaps = {}
+
+        failures = 0
+        max_failures = 10 * len(self.abstracts)
+        checked = False
+        while failures < max_failures:
+            abstract = choose()
+            if random.random() < self.swap_prob:
+                changes = self.swap(solution, abstract, positions)
+            else:
+                stream = self.streams[abstract]
+                if stream not in gaps:
+                    gaps[stream] = free_gaps(solution, self.sessions[stream])
+                changes = self.move(solution, abstract, positions,
+                                    gaps[stream])
+
+            if changes is None:
+                failures += 1
+                # on the first failure, stop at once if nothing can move
+                if not checked:
+                    checked = True
+                    if not self.movable(solution, positions, gaps):
+                        return
+            else:
+                failures = 0
+                yield changes
+
+    def movable(self, solution, positions, gaps):
+        """whether any abstract fits in a free gap of its stream or can
+        be swapped with a partner, fills `gaps` for every stream
+        """
+        for stream, stream_sessions in self.sessions.items():
+            if stream not in gaps:
+                gaps[stream] = free_gaps(solution, stream_sessions)
+        longest = {stream: max(stream_gaps, default=0)
+                   for stream, stream_gaps in gaps.items()}
+        if any(self.lengths[abstract] <= longest.get(self.streams[abstract], 0)
+               for abstract in self.abstracts):
+            return True
+
+        for partners in self.partners.values():
+            swappable = [abstract for abstract in partners
+                         if self.contiguous(solution, abstract, positions)]
+            if (len(swappable) > 1
+                    and any(abstract in positions for abstract in swappable)):
+                return True
+        return False
+
+    def contiguous(self, solution, abstract, positions):
+        """whether `abstract` is unscheduled, or occupies exactly
+        its required timeslots in a single room
+        """
+        if abstract not in positions:
+            return True
+        start, room, count = positions[abstract]
+        length = self.lengths[abstract]
+        return (count == length
+                and np.all(solution[start:start + length, room] == abstract))
+
+    def move(self, solution, abstract, positions, gaps):
+        """move `abstract` into a free gap of its stream"""
+        length = self.lengths[abstract]
+        candidates = [(start, gap_length, room)
+                      for gap_length, bucket in gaps.items()
+                      if gap_length >= length
+                      for start, room in bucket]
+        if not candidates:
+            return None
+
+        start, gap_length, room = random.choice(candidates)
+        start += random.randrange(gap_length - length + 1)
+
+        cells = {}
+        if self.contiguous(solution, abstract, positions):
+            if abstract in positions:
+                old_start, old_room, old_length = positions[abstract]
+                cells.update(((timeslot, old_room), -1)
+                             for timeslot in range(old_start,
+                                                   old_start + old_length))
+        else:
+            # a split abstract, clear all of its cells
+            cells.update(((timeslot, old_room), -1)
+                         for timeslot, old_room
+                         in zip(*np.nonzero(solution == abstract)))
+        cells.update(((timeslot, room), abstract)
+                     for timeslot in range(start, start + length))
+        return schedule_cells(cells)
+
+    def swap(self, solution, abstract, positions):
+        """swap `abstract` with another abstract
+        of the same stream and length
+        """
+        length = self.lengths[abstract]
+        other = random.choice(self.partners[self.streams[abstract], length])
+        if other == abstract:
+            return None
+
+        # only abstracts that occupy exactly their required
+        # timeslots can be swapped without leaving partial slots
+        if not all(self.contiguous(solution, item, positions)
+                   for item in (abstract, other)):
+            return None
+
+        if abstract in positions and other in positions:
+            start, room, _ = positions[abstract]
+            other_start, other_room, _ = positions[other]
+            return swap_abstracts(solution,
+                                  start, room,
+                                  other_start, other_room,
+                                  length)
+
+        # replace the scheduled abstract by the unscheduled one
+        if abstract in positions:
+            scheduled, unscheduled = abstract, other
+        elif other in positions:
+            scheduled, unscheduled = other, abstract
+        else:
+            return None
+        start, room, _ = positions[scheduled]
+        return schedule_in_slots(unscheduled,
+                                 list(range(start, start + length)),
+                                 [room] * length)
+
+
+def abstracts_positions(solution):
+    """maps each scheduled abstract to its first (timeslot, room)
+    and the number of timeslots it occupies
+    """
+    abstracts, first, counts = np.unique(solution.ravel(),
+                                         return_index=True,
+                                         return_counts=True)
+    timeslots, rooms = np.divmod(first, solution.shape[1])
+    return {abstract: (timeslot, room, count)
+            for abstract, timeslot, room, count
+            in zip(abstracts, timeslots, rooms, counts)
+            if abstract != -1}
+
+
+def free_gaps(solution, sessions):
+    """maps a gap length to the (start, room) of the free gaps
+    of that length in the given sessions
+    """
+    gaps = defaultdict(list)
+    for start, end, room in sessions:
+        offsets, lengths, items = run_lengths(solution[start:end, room])
+        free = items == -1
+        for offset, length in zip(offsets[free], lengths[free]):
+            gaps[length].append((start + offset, room))
+    return gaps
@@ -0,0 +1,155 @@
+"""
+Checkpoints of the best schedule found so far: the searches hand every
+new best solution to a writer, which writes the schedules to disk from
+a background thread, so that a usable schedule survives a killed run
+and can be read while the search goes on
+"""
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from .utils import print_err
+from .writers import schedule_frames, write_tables
+
+# the formats written to a single file, which can be renamed atomically
+CHECKPOINT_EXTENSIONS = ('.xlsx', '.json')
+
+# the checkpoint of the searches, None when checkpointing is off
+_active = None
+
+
+class CheckpointWriter:
+    """Writes the latest streams and abstracts solutions handed over
+    to `path`, in the layout of a saved solution, at most every
+    `interval` seconds. Every write goes to a temporary file that is
+    then renamed over `path`, which always holds a complete schedule.
+    Handing over a solution never waits for a write, the solutions
+    handed over must not be modified afterwards
+    """
+
+    def __init__(self, path, input_data, interval=30):
+        if os.path.splitext(path)[1].lower() not in CHECKPOINT_EXTENSIONS:
+            raise ValueError(f"Cannot checkpoint to {path}: the supported"
+                             f" extensions are"
+                             f" {', '.join(CHECKPOINT_EXTENSIONS)}")
+        self.path = path
+        self.interval = interval
+        self.writes = 0
+        self._input_data = input_data
+        self._solutions = {}
+        self._pending = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run,
+                                        name='checkpoint-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, solution):
+        """hands over the latest solution of `kind`,
+        either 'streams' or 'abstracts'
+        """
+        with self._condition:
+            self._solutions[kind] = solution
+            self._pending = True
+            self._condition.notify()
+
+    def close(self):
+        """writes the pending solutions, if any, and stops the writer"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        last_write = -self.interval
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                # throttle, unless closing
+                while not self._closed:
+                    remaining = last_write + self.interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._pending:
+                    return
+                solutions = dict(self._solutions)
+                self._pending = False
+                closed = self._closed
+            try:
+                self._write(solutions)
+            except Exception as error:  # pylint: disable=broad-except
+                print_err(f"Could not write the checkpoint {self.path}:"
+                          f" {error}")
+            last_write = time.monotonic()
+            if closed:
+                return
+
+    def _write(self, solutions):
+        if 'streams' not in solutions:
+            return
+        schedules = schedule_frames(solutions['streams'],
+                                    solutions.get('abstracts'),
+                                    self._input_data['abstracts'],
+                                    self._input_data['streams'],
+                                    self._input_data['sessions'],
+                                    self._input_data['rooms'])
+        directory, name = os.path.split(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(
+            dir=directory, prefix=f'.{name}.', suffix=os.path.splitext(name)[1])
+        os.close(descriptor)
+        try:
+            write_tables(temporary, schedules)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.writes += 1
+
+
+class Checkpoint:
+    """Hands the new best solutions of the outermost search to
+    `writer` as the solution of `kind`. A search started inside another
+    one, such as the local search of a genetic algorithm child,
+    does not hand over its solutions
+    """
+
+    def __init__(self, writer, kind):
+        self._writer = writer
+        self._kind = kind
+        self._depth = 0
+
+    def begin(self):
+        """starts a search, returns whether it hands over its solutions"""
+        self._depth += 1
+        return self._depth == 1
+
+    def end(self):
+        self._depth -= 1
+
+    def submit(self, solution):
+        self._writer.submit(self._kind, solution)
+
+
+@contextmanager
+def checkpointing(checkpoint):
+    """hands the best solutions of the searches to `checkpoint` while
+    inside the block, carries on with the current checkpoint when
+    `checkpoint` is None
+    """
+    global _active  # pylint: disable=global-statement
+    if checkpoint is None:
+        yield _active
+        return
+    previous, _active = _active, checkpoint
+    try:
+        yield checkpoint
+    finally:
+        _active = previous
+
+
+def active_checkpoint():
+    return _active
@@ -2,6 +2,12 @@ DEFAULT_INPUT_FILE = 'Instance.xlsx'
 DEFAULT_OUTPUT_FILE = 'Schedule.xlsx'
 DEFAULT_MAXITERS = 10_000
 DEFAULT_MINSCORE = 150000
+DEFAULT_WEIGHTS = [1, 10, 1, 100, 1, 10, 1, 10000, 1000, 100, 10, 1]
+DEFAULT_SERVICE_HOST = '127.0.0.1'
+DEFAULT_SERVICE_PORT = 8750
+DEFAULT_SERVICE_MAXITERS = 200
+DEFAULT_SERVICE_MAX_JOBS = 100
+DEFAULT_CHECKPOINT_INTERVAL = 30
 SOLUTION_STREAMS_SHEET = 'streams'
 SOLUTION_ABSTRACTS_SHEET = 'abstracts'
 SOLUTION_STREAMS_VIOLATIONS_SHEET = 'streams_violations'
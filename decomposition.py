@@ -0,0 +1,186 @@
+"""
+Day-based decomposition: every day of the conference is scheduled
+as a separate sub-problem in its own process, and the day schedules
+are stitched together and repaired across the day boundaries
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .scheduler import StreamsScheduler
+from .scheduler.pipeline import schedule_conference
+from .heuristics import greedy_hill_climbing
+from .utils import session_to_timeslots_map, session_days
+
+
+def assign_abstracts_to_days(input_data):
+    """Distributes the abstracts of every stream over the days.
+    A stream is kept whole on the day with the most free timeslots
+    when it fits, otherwise its abstracts are spilled over the days
+    in chronological order so that ordered abstracts stay in order.
+    The abstracts of streams missing from the streams sheet are left out.
+    Returns the list of abstracts of each day, by day
+    """
+    abstracts = input_data['abstracts']
+    sessions = input_data['sessions']
+    num_rooms = len(input_data['rooms'].index)
+    days = session_days(sessions)
+    capacity = (sessions.groupby(days)['Max number of talks'].sum()
+                * num_rooms).to_dict()
+    day_abstracts = {day: [] for day in capacity}
+
+    lengths = abstracts['Required Timeslots']
+    # the abstracts of an unknown stream cannot be scheduled
+    known = set(input_data['streams']['Streams'])
+    stream_groups = {name: group for name, group
+                     in abstracts.groupby('Stream').groups.items()
+                     if name in known}
+    # the largest streams are the hardest to keep on a single day
+    for stream_name in sorted(stream_groups,
+                              key=lambda name: -lengths[stream_groups[name]].sum()):
+        stream_abstracts = list(abstracts.loc[stream_groups[stream_name]]
+                                .sort_values('Order').index)
+        required = lengths[stream_abstracts].sum()
+        day = max(capacity, key=lambda day: capacity[day])
+        if required <= capacity[day]:
+            day_abstracts[day].extend(stream_abstracts)
+            capacity[day] -= required
+            continue
+
+        last_day = max(capacity)
+        for abstract in stream_abstracts:
+            day = next((day for day in sorted(capacity)
+                        if lengths[abstract] <= capacity[day]), last_day)
+            day_abstracts[day].append(abstract)
+            capacity[day] -= lengths[abstract]
+    return day_abstracts
+
+
+def day_data(input_data, sessions, streams, abstracts):
+    """the input sheets restricted to the given sessions, streams
+    and abstracts, re-indexed from 0. Clashes with abstracts
+    of other days are dropped
+    """
+    sessions_df = input_data['sessions']
+    abstracts_df = input_data['abstracts']
+    session_names = list(sessions_df.loc[sessions, 'Sessions'])
+    # the penalty sheets are indexed by position,
+    # with the names in their first column
+    session_columns = [0] + [session + 1 for session in sessions]
+    stream_columns = [0] + [stream + 1 for stream in streams]
+
+    # the columns before the clashes that are not sessions
+    # describe the abstracts, as 'Reference' and 'Stream'
+    all_session_names = set(sessions_df['Sessions'])
+    clashes_start = abstracts_df.columns.get_loc('Clash')
+    details = [column for column in abstracts_df.columns[:clashes_start]
+               if column not in all_session_names]
+    columns = (details + session_names
+               + list(abstracts_df.columns[clashes_start:]))
+    day_abstracts = abstracts_df.loc[abstracts, columns].reset_index(drop=True)
+    clashes = day_abstracts.columns[len(details) + len(session_names):]
+    references = set(day_abstracts['Reference'])
+    day_abstracts[clashes] = day_abstracts[clashes].where(
+        day_abstracts[clashes].isin(references), 0)
+
+    def rows(sheet, indices, columns=None):
+        sheet = input_data[sheet]
+        if columns is not None:
+            sheet = sheet.iloc[:, columns]
+        return sheet.iloc[indices].reset_index(drop=True)
+
+    return {
+        'abstracts': day_abstracts,
+        'streams': rows('streams', streams),
+        'rooms': input_data['rooms'],
+        'sessions': rows('sessions', sessions),
+        'streams_sessions|penalty': rows('streams_sessions|penalty',
+                                         streams, session_columns),
+        'streams_rooms|penalty': rows('streams_rooms|penalty', streams),
+        'streams_streams|penalty': rows('streams_streams|penalty',
+                                        streams, stream_columns),
+        'sessions_rooms|penalty': rows('sessions_rooms|penalty', sessions),
+    }
+
+
+def solve_day(input_data, weights, max_iters):
+    """schedules the streams and then the abstracts of a single day,
+    runs in a worker process
+    """
+    streams_scheduler, abstracts_scheduler = schedule_conference(
+        input_data, weights, max_iters=max_iters)
+    return streams_scheduler.solution, abstracts_scheduler.solution
+
+
+def decomposed_schedule(input_data, weights,
+                        max_iters=1000,
+                        repair_iters=None,
+                        processes=None):
+    """Schedules every day as an independent sub-problem in parallel,
+    stitches the day schedules and runs a short global repair
+    for the constraints that span days. Every day runs the full
+    `max_iters`, so that the wall time scales with the cores.
+    The abstracts of streams missing from the streams sheet
+    are left unscheduled.
+    Returns the streams and abstracts schedulers of the full instance
+    """
+    if repair_iters is None:
+        repair_iters = max(1, max_iters // 10)
+    sessions_df = input_data['sessions']
+    streams_df = input_data['streams']
+    abstracts_df = input_data['abstracts']
+    num_rooms = len(input_data['rooms'].index)
+    total_timeslots = sessions_df['Max number of talks'].sum()
+    session_to_timeslots = session_to_timeslots_map(sessions_df)
+    stream_ids = dict(zip(streams_df['Streams'], streams_df.index))
+
+    days = session_days(sessions_df)
+    subproblems = []
+    for day, abstracts in assign_abstracts_to_days(input_data).items():
+        if not abstracts:
+            continue
+        sessions = list(np.flatnonzero(days.to_numpy() == day))
+        streams = sorted({stream_ids[name] for name
+                          in abstracts_df.loc[abstracts, 'Stream']})
+        subproblems.append((sessions, streams, abstracts))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(solve_day,
+                                   day_data(input_data, *subproblem),
+                                   weights, max_iters)
+                   for subproblem in subproblems]
+        solutions = [future.result() for future in futures]
+
+    # map the local ids of every day back onto the full instance
+    streams_solution = np.full((len(sessions_df.index), num_rooms), -1,
+                               dtype=int)
+    abstracts_solution = np.full((total_timeslots, num_rooms), -1,
+                                 dtype=int)
+    for (sessions, streams, abstracts), (day_streams, day_abstracts) in zip(
+            subproblems, solutions):
+        streams, abstracts = np.array(streams), np.array(abstracts)
+        streams_solution[sessions] = np.where(day_streams == -1, -1,
+                                              streams[day_streams])
+        timeslots = np.concatenate([np.arange(*session_to_timeslots[session])
+                                    for session in sessions])
+        abstracts_solution[timeslots] = np.where(day_abstracts == -1, -1,
+                                                 abstracts[day_abstracts])
+
+    streams_scheduler = StreamsScheduler(input_data, weights)
+    streams_scheduler.solution = streams_solution
+    streams_scheduler.improve(greedy_hill_climbing,
+                              max_iters=repair_iters)
+
+    # drop the abstracts whose session was given to another stream
+    # by the repair, the abstracts repair schedules them again
+    abstract_streams = np.array([stream_ids.get(name, -1)
+                                 for name in abstracts_df['Stream']])
+    timeslot_streams = np.repeat(streams_scheduler.solution,
+                                 sessions_df['Max number of talks'], axis=0)
+    owned = (abstracts_solution == -1) | (
+        abstract_streams[abstracts_solution] == timeslot_streams)
+    abstracts_solution[~owned] = -1
+
+    return schedule_conference(input_data, weights,
+                               streams_solution=streams_scheduler.solution,
+                               abstracts_solution=abstracts_solution,
+                               improve_streams=False,
+                               max_iters=repair_iters)
@@ -0,0 +1,228 @@
+"""
+Differential checks of the penalty components against their reference
+implementations: instances of random sizes are generated, random move
+sequences are applied to their schedules and after every move the full
+and partial evaluators must agree with the reference ones, on the
+totals and on the violation lists
+"""
+import argparse
+import random
+from collections import defaultdict
+import numpy as np
+from .generator import generate_data
+from .scheduler.abstracts import initial_solution
+from .heuristics import streams_population
+from .operators import apply_changes, swap_two_slots, swap_abstracts
+from .operators.buckets import abstracts_positions
+from .penalties import streams, abstracts, reference
+from .utils import (
+    required_sessions_per_stream,
+    session_to_timeslots_map,
+    timeslot_to_session_map,
+)
+from .exceptions import EvaluationMismatchError
+
+
+class Case:
+    """An instance generated with `seed`, of random size and densities,
+    with a random streams schedule and its first-fit abstracts schedule
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        num_days = self.rng.randint(1, 2)
+        timeblocks_per_day = self.rng.randint(2, 4)
+        num_rooms = self.rng.randint(2, 6)
+        num_sessions = num_days * timeblocks_per_day
+        data = generate_data(
+            num_days=num_days,
+            timeblocks_per_day=timeblocks_per_day,
+            num_rooms=num_rooms,
+            num_streams=self.rng.randint(2, num_sessions * num_rooms),
+            num_abstracts=self.rng.randint(10, 5 * num_sessions * num_rooms),
+            preference_density=self.rng.uniform(0, 0.5),
+            penalty_density=self.rng.uniform(0, 0.5),
+            clash_density=self.rng.uniform(0, 1),
+            order_fraction=self.rng.uniform(0, 1),
+            seed=seed)
+        self.data = data
+        self.sessions = data['sessions']
+        self.abstracts = data['abstracts']
+        self.stream_ids = list(data['streams'].index)
+        self.required_sessions = required_sessions_per_stream(
+            data['streams'], self.abstracts, self.sessions)
+        self.session_to_timeslots = session_to_timeslots_map(self.sessions)
+        self.timeslot_to_session = timeslot_to_session_map(self.sessions)
+
+        np.random.seed(seed)
+        self.streams_solution = streams_population(data, 1)[0]
+        self.abstracts_solution = initial_solution(self.streams_solution,
+                                                   self.abstracts,
+                                                   data['streams'],
+                                                   self.sessions)
+
+    def streams_move(self, solution):
+        """a swap of two random slots"""
+        num_sessions, num_rooms = solution.shape
+        return swap_two_slots(solution,
+                              [self.rng.randrange(num_sessions)
+                               for _ in range(2)],
+                              [self.rng.randrange(num_rooms)
+                               for _ in range(2)])
+
+    def abstracts_move(self, solution):
+        """a swap of two scheduled abstracts of the same length, or of
+        two random timeslots, which may split an abstract, when there
+        are no such abstracts or one time in four
+        """
+        by_length = defaultdict(list)
+        for start, room, length in abstracts_positions(solution).values():
+            by_length[length].append((start, room))
+        lengths = [length for length, starts in by_length.items()
+                   if len(starts) > 1]
+        if not lengths or self.rng.random() < 0.25:
+            return self.streams_move(solution)
+        length = self.rng.choice(lengths)
+        (start, room), (other_start, other_room) = self.rng.sample(
+            by_length[length], 2)
+        return swap_abstracts(solution, start, room,
+                              other_start, other_room, length)
+
+
+def components(case):
+    """the name, problem, evaluation arguments and partial evaluation
+    arguments of every component, the evaluators of a component are
+    `evaluate_<name>` and `partial_<name>` in the module of its problem
+    """
+    data = case.data
+    sheets = (data['streams_sessions|penalty'],
+              data['streams_rooms|penalty'],
+              data['sessions_rooms|penalty'])
+    streams_streams = data['streams_streams|penalty']
+    sessions = range(case.streams_solution.shape[0])
+    abstract_ids = case.abstracts.index
+
+    return [
+        ('consecutive_sessions', 'streams', (case.stream_ids,), ()),
+        ('streams_streams', 'streams',
+         (sessions, streams_streams), (streams_streams,)),
+        ('parallel_streams', 'streams',
+         (case.stream_ids, case.required_sessions),
+         (case.required_sessions,)),
+        ('number_of_rooms_per_stream', 'streams',
+         (case.stream_ids, case.required_sessions),
+         (case.required_sessions,)),
+        ('streams_scheduled', 'streams', (case.stream_ids,), ()),
+        ('penalties', 'streams', sheets, sheets[::-1]),
+        ('abstracts_sessions', 'abstracts',
+         (case.streams_solution, case.session_to_timeslots,
+          case.sessions, case.abstracts),
+         (case.timeslot_to_session, case.sessions, case.abstracts)),
+        ('abstracts_order', 'abstracts',
+         (case.streams_solution, case.stream_ids,
+          case.abstracts, case.session_to_timeslots),
+         (case.streams_solution, case.abstracts,
+          case.timeslot_to_session, case.session_to_timeslots)),
+        ('scheduled', 'abstracts', (abstract_ids,), ()),
+        ('abstracts_abstracts', 'abstracts',
+         (abstract_ids, case.abstracts,
+          case.timeslot_to_session, case.session_to_timeslots),
+         (case.abstracts,
+          case.timeslot_to_session, case.session_to_timeslots)),
+    ]
+
+
+def check_case(seed, num_moves=50, names=None):
+    """Applies `num_moves` random moves to the schedules of the case
+    generated with `seed`, checking every component, or the named ones,
+    on the initial schedules and after every move.
+    Raises EvaluationMismatchError on the first disagreement
+    """
+    case = Case(seed)
+    selected = [component for component in components(case)
+                if names is None or component[0] in names]
+    for problem, solution in (('streams', case.streams_solution),
+                              ('abstracts', case.abstracts_solution)):
+        module = streams if problem == 'streams' else abstracts
+        move = getattr(case, f'{problem}_move')
+        problem_components = [component for component in selected
+                              if component[1] == problem]
+        if not problem_components:
+            continue
+        for name, _problem, args, _partial_args in problem_components:
+            _check_full(module, name, solution, args, seed, 0)
+        for i in range(1, num_moves + 1):
+            changes = move(solution)
+            new_solution = apply_changes(solution, changes, inplace=False)
+            for name, _problem, args, partial_args in problem_components:
+                _check_partial(module, name, solution, new_solution,
+                               changes[1:], partial_args, seed, i)
+                _check_full(module, name, new_solution, args, seed, i)
+            solution = new_solution
+    return len(selected)
+
+
+def _check_full(module, name, solution, args, seed, move):
+    evaluate = getattr(module, f'evaluate_{name}')
+    expected = getattr(reference, f'evaluate_{name}')(solution, *args)
+    actual = evaluate(solution, *args)
+    if not _same_totals(expected, actual):
+        raise EvaluationMismatchError(seed, move, name, 'total',
+                                      expected, actual)
+    expected = getattr(reference, f'evaluate_{name}')(solution, *args,
+                                                      violations=True)
+    actual = evaluate(solution, *args, violations=True)
+    if _normalized(expected) != _normalized(actual):
+        raise EvaluationMismatchError(seed, move, name, 'violations',
+                                      expected, actual)
+
+
+def _check_partial(module, name, solution, new_solution, changed,
+                   args, seed, move):
+    expected = getattr(reference, f'partial_{name}')(
+        solution, new_solution, changed, *args)
+    actual = getattr(module, f'partial_{name}')(
+        solution, new_solution, changed, *args)
+    if not _same_totals(expected, actual):
+        raise EvaluationMismatchError(seed, move, name, 'delta',
+                                      expected, actual)
+
+
+def _same_totals(expected, actual, tolerance=1e-9):
+    return np.allclose(np.atleast_1d(expected), np.atleast_1d(actual),
+                       rtol=0, atol=tolerance)
+
+
+def _normalized(violations):
+    """the violations as sorted plain tuples, the order in which they
+    are listed is not part of the contract. Components with several
+    penalties list their violations per penalty
+    """
+    if isinstance(violations, tuple):
+        return tuple(_normalized(penalty_violations)
+                     for penalty_violations in violations)
+    return sorted(tuple(np.atleast_1d(violation).tolist())
+                  for violation in violations)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule check',
+        description='Check the evaluators against the reference ones'
+                    ' on random instances and moves.')
+    parser.add_argument('-n', '--cases', type=int, default=20,
+                        help='Number of generated instances.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the first instance.')
+    parser.add_argument('-m', '--moves', type=int, default=50,
+                        help='Number of random moves per schedule.')
+    parser.add_argument('-c', '--components', type=str, nargs='+',
+                        help='Only check these components.')
+    args = parser.parse_args(args)
+
+    for seed in range(args.seed, args.seed + args.cases):
+        checked = check_case(seed, num_moves=args.moves,
+                             names=args.components)
+        print(f"case {seed}: {checked} components agree"
+              f" over {args.moves} moves")
@@ -1,2 +1,33 @@
 class IncompatibleDimensionsError(Exception):
     pass
+
+
+class InvalidEditError(ValueError):
+    def __init__(self, edit, reason):
+        super().__init__(f"Invalid edit {edit}: {reason}")
+        self.edit = edit
+        self.reason = reason
+
+
+class EvaluationDriftError(Exception):
+    def __init__(self, changes, component, expected, actual):
+        super().__init__(f"The {component} penalty drifted to {actual},"
+                         f" the full evaluation gives {expected},"
+                         f" after the move {changes}")
+        self.changes = changes
+        self.component = component
+        self.expected = expected
+        self.actual = actual
+
+
+class EvaluationMismatchError(Exception):
+    def __init__(self, seed, move, component, kind, expected, actual):
+        super().__init__(f"The {kind} of the {component} penalty is {actual},"
+                         f" the reference gives {expected},"
+                         f" in case {seed} at move {move}")
+        self.seed = seed
+        self.move = move
+        self.component = component
+        self.kind = kind
+        self.expected = expected
+        self.actual = actual
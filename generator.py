@@ -0,0 +1,192 @@
+"""
+Seeded synthetic conferences for scaling studies: the sheets the
+schedulers consume and the equivalent `Instance` are built in memory,
+and can be written to a spreadsheet in the layout of the input file
+"""
+import argparse
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from .instance import Instance
+
+DEFAULT_GENERATED_FILE = 'Generated.xlsx'
+
+# the sheets whose first column holds the names of the rows
+PENALTY_SHEETS = [
+    'streams_sessions|penalty',
+    'streams_rooms|penalty',
+    'streams_streams|penalty',
+    'sessions_rooms|penalty',
+]
+
+
+def generate_data(num_days=2,
+                  timeblocks_per_day=4,
+                  num_rooms=10,
+                  num_streams=20,
+                  num_abstracts=300,
+                  talks_per_timeblock=(3, 4),
+                  abstract_lengths=(1, 3),
+                  preference_density=0.1,
+                  penalty_density=0.05,
+                  clash_density=0.01,
+                  order_fraction=0.2,
+                  penalty_values=(1, 10, 100),
+                  seed=None):
+    """Generates the sheets of a conference, filled as by `fill_data`.
+    Timeblocks hold between the bounds of `talks_per_timeblock`
+    timeslots and abstracts need between the bounds of
+    `abstract_lengths`. Every abstract has a cost in a timeblock with
+    probability `preference_density`, and every entry of the stream,
+    room and session penalty sheets with probability `penalty_density`.
+    `clash_density` is the expected number of clashes per abstract and
+    `order_fraction` the fraction of streams whose abstracts are ordered.
+    The sheets hold the columns read by `Instance.from_excel_data` too
+    """
+    rng = np.random.default_rng(seed)
+    num_sessions = num_days * timeblocks_per_day
+    streams = [f'Stream{i + 1}' for i in range(num_streams)]
+    rooms = [f'room{i + 1}' for i in range(num_rooms)]
+    sessions = [f'sess{i + 1}' for i in range(num_sessions)]
+    references = [f'T{i + 1}' for i in range(num_abstracts)]
+
+    def penalties(shape, density):
+        return np.where(rng.random(shape) < density,
+                        rng.choice(penalty_values, size=shape), 0).astype(float)
+
+    def penalty_sheet(names, columns, values):
+        sheet = pd.DataFrame(values, columns=columns)
+        sheet.insert(0, 'Unnamed: 0', names)
+        return sheet
+
+    streams_streams = penalties((num_streams, num_streams), penalty_density)
+    np.fill_diagonal(streams_streams, 0)
+    data = {
+        # streams may spread over every day at no cost
+        'streams': pd.DataFrame({'Streams': streams,
+                                 'Max Number of Days': num_days,
+                                 'Cost for Extra Days': 0.0}),
+        'rooms': pd.DataFrame({'Rooms': rooms}),
+        'sessions': pd.DataFrame({
+            'Sessions': sessions,
+            'Max number of talks': rng.integers(talks_per_timeblock[0],
+                                                talks_per_timeblock[1] + 1,
+                                                size=num_sessions),
+            'Day': np.repeat(np.arange(num_days), timeblocks_per_day)}),
+        'streams_sessions|penalty': penalty_sheet(
+            streams, sessions,
+            penalties((num_streams, num_sessions), penalty_density)),
+        'streams_rooms|penalty': penalty_sheet(
+            streams, rooms,
+            penalties((num_streams, num_rooms), penalty_density)),
+        'streams_streams|penalty': penalty_sheet(
+            streams, streams, streams_streams),
+        'sessions_rooms|penalty': penalty_sheet(
+            sessions, rooms,
+            penalties((num_sessions, num_rooms), penalty_density)),
+    }
+
+    # every stream gets at least one abstract
+    abstract_streams = np.concatenate([
+        np.arange(min(num_streams, num_abstracts)),
+        rng.integers(num_streams,
+                     size=max(0, num_abstracts - num_streams))])
+    rng.shuffle(abstract_streams)
+    orders = np.zeros(num_abstracts, dtype=int)
+    ordered = rng.random(num_streams) < order_fraction
+    for stream in np.flatnonzero(ordered):
+        members = np.flatnonzero(abstract_streams == stream)
+        orders[members] = np.arange(1, len(members) + 1)
+
+    # the clashes of every abstract, each pair listed by one of its abstracts
+    num_clashes = rng.poisson(clash_density * num_abstracts / 2)
+    clashes = defaultdict(list)
+    for abstract, other in rng.integers(num_abstracts, size=(num_clashes, 2)):
+        if abstract != other and other not in clashes[abstract]:
+            clashes[abstract].append(other)
+    max_clashes = max((len(others) for others in clashes.values()), default=0)
+    clash_columns = ['Clash'] + [f'Clash.{i}' for i in range(1, max_clashes)]
+    clash_refs = np.zeros((num_abstracts, max(1, max_clashes)), dtype=object)
+    for abstract, others in clashes.items():
+        clash_refs[abstract, :len(others)] = [references[other]
+                                              for other in others]
+
+    abstracts = pd.DataFrame({
+        'Reference': references,
+        'Stream': np.array(streams)[abstract_streams],
+        'Required Timeslots': rng.integers(abstract_lengths[0],
+                                           abstract_lengths[1] + 1,
+                                           size=num_abstracts),
+        'Order': orders})
+    preferences = pd.DataFrame(
+        penalties((num_abstracts, num_sessions), preference_density),
+        columns=sessions)
+    # an `Instance` abstract holds a single clash, the first one listed
+    named_clashes = pd.DataFrame({
+        'Clash (Including same session/stream)': clash_refs[:, 0],
+        'Clash (Speaker)': 0})
+    data['abstracts'] = pd.concat(
+        [abstracts, preferences, named_clashes,
+         pd.DataFrame(clash_refs, columns=clash_columns)], axis=1)
+    return data
+
+
+def generate_instance(seed=None, **knobs):
+    """Generates a conference, returns its `Instance` and its sheets.
+    See `generate_data` for the knobs
+    """
+    data = generate_data(seed=seed, **knobs)
+    return Instance.from_excel_data(data), data
+
+
+def write_data(path, data):
+    """writes generated sheets in the layout of the input spreadsheet"""
+    with pd.ExcelWriter(path) as writer:
+        for sheet_name, sheet in data.items():
+            if sheet_name in PENALTY_SHEETS:
+                # the names go in the unlabelled first column
+                sheet = sheet.set_index(sheet.columns[0]).rename_axis(None)
+                sheet.to_excel(writer, sheet_name=sheet_name)
+            else:
+                sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule generate',
+        description='Generate a synthetic conference spreadsheet.')
+    parser.add_argument('-o', '--output', type=str,
+                        default=DEFAULT_GENERATED_FILE,
+                        help=f'Default: "{DEFAULT_GENERATED_FILE}"')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--days', type=int, default=2)
+    parser.add_argument('--timeblocks', type=int, default=4,
+                        help='Timeblocks per day.')
+    parser.add_argument('--rooms', type=int, default=10)
+    parser.add_argument('--streams', type=int, default=20)
+    parser.add_argument('--abstracts', type=int, default=300)
+    parser.add_argument('--talks', type=int, nargs=2, default=(3, 4),
+                        metavar=('MIN', 'MAX'),
+                        help='Timeslots per timeblock.')
+    parser.add_argument('--lengths', type=int, nargs=2, default=(1, 3),
+                        metavar=('MIN', 'MAX'),
+                        help='Timeslots per abstract.')
+    parser.add_argument('--preference-density', type=float, default=0.1)
+    parser.add_argument('--penalty-density', type=float, default=0.05)
+    parser.add_argument('--clash-density', type=float, default=0.01)
+    parser.add_argument('--order-fraction', type=float, default=0.2)
+    args = parser.parse_args(args)
+
+    write_data(args.output, generate_data(
+        num_days=args.days,
+        timeblocks_per_day=args.timeblocks,
+        num_rooms=args.rooms,
+        num_streams=args.streams,
+        num_abstracts=args.abstracts,
+        talks_per_timeblock=args.talks,
+        abstract_lengths=args.lengths,
+        preference_density=args.preference_density,
+        penalty_density=args.penalty_density,
+        clash_density=args.clash_density,
+        order_fraction=args.order_fraction,
+        seed=args.seed))
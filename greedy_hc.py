@@ -18,6 +18,8 @@ class GreedyHillClimbing(AcceptanceCondition):
 def greedy_hill_climbing(solution, evaluate, partial_evaluate,
                          neighbourhood,
                          report_period=None,
+                         lower_bound=None,
+                         callback=None,
                          idle_threshold=0.20,
                          min_iters=200,
                          max_iters=500):
@@ -26,6 +28,8 @@ def greedy_hill_climbing(solution, evaluate, partial_evaluate,
                         neighbourhood,
                         condition,
                         report_period=report_period,
+                        lower_bound=lower_bound,
+                        callback=callback,
                         idle_threshold=idle_threshold,
                         explore_size=1,
                         min_iters=min_iters,
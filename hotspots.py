@@ -0,0 +1,259 @@
+"""
+Penalty contribution maps that bias move sampling towards
+the streams and abstracts that carry the penalties of a schedule
+"""
+import random
+from abc import ABC, abstractmethod
+from collections import defaultdict
+import numpy as np
+from ..operators import swap_two_slots, schedule_in_slot
+from ..operators.buckets import abstracts_positions
+from ..penalties.streams import (
+    evaluate_penalties,
+    evaluate_streams_streams,
+    evaluate_parallel_streams,
+    evaluate_number_of_rooms_per_stream,
+    evaluate_consecutive_sessions,
+)
+from ..penalties.abstracts import (
+    evaluate_scheduled,
+    evaluate_abstracts_order,
+    evaluate_abstracts_abstracts,
+)
+from ..utils import (
+    unique_scheduled_elements,
+    required_sessions_per_stream,
+    session_to_timeslots_map,
+    timeslot_to_session_map,
+)
+
+
+class HotspotMap(ABC):
+    """Weighted penalty contribution of every entity of a solution,
+    updated incrementally from the cells changed since the last refresh.
+    Contributions are kept per (component, key) source, so that
+    recomputing a source replaces exactly what it added before
+    """
+
+    def __init__(self, num_entities, exploration=0.2):
+        self.exploration = exploration
+        self.contributions = np.zeros(num_entities)
+        self._cumulative = np.zeros(num_entities)
+        self._sources = {}
+        self._solution = None
+
+    def refresh(self, solution):
+        if self._solution is None or self._solution.shape != solution.shape:
+            self._rebuild(solution)
+        else:
+            changed = np.nonzero(solution != self._solution)
+            if len(changed[0]) > 0:
+                self._refresh(self._solution, solution, changed)
+        self._solution = np.copy(solution)
+        self._cumulative = np.cumsum(np.maximum(self.contributions, 0))
+
+    def sample(self):
+        """an entity drawn in proportion to its contribution,
+        or uniformly with probability `exploration`
+        """
+        num_entities = len(self.contributions)
+        total = self._cumulative[-1] if num_entities > 0 else 0
+        if total <= 0 or random.random() < self.exploration:
+            return random.randrange(num_entities)
+        entity = np.searchsorted(self._cumulative,
+                                 random.random() * total,
+                                 side='right')
+        return int(min(entity, num_entities - 1))
+
+    def _update(self, component, keys, entries):
+        """replace the contributions of `component` from `keys`
+        by the given (key, entity, weighted penalty) entries
+        """
+        grouped = defaultdict(list)
+        for key, entity, penalty in entries:
+            grouped[key].append((entity, penalty))
+        for key in keys:
+            for entity, penalty in self._sources.pop((component, key), ()):
+                self.contributions[entity] -= penalty
+            for entity, penalty in grouped[key]:
+                self.contributions[entity] += penalty
+            if grouped[key]:
+                self._sources[component, key] = grouped[key]
+
+    @abstractmethod
+    def _rebuild(self, solution):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _refresh(self, old_solution, solution, changed):
+        raise NotImplementedError
+
+
+class StreamsHotspots(HotspotMap):
+    """Contributions of each stream to a streams solution"""
+
+    def __init__(self, input_data, weights, exploration=0.2):
+        streams = input_data['streams']
+        super().__init__(len(streams.index), exploration)
+        self._weights = weights
+        self._streams_sessions = input_data['streams_sessions|penalty']
+        self._streams_rooms = input_data['streams_rooms|penalty']
+        self._sessions_rooms = input_data['sessions_rooms|penalty']
+        self._streams_streams = input_data['streams_streams|penalty']
+        self._required_sessions = required_sessions_per_stream(
+            streams,
+            input_data['abstracts'],
+            input_data['sessions']).astype(int)
+
+    def neighbourhood(self, solution):
+        """swaps or reassigns a cell of a stream drawn from the hotspots,
+        the map is refreshed on the first neighbour
+        """
+        self.refresh(solution)
+        num_sessions, num_rooms = solution.shape
+        streams = list(range(len(self.contributions)))
+        streams.append(-1)
+        while True:
+            stream = self.sample()
+            cells = np.argwhere(solution == stream)
+            if len(cells) == 0:
+                # an unscheduled stream has no cell to move
+                yield schedule_in_slot(stream,
+                                       random.randrange(num_sessions),
+                                       random.randrange(num_rooms))
+                continue
+
+            session, room = cells[random.randrange(len(cells))]
+            if random.random() < 0.5:
+                yield swap_two_slots(solution,
+                                     [session, random.randrange(num_sessions)],
+                                     [room, random.randrange(num_rooms)])
+            else:
+                yield schedule_in_slot(random.choice(streams), session, room)
+
+    def _rebuild(self, solution):
+        self._recompute(solution,
+                        range(len(self.contributions)),
+                        range(solution.shape[0]))
+
+    def _refresh(self, old_solution, solution, changed):
+        self._recompute(solution,
+                        unique_scheduled_elements(changed,
+                                                  old_solution, solution),
+                        set(changed[0]))
+
+    def _recompute(self, solution, streams, sessions):
+        weights = self._weights
+        streams, sessions = list(streams), list(sessions)
+
+        # a single pass over the cells of the recomputed streams
+        stream_cells = np.where(np.isin(solution, streams), solution, -1)
+        streams_sessions, streams_rooms, sessions_rooms = evaluate_penalties(
+            stream_cells,
+            self._streams_sessions,
+            self._streams_rooms,
+            self._sessions_rooms,
+            violations=True)
+        cells = [(stream, stream, weights[3] * penalty)
+                 for stream, _session, penalty in streams_sessions]
+        cells.extend((stream, stream, weights[4] * penalty)
+                     for stream, _room, penalty in streams_rooms)
+        cells.extend((stream_cells[session, room], stream_cells[session, room],
+                      weights[5] * penalty)
+                     for session, room, penalty in sessions_rooms)
+        self._update('cells', streams, cells)
+
+        self._update('streams_streams', sessions, (
+            (session, stream, weights[6] * penalty)
+            for stream, _other, session, penalty in evaluate_streams_streams(
+                solution, sessions, self._streams_streams, violations=True)))
+        self._update('parallel', streams, (
+            (stream, stream, weights[0] * penalty)
+            for stream, penalty in evaluate_parallel_streams(
+                solution, streams, self._required_sessions,
+                violations=True)))
+        self._update('rooms', streams, (
+            (stream, stream, weights[1] * penalty)
+            for stream, penalty in evaluate_number_of_rooms_per_stream(
+                solution, streams, self._required_sessions,
+                violations=True)))
+        self._update('consecutive', streams, (
+            (stream, stream, weights[11] * penalty)
+            for stream, _room, penalty in evaluate_consecutive_sessions(
+                solution, streams, violations=True)))
+
+
+class AbstractsHotspots(HotspotMap):
+    """Contributions of each abstract to an abstracts solution"""
+
+    def __init__(self, streams_solution, weights,
+                 streams, abstracts, sessions,
+                 exploration=0.2):
+        super().__init__(len(abstracts.index), exploration)
+        self._weights = weights
+        self._streams_solution = streams_solution
+        self._streams = streams
+        self._abstracts = abstracts
+        self._timeblock_names = list(sessions['Sessions'])
+        self._timeslot_to_timeblock = timeslot_to_session_map(sessions)
+        self._timeblock_to_timeslots = session_to_timeslots_map(sessions)
+
+    def _rebuild(self, solution):
+        self._recompute(solution, self._abstracts.index, self._streams.index)
+
+    def _refresh(self, old_solution, solution, changed):
+        timeslots, rooms = changed
+        timeblocks = [self._timeslot_to_timeblock[timeslot]
+                      for timeslot in timeslots]
+
+        # clashes change for every abstract sharing a touched timeblock
+        abstracts = unique_scheduled_elements(changed,
+                                              old_solution, solution)
+        for timeblock in set(timeblocks):
+            start, end = self._timeblock_to_timeslots[timeblock]
+            abstracts |= set(old_solution[start:end, :].flat)
+            abstracts |= set(solution[start:end, :].flat)
+        abstracts.discard(-1)
+
+        # order changes for every stream owning a touched session
+        streams = set(self._streams_solution[(timeblocks, rooms)])
+        streams.discard(-1)
+        self._recompute(solution, abstracts, streams)
+
+    def _recompute(self, solution, abstracts, streams):
+        weights = self._weights
+        abstracts = list(abstracts)
+
+        self._update('scheduled', abstracts, (
+            (abstract, abstract, weights[7])
+            for abstract in evaluate_scheduled(solution, abstracts,
+                                               violations=True)))
+
+        self._update('order', streams, (
+            (stream, abstract, weights[8] * penalty)
+            for stream in streams
+            for abstract, penalty in evaluate_abstracts_order(
+                solution, self._streams_solution, [stream],
+                self._abstracts, self._timeblock_to_timeslots,
+                violations=True)))
+
+        positions = abstracts_positions(solution)
+        sessions = []
+        for abstract in abstracts:
+            if abstract in positions:
+                timeslot, _room, _length = positions[abstract]
+                timeblock = self._timeslot_to_timeblock[timeslot]
+                penalty = self._abstracts.at[
+                    abstract, self._timeblock_names[timeblock]]
+                sessions.append((abstract, abstract, weights[9] * penalty))
+        self._update('sessions', abstracts, sessions)
+
+        # a clash is resolved by moving either of the two abstracts
+        conflicts = []
+        for abstract, clash, _timeblock in evaluate_abstracts_abstracts(
+                solution, abstracts, self._abstracts,
+                self._timeslot_to_timeblock, self._timeblock_to_timeslots,
+                violations=True):
+            conflicts.append((abstract, abstract, weights[10]))
+            conflicts.append((abstract, clash, weights[10]))
+        self._update('conflicts', abstracts, conflicts)
@@ -236,7 +236,7 @@ class Instance:
                               room_keys: Mapping[str, RoomID]) -> Timeblock:
         """Creates a Timeblock object from an excel record"""
         name = record.Sessions
-        num_timeslots = record.at['Max Number of Talks']
+        num_timeslots = int(record.at['Max number of talks'])
         day = record.Day
         stream_costs = cost_dict(streams_timeblocks, name,
                                  stream_keys, axis=1)
@@ -267,13 +267,14 @@ class Instance:
             if not pd.isna(record.at[timeblock])
         }
         timeblock_costs = defaultdict(lambda: 0, timeblock_costs)
+        # the filled sheets hold 0 for a missing clash
         clash_ref = record.at['Clash (Including same session/stream)']
         clash = None
-        if not pd.isna(clash_ref):
+        if not pd.isna(clash_ref) and clash_ref != 0:
             clash = abstract_keys[clash_ref]
         speaker_clash_ref = record.at['Clash (Speaker)']
         speaker_clash = None
-        if not pd.isna(speaker_clash_ref):
+        if not pd.isna(speaker_clash_ref) and speaker_clash_ref != 0:
             speaker_clash = abstract_keys[speaker_clash_ref]
         return Abstract(id_, reference, stream,
                         timeslots, timeblock_costs,
@@ -0,0 +1,134 @@
+"""
+Kempe chain moves over the clash graph of the abstracts
+"""
+import random
+from collections import defaultdict, deque
+import numpy as np
+from .buckets import AbstractsBuckets, abstracts_positions, free_gaps
+from ..utils import session_to_timeslots_map, timeslot_to_session_map
+
+
+class KempeChains:
+    """Swaps a connected chain of clashing abstracts between
+    two timeblocks in a single move. Starting from an abstract,
+    the chain grows with the abstracts of the other timeblock that
+    clash with a member, so that no clash inside the chain survives
+    the swap. Every member is moved into a free gap of its own stream
+    """
+
+    def __init__(self, streams_solution, streams, abstracts, sessions,
+                 clash_prob=0.8):
+        self.clash_prob = clash_prob
+        self._buckets = AbstractsBuckets(streams_solution, streams,
+                                         abstracts, sessions)
+
+        abstracts_map = dict(zip(abstracts['Reference'], abstracts.index))
+        clashes_start = abstracts.columns.get_loc('Clash')
+        self._clashes = defaultdict(set)
+        for abstract, clash_refs in zip(
+                abstracts.index,
+                abstracts.iloc[:, clashes_start:].itertuples(index=False)):
+            for clash_ref in clash_refs:
+                if clash_ref != 0:
+                    clash = abstracts_map[clash_ref]
+                    self._clashes[abstract].add(clash)
+                    self._clashes[clash].add(abstract)
+
+        self._timeblock_to_timeslots = session_to_timeslots_map(sessions)
+        self._timeslot_to_timeblock = timeslot_to_session_map(sessions)
+        # the timeblocks in which each stream owns a session
+        self._stream_timeblocks = {
+            stream: sorted({self._timeslot_to_timeblock[start]
+                            for start, _end, _room in stream_sessions})
+            for stream, stream_sessions in self._buckets.sessions.items()}
+
+    def neighbourhood(self, solution):
+        """Yields Kempe chain swaps, starting from an abstract
+        in a clash with probability `clash_prob`, or from any abstract
+        with clashes otherwise. Stops when no chain can be swapped
+        """
+        positions = abstracts_positions(solution)
+        timeblocks = {abstract: self._timeslot_to_timeblock[timeslot]
+                      for abstract, (timeslot, _room, _length)
+                      in positions.items()}
+        linked = [abstract for abstract in timeblocks
+                  if self._clashes[abstract]]
+        clashing = [abstract for abstract in linked
+                    if any(timeblocks.get(clash) == timeblocks[abstract]
+                           for clash in self._clashes[abstract])]
+        if not linked:
+            return
+
+        failures = 0
+        max_failures = 10 * len(linked)
+        while failures < max_failures:
+            if clashing and random.random() < self.clash_prob:
+                abstract = random.choice(clashing)
+            else:
+                abstract = random.choice(linked)
+            stream = self._buckets.streams[abstract]
+            others = [timeblock
+                      for timeblock in self._stream_timeblocks.get(stream, ())
+                      if timeblock != timeblocks[abstract]]
+            changes = None
+            if others:
+                changes = self.swap(solution, timeblocks,
+                                    abstract, random.choice(others))
+            if changes is None:
+                failures += 1
+            else:
+                failures = 0
+                yield changes
+
+    def chain(self, timeblocks, abstract, other_timeblock):
+        """the abstracts of the Kempe chain of `abstract`
+        between its timeblock and `other_timeblock`
+        """
+        pair = (timeblocks[abstract], other_timeblock)
+        members = {abstract}
+        queue = deque([abstract])
+        while queue:
+            member = queue.popleft()
+            # the clashes waiting in the timeblock the member moves to
+            target = pair[1] if timeblocks[member] == pair[0] else pair[0]
+            for clash in self._clashes[member]:
+                if clash not in members and timeblocks.get(clash) == target:
+                    members.add(clash)
+                    queue.append(clash)
+        return members
+
+    def swap(self, solution, timeblocks, abstract, other_timeblock):
+        """the changes that swap the chain of `abstract` with
+        `other_timeblock`, or None if a member does not fit
+        """
+        buckets = self._buckets
+        members = self.chain(timeblocks, abstract, other_timeblock)
+        new_solution = np.copy(solution)
+        # clear every cell of the members, split abstracts included
+        new_solution[np.isin(solution, list(members))] = -1
+
+        # longest first, every member into a gap of the other timeblock
+        for member in sorted(members, key=lambda member: -buckets.lengths[member]):
+            target = (other_timeblock
+                      if timeblocks[member] == timeblocks[abstract]
+                      else timeblocks[abstract])
+            target_start, target_end = self._timeblock_to_timeslots[target]
+            sessions = [(start, end, room)
+                        for start, end, room
+                        in buckets.sessions[buckets.streams[member]]
+                        if target_start <= start < target_end]
+            length = buckets.lengths[member]
+            gaps = free_gaps(new_solution, sessions)
+            fitting = [(gap_length, start, room)
+                       for gap_length, bucket in gaps.items()
+                       if gap_length >= length
+                       for start, room in bucket]
+            if not fitting:
+                return None
+            _gap_length, start, room = min(fitting)
+            new_solution[start:start + length, room] = member
+
+        changed = np.nonzero(new_solution != solution)
+        return (list(new_solution[changed]),
+                list(changed[0]),
+                list(changed[1]))
@@ -0,0 +1,32 @@
+from .local_search import local_search
+from .greedy_hc import GreedyHillClimbing
+
+
+def large_neighbourhood_search(solution, evaluate, partial_evaluate,
+                               neighbourhood,
+                               acceptance_condition=None,
+                               report_period=None,
+                               lower_bound=None,
+                               callback=None,
+                               idle_threshold=None,
+                               explore_size=5,
+                               min_iters=100,
+                               max_iters=300):
+    """A local search over a large neighbourhood, such as
+    `AbstractsScheduler.large_neighbourhood`, where every neighbour
+    destroys and rebuilds a whole region of the schedule.
+    Neighbours are accepted with any `AcceptanceCondition`,
+    greedy hill climbing by default
+    """
+    if acceptance_condition is None:
+        acceptance_condition = GreedyHillClimbing()
+    return local_search(solution, evaluate, partial_evaluate,
+                        neighbourhood,
+                        acceptance_condition,
+                        report_period=report_period,
+                        lower_bound=lower_bound,
+                        callback=callback,
+                        idle_threshold=idle_threshold,
+                        explore_size=explore_size,
+                        min_iters=min_iters,
+                        max_iters=max_iters)
@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 from itertools import islice
 import numpy as np
 from ..operators import apply_changes
+from ..profiling import active_stats, timed_neighbourhood, TimedCondition
+from ..telemetry import active_trace
+from ..verification import active_check
+from ..checkpoint import active_checkpoint
 
 
 class AcceptanceCondition(ABC):
@@ -18,20 +22,30 @@ class AcceptanceCondition(ABC):
         raise NotImplementedError
 
 
-def local_search(solution, _evaluate, partial_evaluate,
+def local_search(solution, evaluate, partial_evaluate,
                  neighbourhood,
                  acceptance_condition,
                  report_period=None,
+                 lower_bound=None,
+                 callback=None,
                  idle_threshold=None,
                  explore_size=30,
                  min_iters=200,
                  max_iters=1000):
     """Implements a general tabu search heuritstic
-    that is independent of the specific TabuList
+    that is independent of the specific TabuList.
+    Stops early once the best solution reaches `lower_bound`,
+    or when `callback`, called after every iteration with the number
+    of iterations and the improvement of the best score, returns False
     """
     if idle_threshold is None:
         idle_threshold = 1
 
+    stats = active_stats()
+    if stats is not None:
+        neighbourhood = timed_neighbourhood(stats, neighbourhood)
+        acceptance_condition = TimedCondition(stats, acceptance_condition)
+
     # the solution is modified in place to get new solutions
     # make copy as to not alter the original solution
     current_solution = np.copy(solution)
@@ -40,47 +54,94 @@ def local_search(solution, _evaluate, partial_evaluate,
     best_solution = current_solution
     best_delta = 0
 
-    i = 0
-    idle = 0
-
-    while (not (i > min_iters and idle > idle_threshold*i)) and i < max_iters:
-        neighbours = ((changes,
-                       partial_evaluate(current_solution, changes))
-                      for changes in neighbourhood(current_solution))
-
-        acceptable = ((changes, delta)
-                      for changes, delta in islice(neighbours, explore_size)
-                      if acceptance_condition.acceptable(current_solution,
-                                                         changes,
-                                                         delta))
-
-        best_neighbour = min(acceptable,
-                             key=lambda neighbour: neighbour[1],
-                             default=None)
-
-        if best_neighbour is not None:
-            # accept the best neighbour
-            changes, delta = best_neighbour
-            if delta < 0:
-                idle = 0
+    check = active_check()
+    if check is not None:
+        check.begin(current_solution)
+
+    checkpoint = active_checkpoint()
+    handing = checkpoint is not None and checkpoint.begin()
+
+    trace = active_trace()
+    recording = trace is not None and trace.begin()
+    if recording:
+        partial_evaluate = trace.counting(partial_evaluate)
+
+    try:
+        # the starting score is only needed for the lower bound and the trace
+        score = None
+        if lower_bound is not None or recording:
+            score = evaluate(solution)
+
+        # the gap to the lower bound is closed by the best delta
+        gap = None
+        if lower_bound is not None:
+            gap = score - lower_bound
+
+        i = 0
+        idle = 0
+
+        while ((not (i > min_iters and idle > idle_threshold*i))
+               and i < max_iters
+               and (gap is None or gap + best_delta > 0)):
+            neighbours = ((changes,
+                           partial_evaluate(current_solution, changes))
+                          for changes in neighbourhood(current_solution))
+
+            acceptable = ((changes, delta)
+                          for changes, delta
+                          in islice(neighbours, explore_size)
+                          if acceptance_condition.acceptable(current_solution,
+                                                             changes,
+                                                             delta))
+
+            best_neighbour = min(acceptable,
+                                 key=lambda neighbour: neighbour[1],
+                                 default=None)
+
+            if best_neighbour is not None:
+                # accept the best neighbour
+                changes, delta = best_neighbour
+                if delta < 0:
+                    idle = 0
+                else:
+                    idle += 1
+
+                acceptance_condition.accept(current_solution, changes, delta)
+                if check is not None:
+                    check.accept(current_solution, changes)
+                apply_changes(current_solution, changes)
+                current_delta += delta
+
+                # save the best solution
+                if current_delta < best_delta:
+                    best_solution = np.copy(current_solution)
+                    best_delta = current_delta
+                    if handing:
+                        checkpoint.submit(best_solution)
             else:
                 idle += 1
-
-            acceptance_condition.accept(current_solution, changes, delta)
-            apply_changes(current_solution, changes)
-            current_delta += delta
-
-            # save the best solution
-            if current_delta < best_delta:
-                best_solution = np.copy(current_solution)
-                best_delta = current_delta
-        else:
-            idle += 1
-            acceptance_condition.reject()
-
-        if report_period is not None and (i+1) % report_period == 0:
-            print(f"{i+1}\t\t{-current_delta}")
-
-        i += 1
-
+                acceptance_condition.reject()
+
+            if report_period is not None and (i+1) % report_period == 0:
+                if gap is None:
+                    print(f"{i+1}\t\t{-current_delta}")
+                else:
+                    print(f"{i+1}\t\t{-current_delta}"
+                          f"\tgap: {gap + best_delta}")
+
+            i += 1
+
+            if recording:
+                trace.record(i,
+                             delta if best_neighbour is not None else np.nan,
+                             score + current_delta, score + best_delta,
+                             best_neighbour is not None)
+
+            if callback is not None and callback(i, -best_delta) is False:
+                break
+    finally:
+        if checkpoint is not None:
+            checkpoint.end()
+        if trace is not None:
+            trace.end()
     return best_solution
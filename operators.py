@@ -43,3 +43,15 @@ def schedule_in_slots(item, timeslots, rooms):
 
 def unschedule_slots(timeslots, rooms):
     return schedule_in_slots(-1, timeslots, rooms)
+
+
+def schedule_cells(cells):
+    """`cells` maps each (timeslot, room) position
+    to the item it should hold after the change
+    """
+    items, timeslots, rooms = [], [], []
+    for (timeslot, room), item in cells.items():
+        items.append(item)
+        timeslots.append(timeslot)
+        rooms.append(room)
+    return (items, timeslots, rooms)
@@ -0,0 +1,214 @@
+"""
+A repacking of the sessions of one stream: the abstracts they hold,
+and the unscheduled abstracts of the stream, are redistributed over
+the sessions with a branch and bound search
+"""
+import random
+from collections import defaultdict, Counter
+import numpy as np
+from .buckets import AbstractsBuckets, abstracts_positions
+from ..utils import session_to_timeslots_map, timeslot_to_session_map
+
+
+class SessionPacker:
+    """Packs one or more sessions of a stream at the least penalty given the
+    fixed rest of the schedule. A packing chooses the session of every
+    abstract, or leaves it unscheduled, and lays out each session with
+    its ordered abstracts first, by order, followed by the others.
+    The search is exact unless `max_nodes` is given, in which case it is
+    cut off after `max_nodes` nodes, returning the best packing found so far
+    """
+
+    def __init__(self, streams_solution, weights,
+                 streams, abstracts, sessions,
+                 max_nodes=None):
+        self.max_nodes = max_nodes
+        self._weights = weights
+        self._buckets = AbstractsBuckets(streams_solution, streams,
+                                         abstracts, sessions)
+        self._orders = abstracts['Order'].to_numpy()
+        self._preferences = abstracts[list(sessions['Sessions'])].to_numpy(
+            dtype=float)
+
+        self._stream_abstracts = defaultdict(list)
+        for abstract, stream in self._buckets.streams.items():
+            self._stream_abstracts[stream].append(abstract)
+
+        # a clash counts once for every abstract that lists it,
+        # so both directions are counted
+        abstracts_map = dict(zip(abstracts['Reference'], abstracts.index))
+        clashes_start = abstracts.columns.get_loc('Clash')
+        self._clashes = defaultdict(Counter)
+        for abstract, clash_refs in zip(
+                abstracts.index,
+                abstracts.iloc[:, clashes_start:].itertuples(index=False)):
+            for clash_ref in clash_refs:
+                if clash_ref != 0:
+                    clash = abstracts_map[clash_ref]
+                    self._clashes[abstract][clash] += 1
+                    self._clashes[clash][abstract] += 1
+
+        self._timeblock_to_timeslots = session_to_timeslots_map(sessions)
+        self._timeslot_to_timeblock = timeslot_to_session_map(sessions)
+        self._session_streams = {(start, room): stream
+                                 for stream, stream_sessions
+                                 in self._buckets.sessions.items()
+                                 for start, _end, room in stream_sessions}
+
+    def session_groups(self, streams=None):
+        """every session of every stream, or of the given streams,
+        alone and together with the next session of its stream
+        """
+        if streams is None:
+            streams = self._buckets.sessions
+        for stream in streams:
+            stream_sessions = sorted(self._buckets.sessions.get(stream, ()))
+            for i, session in enumerate(stream_sessions):
+                yield [session]
+                if i + 1 < len(stream_sessions):
+                    yield stream_sessions[i:i + 2]
+
+    def neighbourhood(self, solution):
+        """Yields the optimal repacking of random session groups,
+        stops when no group changes the schedule anymore
+        """
+        groups = list(self.session_groups())
+        failures = 0
+        max_failures = 10 * len(groups)
+        while groups and failures < max_failures:
+            changes = self.repack(solution, random.choice(groups))
+            if changes is None:
+                failures += 1
+            else:
+                failures = 0
+                yield changes
+
+    def repack(self, solution, sessions):
+        """the changes that optimally repack the (start, end, room)
+        sessions of a stream, or None if the packing is unchanged
+        """
+        buckets = self._buckets
+        weights = self._weights
+        stream = self._session_streams[sessions[0][0], sessions[0][2]]
+        timeblocks = [self._timeslot_to_timeblock[start]
+                      for start, _end, _room in sessions]
+
+        candidates = set()
+        for start, end, room in sessions:
+            candidates.update(solution[start:end, room])
+        candidates.discard(-1)
+        positions = abstracts_positions(solution)
+        candidates.update(abstract for abstract in self._stream_abstracts[stream]
+                          if abstract not in positions)
+        if not candidates:
+            return None
+        fixed = np.copy(solution)
+        fixed[np.isin(fixed, list(candidates))] = -1
+
+        # ordered abstracts are branched on first, by order,
+        # so that their timeslots are known when they are placed
+        candidates = sorted(candidates, key=lambda abstract: (
+            self._orders[abstract] == 0,
+            self._orders[abstract],
+            -buckets.lengths[abstract]))
+
+        # the (timeslot, order) of the fixed ordered abstracts of the stream
+        placed_orders = [(timeslot, self._orders[abstract])
+                         for abstract, (timeslot, _room, _length)
+                         in abstracts_positions(fixed).items()
+                         if buckets.streams.get(abstract) == stream
+                         and self._orders[abstract] != 0]
+
+        # the part of the cost of each placement that does not
+        # depend on the other candidates
+        fixed_timeblocks = {}
+        for timeblock in set(timeblocks):
+            start, end = self._timeblock_to_timeslots[timeblock]
+            fixed_timeblocks[timeblock] = set(fixed[start:end, :].flat)
+        base_costs = {
+            abstract: [weights[9] * self._preferences[abstract, timeblock]
+                       + weights[10] * sum(
+                           count for clash, count
+                           in self._clashes[abstract].items()
+                           if clash in fixed_timeblocks[timeblock])
+                       for timeblock in timeblocks]
+            for abstract in candidates}
+        lower_bounds = [min([weights[7]] + base_costs[abstract])
+                        for abstract in candidates]
+        remaining_bounds = np.cumsum(lower_bounds[::-1])[::-1].tolist() + [0]
+
+        free = [end - start for start, end, _room in sessions]
+        ordered_ends = [start for start, _end, _room in sessions]
+        added = defaultdict(list)
+        assignment = [None] * len(candidates)
+        best = {'cost': np.inf, 'assignment': None}
+        nodes = 0
+
+        def search(i, cost):
+            nonlocal nodes
+            nodes += 1
+            if ((self.max_nodes is not None and nodes > self.max_nodes)
+                    or cost + remaining_bounds[i] >= best['cost']):
+                return
+            if i == len(candidates):
+                best['cost'] = cost
+                best['assignment'] = list(assignment)
+                return
+
+            abstract = candidates[i]
+            length = buckets.lengths[abstract]
+            order = self._orders[abstract]
+            options = [(weights[7], None)]
+            for j, timeblock in enumerate(timeblocks):
+                if free[j] < length:
+                    continue
+                option_cost = (base_costs[abstract][j]
+                               + weights[10] * sum(
+                                   self._clashes[abstract][other]
+                                   for other in added[timeblock]))
+                if order != 0:
+                    timeslot = ordered_ends[j]
+                    option_cost += weights[8] * sum(
+                        1 for other_timeslot, other_order in placed_orders
+                        if (other_timeslot < timeslot
+                            and other_order > order)
+                        or (other_timeslot > timeslot
+                            and other_order < order))
+                options.append((option_cost, j))
+
+            for option_cost, j in sorted(options, key=lambda option: option[0]):
+                assignment[i] = j
+                if j is None:
+                    search(i + 1, cost + option_cost)
+                    continue
+                free[j] -= length
+                added[timeblocks[j]].append(abstract)
+                if order != 0:
+                    placed_orders.append((ordered_ends[j], order))
+                    ordered_ends[j] += length
+                search(i + 1, cost + option_cost)
+                if order != 0:
+                    ordered_ends[j] -= length
+                    placed_orders.pop()
+                added[timeblocks[j]].pop()
+                free[j] += length
+
+        search(0, 0)
+        if best['assignment'] is None:
+            return None
+
+        # lay out every session, the candidates are already in order
+        new_solution = fixed
+        ends = [start for start, _end, _room in sessions]
+        for abstract, j in zip(candidates, best['assignment']):
+            if j is not None:
+                length = buckets.lengths[abstract]
+                new_solution[ends[j]:ends[j] + length, sessions[j][2]] = abstract
+                ends[j] += length
+
+        changed = np.nonzero(new_solution != solution)
+        if len(changed[0]) == 0:
+            return None
+        return (list(new_solution[changed]),
+                list(changed[0]),
+                list(changed[1]))
@@ -0,0 +1,106 @@
+"""
+The two-phase scheduling pipeline shared by the command line,
+the decomposition, the service and the sweeps: a genetic algorithm
+over the streams, then a tabu search over the abstracts
+"""
+from . import StreamsScheduler, AbstractsScheduler
+from .assignment import assignment_streams_solution
+from .hotspots import StreamsHotspots
+from ..heuristics import (
+    slot_tabu_search,
+    steady_state_genetic_algorithm,
+    streams_population,
+)
+from ..heuristics.lns import large_neighbourhood_search
+from ..config import DEFAULT_MAXITERS
+
+
+def schedule_conference(input_data, weights,
+                        streams_solution=None,
+                        abstracts_solution=None,
+                        improve_streams=True,
+                        improve_abstracts=True,
+                        max_iters=DEFAULT_MAXITERS,
+                        population_size=40,
+                        explore_size=150,
+                        items_length=250,
+                        pos_length=100,
+                        idle_threshold=0.1,
+                        streams_hotspots=False,
+                        lns_iters=0,
+                        polish=False,
+                        report_period=None,
+                        progress=None,
+                        prepare=None,
+                        finish=None):
+    """Schedules the streams and then the abstracts of an instance.
+    The streams start from `streams_solution`, or a minimum-cost
+    assignment, and the abstracts from `abstracts_solution`, or a
+    best-fit schedule. A phase whose `improve_` flag is False keeps its
+    starting solution. The tabu search of the abstracts is optionally
+    followed by `lns_iters` iterations of a large neighbourhood search
+    and a repacking of the sessions.
+    `progress(phase)` gives the callback of the searches of a phase,
+    'streams' or 'abstracts', `prepare(phase, scheduler)` is called
+    before the searches of a phase and `finish(phase, scheduler)` after.
+    Returns the streams and abstracts schedulers
+    """
+    def callback(phase):
+        return progress(phase) if progress is not None else None
+
+    streams_scheduler = StreamsScheduler(input_data, weights)
+    if streams_solution is None:
+        streams_solution = assignment_streams_solution(input_data, weights)
+    streams_scheduler.solution = streams_solution
+    if prepare is not None:
+        prepare('streams', streams_scheduler)
+    if improve_streams:
+        neighbourhood = None
+        if streams_hotspots:
+            neighbourhood = StreamsHotspots(input_data,
+                                            weights).neighbourhood
+        streams_scheduler.improve(steady_state_genetic_algorithm,
+                                  streams_population(input_data,
+                                                     population_size),
+                                  neighbourhood=neighbourhood,
+                                  report_period=report_period,
+                                  callback=callback('streams'),
+                                  max_iters=max_iters)
+    if finish is not None:
+        finish('streams', streams_scheduler)
+
+    abstracts_scheduler = AbstractsScheduler(input_data, weights,
+                                             streams_scheduler.solution)
+    if abstracts_solution is None:
+        abstracts_scheduler.initialize(best_fit=True)
+    else:
+        abstracts_scheduler.solution = abstracts_solution
+    if prepare is not None:
+        prepare('abstracts', abstracts_scheduler)
+    if improve_abstracts:
+        abstracts_scheduler.improve(slot_tabu_search,
+                                    neighbourhood=(
+                                        abstracts_scheduler.hotspot_neighbourhood),
+                                    explore_size=explore_size,
+                                    items_length=items_length,
+                                    pos_length=pos_length,
+                                    idle_threshold=idle_threshold,
+                                    report_period=report_period,
+                                    lower_bound=abstracts_scheduler.lower_bound,
+                                    callback=callback('abstracts'),
+                                    max_iters=max_iters)
+        if lns_iters > 0:
+            abstracts_scheduler.improve(
+                large_neighbourhood_search,
+                neighbourhood=abstracts_scheduler.large_neighbourhood,
+                report_period=(None if report_period is None
+                               else max(1, lns_iters//10)),
+                lower_bound=abstracts_scheduler.lower_bound,
+                callback=callback('abstracts'),
+                min_iters=min(100, lns_iters),
+                max_iters=lns_iters)
+        if polish:
+            abstracts_scheduler.polish()
+    if finish is not None:
+        finish('abstracts', abstracts_scheduler)
+    return streams_scheduler, abstracts_scheduler
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class AbstractsPlacement:
+    """A compact abstracts schedule that stores the start timeslot,
+    room and required length of every abstract instead of a grid of
+    timeslots and rooms. Unscheduled abstracts start at -1.
+    An abstract that does not fill its required timeslots in a single
+    room of a grid, a split abstract, keeps the cells it occupies
+    until it is placed again.
+    The grid view is only materialized when it is requested
+    """
+
+    def __init__(self, lengths, num_timeslots, num_rooms):
+        self.lengths = np.array(lengths, dtype=np.int32)
+        self.starts = np.full(len(self.lengths), -1, dtype=np.int32)
+        self.rooms = np.full(len(self.lengths), -1, dtype=np.int32)
+        self.shape = (num_timeslots, num_rooms)
+        # the (timeslots, rooms) cells of every split abstract
+        self.split = {}
+        self._grid = None
+
+    @staticmethod
+    def from_grid(grid, lengths) -> 'AbstractsPlacement':
+        """the placement of a (timeslots, rooms) grid of abstracts,
+        an abstract starts at its first timeslot in its first room
+        """
+        placement = AbstractsPlacement(lengths, *grid.shape)
+        timeslots, rooms = np.nonzero(grid != -1)
+        abstracts = grid[timeslots, rooms]
+        order = np.lexsort((timeslots, rooms, abstracts))
+        timeslots, rooms = timeslots[order], rooms[order]
+        abstracts, first, counts = np.unique(abstracts[order],
+                                             return_index=True,
+                                             return_counts=True)
+        starts, start_rooms = timeslots[first], rooms[first]
+        placement.starts[abstracts] = starts
+        placement.rooms[abstracts] = start_rooms
+
+        # the cells of an abstract are ordered by room, then timeslot,
+        # so it fills its required timeslots when the last cell is
+        # in the first room, `length - 1` timeslots after the first
+        last = first + counts - 1
+        contiguous = ((counts == placement.lengths[abstracts])
+                      & (rooms[last] == start_rooms)
+                      & (timeslots[last] == starts + counts - 1))
+        for index in np.flatnonzero(~contiguous):
+            cells = slice(first[index], last[index] + 1)
+            placement.split[abstracts[index]] = (timeslots[cells],
+                                                 rooms[cells])
+        return placement
+
+    @property
+    def grid(self):
+        """a read-only (timeslots, rooms) grid of the abstracts"""
+        if self._grid is None:
+            grid = np.full(self.shape, -1, dtype=np.int32)
+            scheduled = self.starts != -1
+            scheduled[list(self.split)] = False
+            abstracts = np.flatnonzero(scheduled)
+            lengths = self.lengths[abstracts]
+            # the offset of every occupied timeslot within its abstract
+            offsets = (np.arange(lengths.sum())
+                       - np.repeat(np.cumsum(lengths) - lengths, lengths))
+            timeslots = np.repeat(self.starts[abstracts], lengths) + offsets
+            rooms = np.repeat(self.rooms[abstracts], lengths)
+            grid[timeslots, rooms] = np.repeat(abstracts, lengths)
+            for abstract, cells in self.split.items():
+                grid[cells] = abstract
+            grid.flags.writeable = False
+            self._grid = grid
+        return self._grid
+
+    def is_scheduled(self, abstract):
+        return self.starts[abstract] != -1
+
+    def is_split(self, abstract):
+        return abstract in self.split
+
+    def schedule(self, abstract, start, room):
+        """place `abstract` on its required timeslots from `start`"""
+        self.split.pop(abstract, None)
+        self.starts[abstract] = start
+        self.rooms[abstract] = room
+        self._grid = None
+
+    def unschedule(self, abstract):
+        self.schedule(abstract, -1, -1)
+
+    def swap(self, abstract, other):
+        """exchange the positions of two abstracts of equal length"""
+        start, room = self.starts[abstract], self.rooms[abstract]
+        self.schedule(abstract, self.starts[other], self.rooms[other])
+        self.schedule(other, start, room)
@@ -0,0 +1,137 @@
+"""
+Opt-in profiling of the penalty components and the local searches.
+The functions decorated with `profiled` record their calls into the
+stats being collected, if any, and cost a single check otherwise
+"""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from collections import defaultdict
+from functools import wraps
+import pandas as pd
+
+# the stats collecting the profiled calls, None when profiling is off
+_active = None
+
+
+@dataclass
+class ComponentStats:
+    calls: int = 0
+    seconds: float = 0
+    cells: int = 0
+
+
+class ProfileStats:
+    """Call counts, cumulative time and changed cells of every
+    profiled component, by name
+    """
+
+    def __init__(self):
+        self.components = defaultdict(ComponentStats)
+
+    def record(self, name, seconds, cells=0):
+        component = self.components[name]
+        component.calls += 1
+        component.seconds += seconds
+        component.cells += cells
+
+    def table(self):
+        """the stats as a table, slowest component first"""
+        table = pd.DataFrame(
+            [(name, component.calls, component.seconds, component.cells)
+             for name, component in self.components.items()],
+            columns=['component', 'calls', 'seconds', 'cells'])
+        table['us_per_call'] = 1e6 * table['seconds'] / table['calls']
+        return (table.sort_values('seconds', ascending=False)
+                .reset_index(drop=True))
+
+    def report(self):
+        if not self.components:
+            return 'No profiled calls.'
+        return self.table().to_string(index=False,
+                                      float_format=lambda x: f'{x:.3f}')
+
+
+@contextmanager
+def collecting(stats):
+    """collects the profiled calls into `stats` while inside the block,
+    profiling carries on into the current stats when `stats` is None
+    """
+    global _active  # pylint: disable=global-statement
+    if stats is None:
+        yield _active
+        return
+    previous, _active = _active, stats
+    try:
+        yield stats
+    finally:
+        _active = previous
+
+
+def active_stats():
+    return _active
+
+
+def profiled(function):
+    """Records the calls of a penalty component. The changed cells
+    of partial evaluators, whose third argument is the changed
+    (timeslots, rooms), are counted too. The components called
+    by a profiled component are not recorded separately
+    """
+    name = function.__name__
+    partial = name.startswith('partial_')
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        global _active  # pylint: disable=global-statement
+        stats = _active
+        if stats is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        _active = None
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            _active = stats
+        cells = len(args[2][0]) if partial and len(args) > 2 else 0
+        stats.record(name, time.perf_counter() - start, cells)
+        return result
+    return wrapper
+
+
+def timed_neighbourhood(stats, neighbourhood):
+    """the neighbourhood, recording the time spent generating neighbours"""
+    def timed(solution):
+        neighbours = neighbourhood(solution)
+        while True:
+            start = time.perf_counter()
+            changes = next(neighbours, None)
+            stats.record('neighbourhood', time.perf_counter() - start)
+            if changes is None:
+                return
+            yield changes
+    return timed
+
+
+class TimedCondition:
+    """An acceptance condition recording the time spent deciding"""
+
+    def __init__(self, stats, condition):
+        self._stats = stats
+        self._condition = condition
+
+    def acceptable(self, solution, changes, delta):
+        start = time.perf_counter()
+        acceptable = self._condition.acceptable(solution, changes, delta)
+        self._stats.record('acceptance', time.perf_counter() - start)
+        return acceptable
+
+    def accept(self, solution, changes, delta):
+        start = time.perf_counter()
+        self._condition.accept(solution, changes, delta)
+        self._stats.record('acceptance', time.perf_counter() - start)
+
+    def reject(self):
+        start = time.perf_counter()
+        self._condition.reject()
+        self._stats.record('acceptance', time.perf_counter() - start)
@@ -0,0 +1,114 @@
+"""
+Readers of the instance sheets and saved schedules. The format follows
+the extension of the input path, as for the writers: an Excel workbook
+(.xlsx, .xls), a JSON document (.json), a directory of Parquet files
+(.parquet) or, without an extension, a directory of CSV files, with a
+file per sheet named after the sheet
+"""
+import json
+import os
+import pandas as pd
+from .utils import fill_data
+from .checks import check_data
+
+# the sheets of an instance, the penalty sheets hold the names
+# of their rows in their first column
+INSTANCE_SHEETS = [
+    'abstracts',
+    'streams',
+    'rooms',
+    'sessions',
+    'streams_sessions|penalty',
+    'streams_rooms|penalty',
+    'streams_streams|penalty',
+    'sessions_rooms|penalty',
+]
+
+
+def read_data(path):
+    """reads, fills and checks the sheets of an instance"""
+    data = read_sheets(path, INSTANCE_SHEETS)
+    fill_data(data)
+    check_data(data)
+    return data
+
+
+def read_sheets(path, sheets=None, index_col=None):
+    """Reads the sheets of `path` by name, all of them when `sheets` is
+    None, in the format of its extension. The column `index_col`
+    becomes the index, the index of JSON documents and Parquet files is
+    their own. Raises KeyError for a missing sheet
+    """
+    extension = os.path.splitext(path.rstrip(os.sep))[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Cannot read {path}: the supported extensions"
+                         f" are {', '.join(ext for ext in READERS if ext)}"
+                         f" or none for a directory of CSV files")
+    return READERS[extension](path, sheets, index_col)
+
+
+def read_excel(path, sheets, index_col):
+    """reads only the requested sheets of the workbook"""
+    workbook = pd.ExcelFile(path)
+    sheets = _requested(workbook.sheet_names, sheets)
+    return {sheet: workbook.parse(sheet, index_col=index_col)
+            for sheet in sheets}
+
+
+def read_csv(path, sheets, index_col):
+    sheets = _requested(_directory_sheets(path, '.csv'), sheets)
+    return {sheet: pd.read_csv(os.path.join(path, f'{sheet}.csv'),
+                               index_col=index_col)
+            for sheet in sheets}
+
+
+def read_parquet(path, sheets, _index_col):
+    """reads a Parquet file per sheet, needs pyarrow or fastparquet"""
+    sheets = _requested(_directory_sheets(path, '.parquet'), sheets)
+    return {sheet: pd.read_parquet(os.path.join(path, f'{sheet}.parquet'))
+            for sheet in sheets}
+
+
+def read_json(path, sheets, index_col):
+    """Reads a document mapping every sheet either to a list of
+    records, or to its columns, rows and optionally its index
+    as written by `writers.write_json`
+    """
+    with open(path) as input_file:
+        document = json.load(input_file)
+    sheets = _requested(list(document), sheets)
+    tables = {}
+    for sheet in sheets:
+        entry = document[sheet]
+        if isinstance(entry, list):
+            table = pd.DataFrame.from_records(entry)
+        else:
+            table = pd.DataFrame(entry['data'], columns=entry['columns'],
+                                 index=entry.get('index'))
+        if index_col is not None and 'index' not in entry:
+            table = table.set_index(table.columns[index_col])
+        tables[sheet] = table
+    return tables
+
+
+def _directory_sheets(path, extension):
+    return [name[:-len(extension)] for name in sorted(os.listdir(path))
+            if name.endswith(extension)]
+
+
+def _requested(available, sheets):
+    if sheets is None:
+        return available
+    for sheet in sheets:
+        if sheet not in available:
+            raise KeyError(sheet)
+    return sheets
+
+
+READERS = {
+    '.xlsx': read_excel,
+    '.xls': read_excel,
+    '.json': read_json,
+    '.parquet': read_parquet,
+    '': read_csv,
+}
@@ -0,0 +1,352 @@
+"""
+Re-optimization of a saved schedule after edits to the instance,
+moving as few of the already published talks as possible
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from typing import List, Mapping, Set, Tuple
+import numpy as np
+import pandas as pd
+from .scheduler import StreamsScheduler, AbstractsScheduler
+from .scheduler.assignment import cell_costs
+from .operators import apply_changes
+from .operators.buckets import abstracts_positions
+from .heuristics import slot_tabu_search
+from .utils import session_to_timeslots_map, unique_scheduled_elements
+from .exceptions import IncompatibleDimensionsError, InvalidEditError
+
+
+@dataclass
+class RepairState:
+    """The instance and the schedule being edited,
+    with the abstracts and streams whose placement was disturbed
+    """
+    input_data: Mapping[str, pd.DataFrame]
+    streams_solution: np.ndarray
+    abstracts_solution: np.ndarray
+    abstracts: Set[int] = field(default_factory=set)
+    streams: Set[int] = field(default_factory=set)
+    # (stream, session) of the sessions lost with a room
+    lost_sessions: List[Tuple[int, int]] = field(default_factory=list)
+
+    def unschedule(self, abstracts):
+        """removes the abstracts from the schedule
+        and marks them, and their streams, as disturbed
+        """
+        abstracts = set(abstracts)
+        abstracts.discard(-1)
+        self.abstracts_solution[np.isin(self.abstracts_solution,
+                                        list(abstracts))] = -1
+        self.abstracts |= abstracts
+        stream_ids = dict(zip(self.input_data['streams']['Streams'],
+                              self.input_data['streams'].index))
+        self.streams.update(
+            stream_ids[name] for name
+            in self.input_data['abstracts'].loc[list(abstracts), 'Stream'])
+
+
+@dataclass(frozen=True)
+class RemoveAbstract:
+    reference: str
+
+    def apply(self, state):
+        data = state.input_data
+        abstracts = data['abstracts']
+        abstract = _row(self, abstracts, 'Reference', self.reference,
+                        'abstract')
+        state.unschedule([abstract])
+        state.abstracts.discard(abstract)
+
+        abstracts = abstracts.drop(index=abstract).reset_index(drop=True)
+        clashes = abstracts.columns[abstracts.columns.get_loc('Clash'):]
+        abstracts[clashes] = abstracts[clashes].replace(self.reference, 0)
+        data['abstracts'] = abstracts
+
+        # the abstracts after the removed one move up by one
+        solution = state.abstracts_solution
+        solution[solution > abstract] -= 1
+        state.abstracts = {other - (other > abstract)
+                           for other in state.abstracts}
+
+
+@dataclass(frozen=True)
+class AddAbstract:
+    reference: str
+    stream: str
+    required_timeslots: int
+    order: int = 0
+    session_costs: Mapping[str, float] = field(default_factory=dict)
+    clashes: List[str] = field(default_factory=list)
+
+    def apply(self, state):
+        data = state.input_data
+        abstracts = data['abstracts']
+        if (abstracts['Reference'] == self.reference).any():
+            raise InvalidEditError(self, f"the abstract '{self.reference}'"
+                                         f" already exists")
+        stream = _row(self, data['streams'], 'Streams', self.stream, 'stream')
+        unknown = set(self.session_costs) - set(data['sessions']['Sessions'])
+        if unknown:
+            raise InvalidEditError(self, f"there are no sessions"
+                                         f" {_names(unknown)}")
+        unknown = set(self.clashes) - set(abstracts['Reference'])
+        if unknown:
+            raise InvalidEditError(self, f"there are no abstracts"
+                                         f" {_names(unknown)}")
+        record = dict.fromkeys(abstracts.columns, 0)
+        record.update({'Reference': self.reference,
+                       'Stream': self.stream,
+                       'Required Timeslots': self.required_timeslots,
+                       'Order': self.order})
+        record.update(self.session_costs)
+
+        clashes = list(abstracts.columns[abstracts.columns.get_loc('Clash'):])
+        for i in range(len(clashes), len(self.clashes)):
+            clashes.append(f'Clash.{i}')
+        record.update(zip(clashes, self.clashes))
+        abstracts = pd.concat([abstracts, pd.DataFrame([record])],
+                              ignore_index=True)
+        data['abstracts'] = abstracts.fillna(0)
+
+        abstract = len(abstracts.index) - 1
+        state.abstracts.add(abstract)
+        state.streams.add(stream)
+
+
+@dataclass(frozen=True)
+class RemoveRoom:
+    room: str
+
+    def apply(self, state):
+        data = state.input_data
+        room = _row(self, data['rooms'], 'Rooms', self.room, 'room')
+        data['rooms'] = data['rooms'].drop(index=room).reset_index(drop=True)
+        for sheet in ('streams_rooms|penalty', 'sessions_rooms|penalty'):
+            # the penalty sheets have the names in their first column
+            data[sheet] = data[sheet].drop(
+                columns=data[sheet].columns[room + 1])
+
+        state.unschedule(state.abstracts_solution[:, room])
+        state.abstracts_solution = np.delete(state.abstracts_solution,
+                                             room, axis=1)
+        sessions = np.flatnonzero(state.streams_solution[:, room] != -1)
+        state.lost_sessions.extend(
+            (state.streams_solution[session, room], session)
+            for session in sessions)
+        state.streams.update(state.streams_solution[sessions, room])
+        state.streams_solution = np.delete(state.streams_solution,
+                                           room, axis=1)
+
+
+@dataclass(frozen=True)
+class ChangeTalkCount:
+    session: str
+    talks: int
+
+    def apply(self, state):
+        sessions = state.input_data['sessions']
+        session = _row(self, sessions, 'Sessions', self.session, 'session')
+        if self.talks < 0:
+            raise InvalidEditError(self, "the number of talks is negative")
+        start, end = session_to_timeslots_map(sessions)[session]
+        talks = end - start
+        sessions = sessions.copy()
+        sessions.at[session, 'Max number of talks'] = self.talks
+        state.input_data['sessions'] = sessions
+
+        if self.talks < talks:
+            removed = range(start + self.talks, end)
+            state.unschedule(state.abstracts_solution[removed, :].ravel())
+            state.abstracts_solution = np.delete(state.abstracts_solution,
+                                                 removed, axis=0)
+        elif self.talks > talks:
+            empty = np.full((self.talks - talks,
+                             state.abstracts_solution.shape[1]), -1,
+                            dtype=state.abstracts_solution.dtype)
+            state.abstracts_solution = np.insert(state.abstracts_solution,
+                                                 end, empty, axis=0)
+            # the streams of the session gain free timeslots
+            state.streams.update(state.streams_solution[session, :])
+            state.streams.discard(-1)
+
+
+def _row(edit, sheet, column, name, kind):
+    """the index of the row of `sheet` named `name` in `column`"""
+    rows = sheet.index[sheet[column] == name]
+    if len(rows) == 0:
+        raise InvalidEditError(edit, f"there is no {kind} '{name}'")
+    return rows[0]
+
+
+def _names(names):
+    return ', '.join(f"'{name}'" for name in sorted(map(str, names)))
+
+
+EDITS = {
+    'remove_abstract': RemoveAbstract,
+    'add_abstract': AddAbstract,
+    'remove_room': RemoveRoom,
+    'change_talk_count': ChangeTalkCount,
+}
+
+
+def read_edits(path):
+    """Reads a JSON list of edits, each an object with an 'edit'
+    key naming the edit and the fields of that edit, for example:
+    {"edit": "remove_room", "room": "room3"}
+    Raises InvalidEditError for an unknown edit or invalid fields
+    """
+    with open(path) as edits_file:
+        records = json.load(edits_file)
+    edits = []
+    for record in records:
+        fields = dict(record)
+        kind = fields.pop('edit', None)
+        if kind not in EDITS:
+            raise InvalidEditError(record, f"the edit should be one of"
+                                           f" {', '.join(EDITS)}")
+        try:
+            edits.append(EDITS[kind](**fields))
+        except TypeError as error:
+            raise InvalidEditError(record, error) from error
+    return edits
+
+
+class RepairScheduler(AbstractsScheduler):
+    """An abstracts scheduler that only moves the abstracts disturbed
+    by the edits, and the other abstracts of their streams, and pays
+    `disruption` for every published abstract moved
+    """
+
+    def __init__(self, input_data, weights,
+                 streams_solution, abstracts_solution,
+                 movable, disruption=0):
+        super().__init__(input_data, weights, streams_solution)
+        self.solution = abstracts_solution
+        self.disruption = disruption
+        self._movable = sorted(movable)
+        # (start, room, length) of the published abstracts
+        self.published = abstracts_positions(abstracts_solution)
+
+    @property
+    def score(self):
+        return (super().score
+                + self.disruption * self.moved(self.solution))
+
+    def moved(self, solution, abstracts=None):
+        """the number of published abstracts that left their position"""
+        if abstracts is None:
+            abstracts = self.published
+        positions = abstracts_positions(solution)
+        return sum(1 for abstract in abstracts
+                   if abstract in self.published
+                   and positions.get(abstract) != self.published[abstract])
+
+    def repair_neighbourhood(self, solution):
+        if not self._movable:
+            return iter(())
+        return self._buckets.neighbourhood(
+            solution, choose=lambda: random.choice(self._movable))
+
+    def _weighted_evaluate(self, solution):
+        return (super()._weighted_evaluate(solution)
+                + self.disruption * self.moved(solution))
+
+    def _weighted_partial_evaluate(self, solution, changes):
+        delta = super()._weighted_partial_evaluate(solution, changes)
+        if self.disruption:
+            new_solution = apply_changes(solution, changes, inplace=False)
+            changed = unique_scheduled_elements(changes[1:],
+                                                solution, new_solution)
+            delta += self.disruption * (self.moved(new_solution, changed)
+                                        - self.moved(solution, changed))
+        return delta
+
+
+def solution_shapes(input_data):
+    """the (rows, rooms) shapes of the streams
+    and abstracts schedules of an instance
+    """
+    sessions = input_data['sessions']
+    num_rooms = len(input_data['rooms'].index)
+    return ((len(sessions.index), num_rooms),
+            (int(sessions['Max number of talks'].sum()), num_rooms))
+
+
+def solution_ids(saved, names, shape=None):
+    """the ids of the names in a saved schedule sheet,
+    -1 for the empty cells. Raises IncompatibleDimensionsError
+    for a name that is not in `names`, or a sheet that is not
+    of the given (rows, rooms) `shape`
+    """
+    if shape is not None and saved.shape != tuple(shape):
+        raise IncompatibleDimensionsError(
+            f"the sheet has {saved.shape[0]} rows and {saved.shape[1]}"
+            f" rooms instead of {shape[0]} and {shape[1]}")
+    ids = dict(zip(names, range(len(names))))
+    unknown = {name for row in saved.itertuples(index=False)
+               for name in row if pd.notna(name) and name not in ids}
+    if unknown:
+        raise IncompatibleDimensionsError(
+            f"{_names(unknown)} are not in the instance")
+    return np.array([[ids[name] if pd.notna(name) else -1
+                      for name in row]
+                     for row in saved.itertuples(index=False)],
+                    dtype=int).reshape(saved.shape)
+
+
+def repair_schedule(input_data, weights,
+                    saved_streams, saved_abstracts,
+                    edits,
+                    disruption=0,
+                    max_iters=200):
+    """Applies the edits to the instance and the saved schedule,
+    gives the sessions lost with a room back to their streams,
+    and re-optimizes the disturbed abstracts only.
+    Returns the edited instance and the streams and abstracts schedulers.
+    Raises InvalidEditError for an edit that does not fit the instance,
+    and IncompatibleDimensionsError for a saved schedule that does not
+    """
+    input_data = {sheet: data.copy() for sheet, data in input_data.items()}
+    streams_shape, abstracts_shape = solution_shapes(input_data)
+    state = RepairState(
+        input_data,
+        solution_ids(saved_streams, list(input_data['streams']['Streams']),
+                     streams_shape),
+        solution_ids(saved_abstracts,
+                     list(input_data['abstracts']['Reference']),
+                     abstracts_shape))
+    for edit in edits:
+        edit.apply(state)
+
+    # every lost session goes to the cheapest free cell
+    streams_solution = state.streams_solution
+    costs = cell_costs(input_data, weights)
+    for stream, _session in state.lost_sessions:
+        free = np.flatnonzero(streams_solution.ravel() == -1)
+        if len(free) > 0:
+            cell = free[np.argmin(costs[stream, free])]
+            streams_solution.flat[cell] = stream
+
+    streams_scheduler = StreamsScheduler(input_data, weights)
+    streams_scheduler.solution = streams_solution
+
+    abstracts = input_data['abstracts']
+    stream_names = set(input_data['streams'].loc[list(state.streams),
+                                                 'Streams'])
+    movable = state.abstracts | set(
+        abstracts.index[abstracts['Stream'].isin(stream_names)])
+    abstracts_scheduler = RepairScheduler(input_data, weights,
+                                          streams_solution,
+                                          state.abstracts_solution,
+                                          movable,
+                                          disruption=disruption)
+    abstracts_scheduler.improve(slot_tabu_search,
+                                neighbourhood=(
+                                    abstracts_scheduler.repair_neighbourhood),
+                                explore_size=20,
+                                min_iters=max_iters // 2,
+                                max_iters=max_iters)
+    abstracts_scheduler.polish(streams=state.streams)
+    return input_data, streams_scheduler, abstracts_scheduler
@@ -0,0 +1,190 @@
+"""
+A large neighbourhood of an abstracts schedule: a region of the
+schedule is destroyed and its abstracts are greedily re-inserted
+"""
+import random
+from collections import defaultdict
+import numpy as np
+from .buckets import AbstractsBuckets, abstracts_positions, free_gaps
+from ..utils import (
+    session_days,
+    session_to_timeslots_map,
+    timeslot_to_session_map,
+)
+
+
+class RuinAndRecreate:
+    """Removes every abstract of a timeblock, a stream or a room-day
+    from a schedule and re-inserts them, together with the unscheduled
+    abstracts of the streams owning the region, one at a time
+    in the free gap of their stream that adds the least penalty
+    """
+
+    REGIONS = ('timeblock', 'stream', 'room_day')
+
+    def __init__(self, streams_solution, weights,
+                 streams, abstracts, sessions,
+                 regions=REGIONS):
+        self.regions = regions
+        self._weights = weights
+        self._buckets = AbstractsBuckets(streams_solution, streams,
+                                         abstracts, sessions)
+        self._orders = abstracts['Order'].to_numpy()
+        self._preferences = abstracts[list(sessions['Sessions'])].to_numpy(
+            dtype=float)
+
+        # clashes are resolved by moving either abstract,
+        # so they are kept in both directions
+        abstracts_map = dict(zip(abstracts['Reference'], abstracts.index))
+        clashes_start = abstracts.columns.get_loc('Clash')
+        self._clashes = defaultdict(set)
+        for abstract, clash_refs in zip(
+                abstracts.index,
+                abstracts.iloc[:, clashes_start:].itertuples(index=False)):
+            for clash_ref in clash_refs:
+                if clash_ref != 0:
+                    clash = abstracts_map[clash_ref]
+                    self._clashes[abstract].add(clash)
+                    self._clashes[clash].add(abstract)
+
+        self._timeblock_to_timeslots = session_to_timeslots_map(sessions)
+        self._timeslot_to_timeblock = np.array(
+            timeslot_to_session_map(sessions), dtype=int)
+        lengths = sessions['Max number of talks'].to_numpy(dtype=int)
+        # the stream owning every cell of the abstracts schedule
+        self._cell_streams = np.repeat(streams_solution, lengths, axis=0)
+        self._timeslot_days = np.repeat(session_days(sessions).to_numpy(),
+                                        lengths)
+        self._days = list(np.unique(self._timeslot_days))
+
+        # the number of distinct regions of every kind, a kind
+        # without regions is never chosen
+        self._region_counts = {
+            'timeblock': len(self._timeblock_to_timeslots),
+            'stream': len(self._buckets.sessions),
+            'room_day': streams_solution.shape[1] * len(self._days),
+        }
+        self._region_kinds = [region for region in regions
+                              if self._region_counts.get(region, 1) > 0]
+
+    def neighbourhood(self, solution):
+        """Yields the changes of ruining and recreating random regions,
+        stops after as many consecutive failures as there are regions
+        """
+        if not self._region_kinds:
+            return
+        failures = 0
+        max_failures = sum(self._region_counts.get(region, 1)
+                           for region in self._region_kinds)
+        while failures < max_failures:
+            changes = self.ruin_and_recreate(solution)
+            if changes is None:
+                failures += 1
+            else:
+                failures = 0
+                yield changes
+
+    def ruin_and_recreate(self, solution, region=None):
+        """the changes that re-insert the abstracts of a random
+        region of `region` kind, or None if nothing changes
+        """
+        if region is None:
+            region = random.choice(self._region_kinds)
+        if self._region_counts.get(region, 1) == 0:
+            return None
+        mask = self._region(solution, region)
+
+        removed = set(np.unique(solution[mask]))
+        removed.discard(-1)
+        # give the unscheduled abstracts of the region a chance
+        streams = set(np.unique(self._cell_streams[mask]))
+        positions = abstracts_positions(solution)
+        removed.update(abstract for abstract in self._buckets.abstracts
+                       if abstract not in positions
+                       and self._buckets.streams[abstract] in streams)
+        if not removed:
+            return None
+
+        new_solution = np.copy(solution)
+        new_solution[np.isin(new_solution, list(removed))] = -1
+        for abstract in removed:
+            positions.pop(abstract, None)
+        self._recreate(new_solution, removed, positions)
+
+        changed = np.nonzero(new_solution != solution)
+        if len(changed[0]) == 0:
+            return None
+        return (list(new_solution[changed]),
+                list(changed[0]),
+                list(changed[1]))
+
+    def _region(self, solution, region):
+        """a (timeslots, rooms) mask of a random region"""
+        mask = np.zeros(solution.shape, dtype=bool)
+        if region == 'timeblock':
+            start, end = random.choice(self._timeblock_to_timeslots)
+            mask[start:end, :] = True
+        elif region == 'stream':
+            stream = random.choice(list(self._buckets.sessions))
+            mask = self._cell_streams == stream
+        elif region == 'room_day':
+            room = random.randrange(solution.shape[1])
+            day = random.choice(self._days)
+            mask[self._timeslot_days == day, room] = True
+        else:
+            raise ValueError(f"Unknown region: '{region}'")
+        return mask
+
+    def _recreate(self, solution, abstracts, positions):
+        """greedily inserts the abstracts into `solution`, in place,
+        ordered abstracts first and longest first otherwise
+        """
+        buckets = self._buckets
+        abstracts = list(abstracts)
+        random.shuffle(abstracts)
+        abstracts.sort(key=lambda abstract: (self._orders[abstract] == 0,
+                                             self._orders[abstract],
+                                             -buckets.lengths[abstract]))
+        for abstract in abstracts:
+            length = buckets.lengths[abstract]
+            stream = buckets.streams[abstract]
+            gaps = free_gaps(solution, buckets.sessions[stream])
+            candidates = [(start, room, gap_length - length)
+                          for gap_length, bucket in gaps.items()
+                          if gap_length >= length
+                          for start, room in bucket]
+            if not candidates:
+                continue
+
+            # (start, order) of the placed abstracts it can be misordered with
+            order = self._orders[abstract]
+            ordered = []
+            if order != 0:
+                ordered = [(other_start, self._orders[other])
+                           for other, (other_start, _, _) in positions.items()
+                           if buckets.streams[other] == stream
+                           and self._orders[other] not in (0, order)]
+
+            start, room, _ = min(candidates, key=lambda candidate: (
+                self._cost(solution, abstract, candidate[0], ordered),
+                candidate[2],
+                candidate[0]))
+            solution[start:start + length, room] = abstract
+            positions[abstract] = (start, room, length)
+
+    def _cost(self, solution, abstract, start, ordered):
+        """the weighted penalty of starting `abstract` at `start`,
+        given the abstracts already in `solution`
+        """
+        weights = self._weights
+        timeblock = self._timeslot_to_timeblock[start]
+        block_start, block_end = self._timeblock_to_timeslots[timeblock]
+        timeblock_abstracts = set(solution[block_start:block_end, :].flat)
+        order = self._orders[abstract]
+        misordered = sum(1 for other_start, other_order in ordered
+                         if (other_start < start and other_order > order)
+                         or (other_start > start and other_order < order))
+        return (weights[8] * misordered
+                + weights[9] * self._preferences[abstract, timeblock]
+                + weights[10] * len(self._clashes[abstract]
+                                    & timeblock_abstracts))
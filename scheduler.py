@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from ..profiling import collecting
+from ..verification import DriftCheck, verifying
+from ..checkpoint import Checkpoint, checkpointing
 
 
 class Scheduler(ABC):
@@ -17,30 +20,114 @@ class Scheduler(ABC):
             'streams_rooms': self._input_data['streams_rooms|penalty'],
             'sessions_rooms': self._input_data['sessions_rooms|penalty']
         }
+        # evaluations of the current solution are cached against
+        # a version that is bumped whenever the solution changes,
+        # and against the solution object, which subclasses may
+        # reassign without bumping the version
+        self._version = 0
+        self._cache = {}
+        self._cache_version = None
+        self._cache_solution = None
+        # a ProfileStats collects the profiled calls of the scheduler
+        self.stats = None
+        self._drift_check = None
+        self._checkpoint = None
 
     def find(self, heuristic, *args, **kwargs):
         self.initialize()
         self.improve(heuristic, *args, **kwargs)
 
-    def improve(self, heuristic, *args, **kwargs):
-        self.solution = heuristic(self.solution,
-                                  self._weighted_evaluate,
-                                  self._weighted_partial_evaluate,
-                                  self.neighbourhood,
-                                  *args,
-                                  **kwargs)
+    def improve(self, heuristic, *args, neighbourhood=None, **kwargs):
+        if neighbourhood is None:
+            neighbourhood = self.neighbourhood
+        with collecting(self.stats), verifying(self._drift_check), \
+                checkpointing(self._checkpoint):
+            self.solution = heuristic(self.solution,
+                                      self._weighted_evaluate,
+                                      self._weighted_partial_evaluate,
+                                      neighbourhood,
+                                      *args,
+                                      **kwargs)
+        self._touch()
+
+    def verify(self, period=None, probability=None, tolerance=1e-6):
+        """Verifies the incremental evaluation of the local searches
+        against a full evaluation every `period` accepted moves, or after
+        an accepted move with `probability`. Without either, stops verifying
+        """
+        self._drift_check = None
+        if period is not None or probability is not None:
+            self._drift_check = DriftCheck(self._evaluate,
+                                           self._partial_evaluate,
+                                           period=period,
+                                           probability=probability,
+                                           tolerance=tolerance)
+
+    def checkpoint(self, writer, kind):
+        """Hands every new best solution of the searches to the
+        CheckpointWriter `writer` as the solution of `kind`.
+        Without a writer, stops handing them over
+        """
+        self._checkpoint = None
+        if writer is not None:
+            self._checkpoint = Checkpoint(writer, kind)
+
+    @property
+    def version(self):
+        return self._version
 
     @property
     def score(self):
-        return self._weighted_evaluate(self.solution)
+        return self._weighted_penalty(self.detailed_score)
 
     @property
     def detailed_score(self):
-        return self._evaluate(self.solution)
+        return self._cached('penalties')
 
     @property
     def violations(self):
-        return self._evaluate(self.solution, violations=True)
+        return self._cached('violations')
+
+    def _touch(self):
+        """marks the solution as changed,
+        invalidating the cached evaluations
+        """
+        self._version += 1
+
+    def _cached(self, key):
+        solution = self.solution
+        if (self._cache_version != self._version
+                or self._cache_solution is not solution):
+            # rebind rather than clear, copies may share the old cache
+            self._cache = {}
+            self._cache_version = self._version
+            self._cache_solution = solution
+        if key not in self._cache:
+            with collecting(self.stats):
+                self._cache.update(self._evaluate_cached(solution, key))
+        return self._cache[key]
+
+    def _evaluate_cached(self, solution, key):
+        """Evaluations of `solution` to be cached, `key` is either
+        'penalties' or 'violations'. When the totals follow from the
+        violations, a single pass fills both entries
+        """
+        if key == 'penalties':
+            return {key: self._evaluate(solution)}
+        violations = self._evaluate(solution, violations=True)
+        cached = {'violations': violations}
+        penalties = self._totals(violations)
+        if penalties is not None:
+            cached['penalties'] = penalties
+        return cached
+
+    def _totals(self, violations):
+        """the penalties that follow from the violations,
+        or None when some of them do not. The streams penalties do not,
+        the parallel streams violations leave out the negative penalty
+        of the streams scheduled less than required
+        """
+        return None
 
     def _weighted_evaluate(self, solution):
         return self._weighted_penalty(
@@ -0,0 +1,385 @@
+"""
+A long-lived local scheduling service: every worker process of a pool
+reads an instance once and keeps it in memory, and scheduling jobs run
+in the pool behind a small JSON over HTTP interface
+
+    POST   /instances           {"path": "Instance.xlsx"}
+    GET    /instances
+    POST   /jobs                {"instance": 1, "weights": [...],
+                                 "max_iters": 200, "polish": false, ...}
+    GET    /jobs/<id>
+    GET    /jobs/<id>/progress  streams the progress events as JSON lines
+    DELETE /jobs/<id>           cancels the job
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List
+import pandas as pd
+from .readers import read_data
+from .scheduler.pipeline import schedule_conference
+from .repair import solution_ids, solution_shapes
+from .config import (
+    DEFAULT_WEIGHTS,
+    DEFAULT_SERVICE_HOST,
+    DEFAULT_SERVICE_PORT,
+    DEFAULT_SERVICE_MAXITERS,
+    DEFAULT_SERVICE_MAX_JOBS,
+)
+
+STATUS_REASONS = {200: 'OK', 201: 'Created', 202: 'Accepted',
+                  400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+# the instances of a worker process by id, read on their first job
+_instances = {}
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def solution_names(solution, names):
+    """a solution as rows of names, None for the empty cells"""
+    names = list(names)
+    return [[names[item] if item != -1 else None for item in row]
+            for row in solution.tolist()]
+
+
+def worker_instance(instance, path, modified):
+    """the data of an instance in a worker process,
+    read from `path` on the first job of the instance
+    """
+    if instance not in _instances:
+        if os.path.getmtime(path) != modified:
+            raise ValueError(f"{path} changed after it was loaded"
+                             f" as instance {instance}, load it again")
+        _instances[instance] = read_data(path)
+    return _instances[instance]
+
+
+def run_job(instance, path, modified, request, events, cancelled):
+    """Runs the streams and abstracts phases of a job in a worker process.
+    A phase is skipped when the request provides its solution,
+    progress is put on `events` every `progress_period` iterations,
+    and the search stops once `cancelled` is set. The sessions are
+    only repacked at the end when the request asks to `polish`
+    """
+    input_data = worker_instance(instance, path, modified)
+    weights = request.get('weights', DEFAULT_WEIGHTS)
+    max_iters = request.get('max_iters', DEFAULT_SERVICE_MAXITERS)
+    period = max(1, request.get('progress_period', max_iters // 100))
+    stream_names = input_data['streams']['Streams']
+    references = input_data['abstracts']['Reference']
+
+    def progress(phase):
+        def callback(iteration, improvement):
+            if iteration % period == 0:
+                events.put({'phase': phase,
+                            'iteration': iteration,
+                            'improvement': float(improvement)})
+            return not cancelled.is_set()
+        return callback
+
+    streams_shape, abstracts_shape = solution_shapes(input_data)
+    streams_solution = abstracts_solution = None
+    if 'streams' in request:
+        streams_solution = solution_ids(pd.DataFrame(request['streams']),
+                                        list(stream_names), streams_shape)
+    if 'abstracts' in request:
+        abstracts_solution = solution_ids(pd.DataFrame(request['abstracts']),
+                                          list(references), abstracts_shape)
+    streams_scheduler, abstracts_scheduler = schedule_conference(
+        input_data, weights,
+        streams_solution=streams_solution,
+        abstracts_solution=abstracts_solution,
+        improve_streams=streams_solution is None,
+        max_iters=max_iters,
+        progress=progress)
+    if request.get('polish', False) and not cancelled.is_set():
+        abstracts_scheduler.polish()
+
+    return {
+        'streams': solution_names(streams_scheduler.solution, stream_names),
+        'abstracts': solution_names(abstracts_scheduler.solution, references),
+        'scores': {'streams': float(streams_scheduler.score),
+                   'abstracts': float(abstracts_scheduler.score)},
+    }
+
+
+@dataclass
+class Job:
+    id: int  # pylint: disable=invalid-name
+    instance: int
+    events: Any
+    cancelled: Any
+    status: str = 'running'
+    progress: List[dict] = field(default_factory=list)
+    result: Any = None
+    error: Any = None
+    future: Any = None
+
+    def summary(self):
+        summary = {'job': self.id,
+                   'instance': self.instance,
+                   'status': self.status,
+                   'progress': self.progress[-1] if self.progress else None}
+        if self.result is not None:
+            summary['result'] = self.result
+        if self.error is not None:
+            summary['error'] = self.error
+        return summary
+
+
+class SchedulingService:
+    """Keeps the loaded instances and the jobs of the service.
+    Only the `max_jobs` most recent finished jobs are kept
+    """
+
+    def __init__(self, processes=None, max_jobs=DEFAULT_SERVICE_MAX_JOBS):
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        self._manager = multiprocessing.Manager()
+        self._instance_ids = itertools.count(1)
+        self._job_ids = itertools.count(1)
+        self._paths = {}
+        self.max_jobs = max_jobs
+        # the (path, modification time) of every instance, the workers
+        # read an instance themselves rather than receive it with a job
+        self.instances = {}
+        self.jobs = {}
+
+    async def load(self, path):
+        """checks and loads an instance once, until the file changes"""
+        try:
+            key = (os.path.abspath(path), os.path.getmtime(path))
+        except OSError:
+            raise ServiceError(404, f"No instance file: {path}")
+        if key not in self._paths:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, read_data, path)
+            except KeyError as error:
+                raise ServiceError(400, f"The instance {path} is missing"
+                                        f" the sheet {error}")
+            instance = next(self._instance_ids)
+            self.instances[instance] = key
+            self._paths[key] = instance
+        return self._paths[key]
+
+    def submit(self, request):
+        instance = request.get('instance')
+        if instance not in self.instances:
+            raise ServiceError(404, f"Unknown instance: {instance}")
+        job = Job(next(self._job_ids), instance,
+                  self._manager.Queue(), self._manager.Event())
+        loop = asyncio.get_running_loop()
+        job.future = loop.run_in_executor(self._executor, run_job,
+                                          instance,
+                                          *self.instances[instance],
+                                          request,
+                                          job.events, job.cancelled)
+        self.jobs[job.id] = job
+        asyncio.ensure_future(self._follow(job))
+        return job
+
+    def cancel(self, job):
+        job.cancelled.set()
+        if job.future.cancel():
+            job.status = 'cancelled'
+
+    async def _follow(self, job):
+        """collects the progress of a job until it finishes"""
+        loop = asyncio.get_running_loop()
+        while not job.future.done():
+            await asyncio.sleep(0.05)
+            job.progress.extend(await loop.run_in_executor(
+                None, _drain, job.events))
+        job.progress.extend(_drain(job.events))
+        if job.future.cancelled():
+            job.status = 'cancelled'
+        elif job.future.exception() is not None:
+            job.status = 'failed'
+            job.error = repr(job.future.exception())
+        else:
+            job.result = job.future.result()
+            job.status = 'cancelled' if job.cancelled.is_set() else 'done'
+        self._evict()
+
+    def _evict(self):
+        """forgets the oldest finished jobs, and their progress,
+        beyond the `max_jobs` most recent ones
+        """
+        finished = [job.id for job in self.jobs.values()
+                    if job.status != 'running']
+        for job_id in finished[:max(0, len(finished) - self.max_jobs)]:
+            del self.jobs[job_id]
+
+    async def handle(self, reader, writer):
+        try:
+            method, path, body = await _read_request(reader)
+            await self._route(writer, method, path, body)
+        except ServiceError as error:
+            _respond(writer, error.status, {'error': str(error)})
+        except Exception as error:  # pylint: disable=broad-except
+            _respond(writer, 500, {'error': repr(error)})
+        finally:
+            await writer.drain()
+            writer.close()
+
+    async def _route(self, writer, method, path, body):
+        parts = [part for part in path.split('/') if part]
+        if parts == ['instances']:
+            if method == 'GET':
+                _respond(writer, 200, {
+                    'instances': [{'instance': instance,
+                                   'path': instance_path}
+                                  for (instance_path, _), instance
+                                  in self._paths.items()]})
+            elif method == 'POST':
+                if 'path' not in body:
+                    raise ServiceError(400, "Missing instance path")
+                _respond(writer, 201, {'instance': await self.load(body['path'])})
+            else:
+                raise ServiceError(405, f"{method} {path}")
+        elif parts == ['jobs'] and method == 'POST':
+            _respond(writer, 202, self.submit(body).summary())
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.jobs.get(int(parts[1]) if parts[1].isdigit() else None)
+            if job is None:
+                raise ServiceError(404, f"Unknown job: {parts[1]}")
+            if len(parts) == 3 and parts[2] == 'progress' and method == 'GET':
+                await self._stream(writer, job)
+            elif len(parts) == 2 and method == 'GET':
+                _respond(writer, 200, job.summary())
+            elif len(parts) == 2 and method == 'DELETE':
+                self.cancel(job)
+                _respond(writer, 200, job.summary())
+            else:
+                raise ServiceError(405, f"{method} {path}")
+        else:
+            raise ServiceError(404, f"{method} {path}")
+
+    async def _stream(self, writer, job):
+        """streams the progress events of a job as chunked JSON lines,
+        followed by its summary once it finishes
+        """
+        writer.write(b'HTTP/1.1 200 OK\r\n'
+                     b'Content-Type: application/x-ndjson\r\n'
+                     b'Transfer-Encoding: chunked\r\n'
+                     b'Connection: close\r\n\r\n')
+        sent = 0
+        while True:
+            finished = job.status != 'running'
+            for event in job.progress[sent:]:
+                _write_chunk(writer, event)
+            sent = len(job.progress)
+            await writer.drain()
+            if finished:
+                break
+            await asyncio.sleep(0.05)
+        _write_chunk(writer, job.summary())
+        writer.write(b'0\r\n\r\n')
+
+    async def serve(self, host=DEFAULT_SERVICE_HOST, port=DEFAULT_SERVICE_PORT,
+                    unix=None):
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        for job in self.jobs.values():
+            job.cancelled.set()
+        self._executor.shutdown(wait=True)
+        self._manager.shutdown()
+
+
+def _drain(events):
+    drained = []
+    while True:
+        try:
+            drained.append(events.get_nowait())
+        except queue.Empty:
+            return drained
+
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise ServiceError(400, "Malformed request line")
+    method, path, _version = request_line
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = {}
+    length = int(headers.get('content-length', 0))
+    if length > 0:
+        try:
+            body = json.loads(await reader.readexactly(length))
+        except ValueError:
+            raise ServiceError(400, "The request body is not valid JSON")
+    return method, path, body
+
+
+def _respond(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(f'HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n'
+                 f'Content-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n'
+                 f'Connection: close\r\n\r\n'.encode() + body)
+
+
+def _write_chunk(writer, payload):
+    line = json.dumps(payload).encode() + b'\n'
+    writer.write(f'{len(line):x}\r\n'.encode() + line + b'\r\n')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule serve',
+        description='Run a local scheduling service.')
+    parser.add_argument('--host', type=str, default=DEFAULT_SERVICE_HOST,
+                        help=f'Default: "{DEFAULT_SERVICE_HOST}"')
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVICE_PORT,
+                        help=f'Default: {DEFAULT_SERVICE_PORT}')
+    parser.add_argument('--unix', type=str,
+                        help='Listen on a Unix socket instead.')
+    parser.add_argument('-p', '--processes', type=int,
+                        help='Number of worker processes. Default: all cores')
+    parser.add_argument('-i', '--instance', type=str, action='append',
+                        default=[],
+                        help='Instances to load on startup.')
+    parser.add_argument('--max-jobs', type=int,
+                        default=DEFAULT_SERVICE_MAX_JOBS,
+                        help='Number of finished jobs kept.'
+                             f' Default: {DEFAULT_SERVICE_MAX_JOBS}')
+    args = parser.parse_args(args)
+
+    async def serve():
+        service = SchedulingService(processes=args.processes,
+                                    max_jobs=args.max_jobs)
+        try:
+            for path in args.instance:
+                print(f"Loaded {path} as instance {await service.load(path)}")
+            await service.serve(args.host, args.port, unix=args.unix)
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
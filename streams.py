@@ -2,8 +2,10 @@ import math
 
 import numpy as np
 from ..utils import unique_scheduled_elements
+from ..profiling import profiled
 
 
+@profiled
 def evaluate_consecutive_sessions(solution, streams, violations=False):
     violations_list = []
     overall_penalty = 0
@@ -31,6 +33,7 @@ def evaluate_consecutive_sessions(solution, streams, violations=False):
     return overall_penalty
 
 
+@profiled
 def partial_consecutive_sessions(solution, new_solution, changed):
     changed_streams = unique_scheduled_elements(changed,
                                                 solution, new_solution)
@@ -38,6 +41,7 @@ def partial_consecutive_sessions(solution, new_solution, changed):
             - evaluate_consecutive_sessions(solution, changed_streams))
 
 
+@profiled
 def evaluate_streams_streams(solution, sessions,
                              streams_streams_penalty,
                              violations=False):
@@ -62,6 +66,7 @@ def evaluate_streams_streams(solution, sessions,
     return penalties_sum
 
 
+@profiled
 def partial_streams_streams(solution, new_solution, changed,
                             streams_streams_penalty):
     changed_sessions = np.unique(changed[0])
@@ -71,6 +76,7 @@ def partial_streams_streams(solution, new_solution, changed,
                                        streams_streams_penalty))
 
 
+@profiled
 def evaluate_parallel_streams(solution, streams, required_sessions,
                               violations=False):
     """computes a penalty that increases exponentially with
@@ -94,6 +100,7 @@ def evaluate_parallel_streams(solution, streams, required_sessions,
     return penalty
 
 
+@profiled
 def partial_parallel_streams(solution, new_solution, changed,
                              required_sessions):
     changed_streams = unique_scheduled_elements(changed,
@@ -119,6 +126,7 @@ def minimum_parallel_sessions(num_sessions, required_sessions):
             + extra_sessions * (duplications + 1) * (duplications)) / 2
 
 
+@profiled
 def evaluate_number_of_rooms_per_stream(solution, streams, required_sessions,
                                         violations=False):
     """Return the total number of rooms more than the minimum taken by each stream
@@ -138,6 +146,7 @@ def evaluate_number_of_rooms_per_stream(solution, streams, required_sessions,
     return penalty
 
 
+@profiled
 def partial_number_of_rooms_per_stream(solution, new_solution, changed,
                                        required_sessions):
     changed_streams = unique_scheduled_elements(changed,
@@ -148,6 +157,7 @@ def partial_number_of_rooms_per_stream(solution, new_solution, changed,
                                                   required_sessions))
 
 
+@profiled
 def evaluate_streams_scheduled(solution, streams, violations=False):
     solution_streams = solution.ravel()
     num_slots = len(solution_streams)
@@ -163,6 +173,7 @@ def evaluate_streams_scheduled(solution, streams, violations=False):
     return len(unscheduled)
 
 
+@profiled
 def partial_streams_scheduled(solution, new_solution, changed):
     changed_streams = unique_scheduled_elements(changed,
                                                 solution, new_solution)
@@ -170,6 +181,7 @@ def partial_streams_scheduled(solution, new_solution, changed):
             - evaluate_streams_scheduled(solution, changed_streams))
 
 
+@profiled
 def evaluate_penalties(solution,
                        streams_sessions, streams_rooms, sessions_rooms,
                        violations=False):
@@ -212,6 +224,7 @@ def evaluate_penalties(solution,
     return tuple(penalties)
 
 
+@profiled
 def partial_penalties(solution, new_solution, changed,
                       sessions_rooms, streams_rooms, streams_sessions):
     deltas = [0, 0, 0]
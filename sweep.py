@@ -0,0 +1,179 @@
+"""
+Parameter sweeps: every combination of instance, weights and
+heuristic parameters is scheduled in a pool of worker processes,
+and the component scores of the runs are written to a single table
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .scheduler.pipeline import schedule_conference
+from .readers import read_data
+from .config import DEFAULT_MAXITERS, DEFAULT_WEIGHTS
+
+DEFAULT_SWEEP_OUTPUT_FILE = 'sweep.csv'
+
+# the parameters of a run, and their defaults
+DEFAULT_PARAMS = {
+    'max_iters': DEFAULT_MAXITERS,
+    'population_size': 40,
+    'explore_size': 150,
+    'items_length': 250,
+    'pos_length': 100,
+    'idle_threshold': 0.1,
+    'polish': False,
+}
+
+# the instances of a worker process, loaded once by `_load_instances`
+_instances = {}
+
+
+def weight_vectors(spec):
+    """The weight vectors of a sweep specification: either a list of
+    vectors, or a grid mapping penalty numbers (1 to 12, as in the
+    --weights help) to lists of values, crossed over the default weights
+    """
+    if isinstance(spec, list):
+        return [list(weights) for weights in spec]
+    positions = [int(position) - 1 for position in spec]
+    vectors = []
+    for values in itertools.product(*spec.values()):
+        weights = list(DEFAULT_WEIGHTS)
+        for position, value in zip(positions, values):
+            weights[position] = value
+        vectors.append(weights)
+    return vectors
+
+
+def param_sets(spec):
+    """every combination of a grid of heuristic parameters,
+    a single value standing for a list of one
+    """
+    unknown = set(spec) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    names = list(spec)
+    values = [value if isinstance(value, list) else [value]
+              for value in spec.values()]
+    return [dict(DEFAULT_PARAMS, **dict(zip(names, combination)))
+            for combination in itertools.product(*values)]
+
+
+def sweep_runs(spec):
+    """the (instance, weights, params, repeat) of every run of a sweep"""
+    return list(itertools.product(spec['instances'],
+                                  weight_vectors(spec.get('weights',
+                                                          [DEFAULT_WEIGHTS])),
+                                  param_sets(spec.get('params', {})),
+                                  range(spec.get('repeats', 1))))
+
+
+def _load_instances(instances):
+    _instances.update(instances)
+
+
+def run(instance, weights, params, seed):
+    """Schedules an instance from scratch like the default pipeline
+    with `seed`, returns the scores, wall time and iterations of the run
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    input_data = _instances[instance]
+    iterations = {'streams': 0, 'abstracts': 0}
+
+    def counter(phase):
+        def callback(iteration, _improvement):
+            iterations[phase] = iteration
+            return True
+        return callback
+
+    times = {}
+
+    def finish(phase, _scheduler):
+        times[phase] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streams_scheduler, abstracts_scheduler = schedule_conference(
+        input_data, weights,
+        max_iters=params['max_iters'],
+        population_size=params['population_size'],
+        explore_size=params['explore_size'],
+        items_length=params['items_length'],
+        pos_length=params['pos_length'],
+        idle_threshold=params['idle_threshold'],
+        polish=params['polish'],
+        progress=counter,
+        finish=finish)
+    wall_time = time.perf_counter() - start
+
+    record = {'streams_score': streams_scheduler.score,
+              'abstracts_score': abstracts_scheduler.score,
+              'wall_time': wall_time,
+              'streams_time': times['streams'],
+              'streams_iterations': iterations['streams'],
+              'abstracts_iterations': iterations['abstracts']}
+    for phase, scheduler in (('streams', streams_scheduler),
+                             ('abstracts', abstracts_scheduler)):
+        for component, penalty in scheduler.detailed_score._asdict().items():
+            record[f'{phase}_{component}'] = penalty
+    return record
+
+
+def sweep(spec, processes=None):
+    """Runs every combination of a sweep specification,
+    returns a table with a row per run. The repeats of every
+    combination are seeded from the `seed` of the specification on,
+    0 by default, so that combinations are compared on the same seeds
+    """
+    runs = sweep_runs(spec)
+    first_seed = spec.get('seed', 0)
+    instances = {path: read_data(path) for path in spec['instances']}
+    with ProcessPoolExecutor(max_workers=processes,
+                             initializer=_load_instances,
+                             initargs=(instances,)) as executor:
+        futures = [executor.submit(run, instance, weights, params,
+                                   first_seed + repeat)
+                   for instance, weights, params, repeat in runs]
+        records = []
+        for (instance, weights, params, repeat), future in zip(runs, futures):
+            record = {'instance': os.path.basename(instance),
+                      'repeat': repeat,
+                      'seed': first_seed + repeat,
+                      'weights': ' '.join(str(weight) for weight in weights)}
+            record.update(params)
+            record.update(future.result())
+            records.append(record)
+            print(f"{len(records)}/{len(runs)} {record['instance']}:"
+                  f" {record['streams_score']}, {record['abstracts_score']}"
+                  f" in {record['wall_time']:.1f}s")
+    return pd.DataFrame(records)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='schedule sweep',
+        description='Schedule every combination of instances,'
+                    ' weights and heuristic parameters.',
+        epilog='The specification is a JSON object, for example:'
+               ' {"instances": ["Instance.xlsx"],'
+               ' "weights": {"8": [10000, 1000], "10": [10, 100]},'
+               ' "params": {"max_iters": [1000, 5000]},'
+               ' "repeats": 3, "seed": 0}')
+    parser.add_argument('spec', type=str,
+                        help='The JSON sweep specification.')
+    parser.add_argument('-o', '--output', type=str,
+                        default=DEFAULT_SWEEP_OUTPUT_FILE,
+                        help=(f'The summary table.'
+                              f' Default: "{DEFAULT_SWEEP_OUTPUT_FILE}"'))
+    parser.add_argument('-p', '--processes', type=int,
+                        help='Number of worker processes. Default: all cores')
+    args = parser.parse_args(args)
+
+    with open(args.spec) as spec_file:
+        spec = json.load(spec_file)
+    sweep(spec, processes=args.processes).to_csv(args.output, index=False)
@@ -37,6 +37,8 @@ def slot_tabu_search(solution, evalute, partial_evaluate,
                      pos_length=20,
                      explore_size=20,
                      report_period=None,
+                     lower_bound=None,
+                     callback=None,
                      idle_threshold=None,
                      min_iters=500,
                      max_iters=1000):
@@ -50,6 +52,8 @@ def slot_tabu_search(solution, evalute, partial_evaluate,
         neighbourhood,
         condition,
         report_period=report_period,
+        lower_bound=lower_bound,
+        callback=callback,
         idle_threshold=idle_threshold,
         explore_size=explore_size,
         min_iters=min_iters,
@@ -80,6 +84,8 @@ def full_tabu_search(solution, evalute, partial_evaluate,
                      length=100,
                      explore_size=20,
                      report_period=None,
+                     lower_bound=None,
+                     callback=None,
                      idle_threshold=None,
                      min_iters=500,
                      max_iters=1000):
@@ -92,6 +98,8 @@ def full_tabu_search(solution, evalute, partial_evaluate,
         neighbourhood,
         condition,
         report_period=report_period,
+        lower_bound=lower_bound,
+        callback=callback,
         idle_threshold=idle_threshold,
         explore_size=explore_size,
         min_iters=min_iters,
@@ -0,0 +1,108 @@
+"""
+Per-iteration telemetry of the searches: every iteration of the
+outermost local search or genetic algorithm is recorded into a
+preallocated structured array, written to disk whenever it fills up
+and at the end of every search
+"""
+import time
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+TRACE_DTYPE = np.dtype([
+    ('search', np.int32),
+    ('iteration', np.int64),
+    ('delta', np.float64),
+    ('current', np.float64),
+    ('best', np.float64),
+    ('accepted', np.bool_),
+    ('explored', np.int32),
+    ('elapsed', np.float64),
+])
+
+# the trace recording the searches, None when tracing is off
+_active = None
+
+
+class Trace:
+    """Records the iterations of the searches to `path`, in
+    `capacity` records at a time. A search started inside another
+    one, such as the local search of a genetic algorithm child,
+    is not recorded
+    """
+
+    def __init__(self, path, capacity=4096):
+        self.path = path
+        self.explored = 0
+        self._buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self._size = 0
+        self._searches = 0
+        self._depth = 0
+        self._start = None
+        self._file = open(path, 'wb')
+
+    def begin(self):
+        """starts a search, returns whether its iterations are recorded"""
+        self._depth += 1
+        if self._depth > 1:
+            return False
+        self._searches += 1
+        self.explored = 0
+        self._start = time.perf_counter()
+        return True
+
+    def end(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self.flush()
+
+    def counting(self, partial_evaluate):
+        """the partial evaluation, counting the candidates explored"""
+        def counted(solution, changes):
+            self.explored += 1
+            return partial_evaluate(solution, changes)
+        return counted
+
+    def record(self, iteration, delta, current, best, accepted):
+        self._buffer[self._size] = (self._searches - 1, iteration,
+                                    delta, current, best, accepted,
+                                    self.explored,
+                                    time.perf_counter() - self._start)
+        self.explored = 0
+        self._size += 1
+        if self._size == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer[:self._size].tobytes())
+        self._file.flush()
+        self._size = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+@contextmanager
+def tracing(trace):
+    """records the searches into `trace` while inside the block,
+    tracing carries on into the current trace when `trace` is None
+    """
+    global _active  # pylint: disable=global-statement
+    if trace is None:
+        yield _active
+        return
+    previous, _active = _active, trace
+    try:
+        yield trace
+    finally:
+        _active = previous
+
+
+def active_trace():
+    return _active
+
+
+def read_trace(path):
+    """the records of a trace as a DataFrame"""
+    return pd.DataFrame(np.fromfile(path, dtype=TRACE_DTYPE))
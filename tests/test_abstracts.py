@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from conference_scheduling.differential import Case
+from conference_scheduling.operators.buckets import abstracts_positions
+from conference_scheduling.scheduler.abstracts import best_fit_solution
+
+
+class BestFitSolutionTest(unittest.TestCase):
+    def build(self, case, abstracts=None):
+        if abstracts is None:
+            abstracts = case.abstracts
+        return best_fit_solution(case.streams_solution,
+                                 abstracts,
+                                 case.data['streams'],
+                                 case.sessions)
+
+    def test_feasible(self):
+        """every placed abstract fills its required timeslots in one
+        session of its own stream, and no timeslot holds two abstracts
+        """
+        for seed in range(10):
+            case = Case(seed)
+            solution = self.build(case)
+            stream_ids = dict(zip(case.data['streams']['Streams'],
+                                  case.data['streams'].index))
+            lengths = case.abstracts['Required Timeslots'].astype(int)
+            for abstract, (start, room, count) in abstracts_positions(
+                    solution).items():
+                with self.subTest(seed=seed, abstract=abstract):
+                    self.assertEqual(count, lengths[abstract])
+                    self.assertTrue(np.all(
+                        solution[start:start + count, room] == abstract))
+                    sessions = {case.timeslot_to_session[timeslot]
+                                for timeslot in range(start, start + count)}
+                    self.assertEqual(len(sessions), 1)
+                    stream = stream_ids[case.abstracts.at[abstract, 'Stream']]
+                    self.assertEqual(
+                        case.streams_solution[sessions.pop(), room], stream)
+
+    def test_ordered_abstracts_in_order(self):
+        """the ordered abstracts of a fully placed stream
+        start in order on the generated cases
+        """
+        for seed in range(10):
+            case = Case(seed)
+            solution = self.build(case)
+            positions = abstracts_positions(solution)
+            ordered = case.abstracts[case.abstracts['Order'] != 0]
+            for stream, group in ordered.groupby('Stream'):
+                starts = [positions[abstract][0]
+                          for abstract in group.sort_values('Order').index
+                          if abstract in positions]
+                if len(starts) == len(group.index):
+                    with self.subTest(seed=seed, stream=stream):
+                        self.assertEqual(starts, sorted(starts))
+
+    def test_unknown_stream(self):
+        case = Case(0)
+        abstracts = case.abstracts.copy()
+        abstracts.loc[0, 'Stream'] = 'Unknown stream'
+        solution = self.build(case, abstracts)
+        self.assertNotIn(0, solution)
+        self.assertEqual(solution.shape, case.abstracts_solution.shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
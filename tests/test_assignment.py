@@ -0,0 +1,47 @@
+import itertools
+import unittest
+import numpy as np
+from conference_scheduling.scheduler.assignment import linear_sum_assignment
+
+
+def brute_force_cost(costs):
+    """the cheapest assignment of every row or every column,
+    whichever are fewer, over all the permutations
+    """
+    if costs.shape[0] > costs.shape[1]:
+        costs = costs.T
+    num_rows, num_columns = costs.shape
+    return min(costs[np.arange(num_rows), list(columns)].sum()
+               for columns in itertools.permutations(range(num_columns),
+                                                     num_rows))
+
+
+class LinearSumAssignmentTest(unittest.TestCase):
+    def check(self, costs):
+        rows, columns = linear_sum_assignment(costs)
+        self.assertEqual(len(rows), min(costs.shape))
+        self.assertEqual(len(set(rows)), len(rows))
+        self.assertEqual(len(set(columns)), len(columns))
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        self.assertAlmostEqual(costs[rows, columns].sum(),
+                               brute_force_cost(costs))
+
+    def test_square(self):
+        rng = np.random.RandomState(0)
+        for size in range(1, 7):
+            for _ in range(20):
+                self.check(rng.randint(0, 20, (size, size)).astype(float))
+
+    def test_rectangular(self):
+        rng = np.random.RandomState(1)
+        for shape in [(1, 4), (2, 5), (3, 6), (4, 2), (6, 3), (5, 1)]:
+            for _ in range(20):
+                self.check(rng.uniform(-10, 10, shape))
+
+    def test_ties(self):
+        self.check(np.zeros((4, 4)))
+        self.check(np.ones((3, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import itertools
+import unittest
+import numpy as np
+from conference_scheduling.config import DEFAULT_WEIGHTS
+from conference_scheduling.differential import Case
+from conference_scheduling.penalties.bounds import (
+    abstracts_lower_bound,
+    minimum_unscheduled_abstracts,
+)
+
+
+def brute_force_unscheduled(lengths, capacity):
+    """the fewest abstracts left out over all the subsets that fit"""
+    return min(len(lengths) - len(kept)
+               for size in range(len(lengths) + 1)
+               for kept in itertools.combinations(lengths, size)
+               if sum(kept) <= capacity)
+
+
+class MinimumUnscheduledAbstractsTest(unittest.TestCase):
+    def test_brute_force(self):
+        rng = np.random.RandomState(0)
+        for _ in range(200):
+            lengths = list(rng.randint(1, 5, rng.randint(0, 9)))
+            capacity = rng.randint(0, 25)
+            self.assertEqual(minimum_unscheduled_abstracts(lengths, capacity),
+                             brute_force_unscheduled(lengths, capacity))
+
+    def test_fits(self):
+        self.assertEqual(minimum_unscheduled_abstracts([], 0), 0)
+        self.assertEqual(minimum_unscheduled_abstracts([1, 2, 3], 6), 0)
+
+    def test_longest_first(self):
+        self.assertEqual(minimum_unscheduled_abstracts([1, 1, 4], 2), 1)
+        self.assertEqual(minimum_unscheduled_abstracts([3, 3, 3], 0), 3)
+
+
+class AbstractsLowerBoundTest(unittest.TestCase):
+    def test_without_sessions(self):
+        input_data = dict(Case(3).data)
+        input_data['sessions'] = input_data['sessions'].iloc[:0]
+        self.assertEqual(abstracts_lower_bound(input_data, DEFAULT_WEIGHTS),
+                         DEFAULT_WEIGHTS[7] * len(input_data['abstracts']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+import numpy as np
+from conference_scheduling.differential import Case
+from conference_scheduling.operators import apply_changes
+from conference_scheduling.scheduler.abstracts import best_fit_solution
+from conference_scheduling.operators.buckets import (
+    AbstractsBuckets,
+    abstracts_positions,
+    free_gaps,
+)
+
+
+class AbstractsBucketsTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.case = Case(3)
+        self.buckets = AbstractsBuckets(self.case.streams_solution,
+                                        self.case.data['streams'],
+                                        self.case.abstracts,
+                                        self.case.sessions)
+        self.solution = best_fit_solution(self.case.streams_solution,
+                                          self.case.abstracts,
+                                          self.case.data['streams'],
+                                          self.case.sessions)
+
+    def assert_feasible(self, solution):
+        """every scheduled abstract fills exactly its required timeslots
+        of a single session owned by its stream
+        """
+        streams_solution = self.case.streams_solution
+        for abstract, (start, room, count) in abstracts_positions(
+                solution).items():
+            length = self.buckets.lengths[abstract]
+            self.assertEqual(count, length)
+            self.assertTrue(np.all(solution[start:start + length, room]
+                                   == abstract))
+            sessions = {self.case.timeslot_to_session[timeslot]
+                        for timeslot in range(start, start + length)}
+            self.assertEqual(len(sessions), 1)
+            self.assertEqual(streams_solution[sessions.pop(), room],
+                             self.buckets.streams[abstract])
+
+    def test_moves_stay_feasible(self):
+        solution = np.copy(self.solution)
+        self.assert_feasible(solution)
+        neighbourhood = self.buckets.neighbourhood(solution)
+        for _ in range(200):
+            changes = next(neighbourhood, None)
+            if changes is None:
+                break
+            solution = apply_changes(solution, changes, inplace=False)
+            self.assert_feasible(solution)
+            neighbourhood = self.buckets.neighbourhood(solution)
+
+    def test_move_clears_a_split_abstract(self):
+        moved = 0
+        for abstract, (start, room, count) in abstracts_positions(
+                self.solution).items():
+            if count < 2:
+                continue
+            # split the abstract by freeing its first timeslot
+            solution = np.copy(self.solution)
+            solution[start, room] = -1
+            stream = self.buckets.streams[abstract]
+            gaps = free_gaps(solution, self.buckets.sessions[stream])
+            changes = self.buckets.move(solution, abstract,
+                                        abstracts_positions(solution), gaps)
+            if changes is None:
+                continue
+            moved += 1
+            solution = apply_changes(solution, changes, inplace=False)
+            self.assert_feasible(solution)
+            _, _, count = abstracts_positions(solution)[abstract]
+            self.assertEqual(count, self.buckets.lengths[abstract])
+        self.assertGreater(moved, 0)
+
+    def test_stops_when_nothing_can_move(self):
+        streams_solution = np.full_like(self.case.streams_solution, -1)
+        buckets = AbstractsBuckets(streams_solution,
+                                   self.case.data['streams'],
+                                   self.case.abstracts,
+                                   self.case.sessions)
+        solution = np.full_like(self.solution, -1)
+        self.assertIsNone(next(buckets.neighbourhood(solution), None))
+
+
+if __name__ == '__main__':
+    unittest.main()
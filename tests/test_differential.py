@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+from conference_scheduling.differential import Case, check_case, components
+from conference_scheduling.exceptions import EvaluationMismatchError
+from conference_scheduling.penalties import abstracts
+
+
+class DifferentialTest(unittest.TestCase):
+    def test_evaluators_agree_with_reference(self):
+        for seed in range(8):
+            with self.subTest(seed=seed):
+                self.assertEqual(check_case(seed, num_moves=30),
+                                 len(components(Case(seed))))
+
+    def test_named_components(self):
+        self.assertEqual(check_case(0, num_moves=5,
+                                    names=['abstracts_order', 'scheduled']),
+                         2)
+
+    def test_detects_mismatch(self):
+        partial = abstracts.partial_abstracts_order
+
+        def off_by_one(*args, **kwargs):
+            return partial(*args, **kwargs) + 1
+
+        with mock.patch.object(abstracts, 'partial_abstracts_order',
+                               off_by_one):
+            with self.assertRaises(EvaluationMismatchError) as raised:
+                check_case(0, num_moves=5, names=['abstracts_order'])
+        self.assertEqual(raised.exception.component, 'abstracts_order')
+        self.assertEqual(raised.exception.kind, 'delta')
+
+
+if __name__ == '__main__':
+    unittest.main()
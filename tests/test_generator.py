@@ -0,0 +1,38 @@
+import unittest
+from conference_scheduling.generator import generate_instance
+
+
+class GenerateInstanceTest(unittest.TestCase):
+    def test_instance_matches_the_sheets(self):
+        instance, data = generate_instance(seed=0,
+                                           num_days=2,
+                                           timeblocks_per_day=2,
+                                           num_rooms=3,
+                                           num_streams=5,
+                                           num_abstracts=30,
+                                           clash_density=0.5)
+        sessions = data['sessions']
+        abstracts = data['abstracts']
+        self.assertEqual(len(instance.streams), len(data['streams'].index))
+        self.assertEqual(len(instance.rooms), len(data['rooms'].index))
+        self.assertEqual(instance.num_timeslots,
+                         sessions['Max number of talks'].sum())
+        self.assertEqual([timeblock.day for timeblock in instance.timeblocks],
+                         list(sessions['Day']))
+
+        references = list(abstracts['Reference'])
+        for abstract, record in abstracts.iterrows():
+            item = instance.abstract(abstract)
+            self.assertEqual(item.reference, record['Reference'])
+            self.assertEqual(instance.stream(item.stream).name,
+                             record['Stream'])
+            clash = record['Clash']
+            if clash == 0:
+                self.assertIsNone(item.clash)
+            else:
+                self.assertEqual(item.clash, references.index(clash))
+            self.assertIsNone(item.speaker_clash)
+
+
+if __name__ == '__main__':
+    unittest.main()
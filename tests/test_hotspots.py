@@ -0,0 +1,68 @@
+import random
+import unittest
+import numpy as np
+from conference_scheduling.config import DEFAULT_WEIGHTS
+from conference_scheduling.differential import Case
+from conference_scheduling.operators import apply_changes
+from conference_scheduling.scheduler.hotspots import (
+    AbstractsHotspots,
+    StreamsHotspots,
+)
+
+
+class HotspotsTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.case = Case(5)
+
+    def check_incremental(self, build, solution, move):
+        """the contributions refreshed move by move
+        match those rebuilt from scratch
+        """
+        hotspots = build()
+        hotspots.refresh(solution)
+        for _ in range(30):
+            solution = apply_changes(solution, move(solution), inplace=False)
+            hotspots.refresh(solution)
+            rebuilt = build()
+            rebuilt.refresh(solution)
+            np.testing.assert_allclose(hotspots.contributions,
+                                       rebuilt.contributions)
+
+    def test_streams(self):
+        self.check_incremental(
+            lambda: StreamsHotspots(self.case.data, DEFAULT_WEIGHTS),
+            self.case.streams_solution,
+            self.case.streams_move)
+
+    def test_abstracts(self):
+        data = self.case.data
+        self.check_incremental(
+            lambda: AbstractsHotspots(self.case.streams_solution,
+                                      DEFAULT_WEIGHTS,
+                                      data['streams'],
+                                      data['abstracts'],
+                                      data['sessions']),
+            self.case.abstracts_solution,
+            self.case.abstracts_move)
+
+    def test_streams_neighbourhood(self):
+        hotspots = StreamsHotspots(self.case.data, DEFAULT_WEIGHTS)
+        neighbourhood = hotspots.neighbourhood(self.case.streams_solution)
+        for _ in range(20):
+            items, sessions, rooms = next(neighbourhood)
+            self.assertEqual(len(items), len(sessions))
+            self.assertEqual(len(items), len(rooms))
+        self.assertGreater(hotspots.contributions.sum(), 0)
+
+    def test_exploration_only(self):
+        hotspots = StreamsHotspots(self.case.data, DEFAULT_WEIGHTS,
+                                   exploration=1)
+        hotspots.refresh(self.case.streams_solution)
+        num_streams = len(self.case.data['streams'].index)
+        self.assertTrue(all(0 <= hotspots.sample() < num_streams
+                            for _ in range(50)))
+
+
+if __name__ == '__main__':
+    unittest.main()
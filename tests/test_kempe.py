@@ -0,0 +1,105 @@
+import random
+import unittest
+import numpy as np
+from conference_scheduling.differential import Case
+from conference_scheduling.operators import apply_changes
+from conference_scheduling.scheduler.abstracts import best_fit_solution
+from conference_scheduling.operators.buckets import abstracts_positions
+from conference_scheduling.operators.kempe import KempeChains
+
+
+class KempeChainsTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+
+    def kempe(self, case, streams_solution=None):
+        if streams_solution is None:
+            streams_solution = case.streams_solution
+        return KempeChains(streams_solution, case.data['streams'],
+                           case.abstracts, case.sessions)
+
+    def timeblocks(self, case, solution):
+        return {abstract: case.timeslot_to_session[timeslot]
+                for abstract, (timeslot, _room, _length)
+                in abstracts_positions(solution).items()}
+
+    def test_chains_are_closed(self):
+        """every clash of a member waiting in the timeblock
+        the member moves to is a member too
+        """
+        checked = 0
+        for seed in range(10):
+            case = Case(seed)
+            kempe = self.kempe(case)
+            solution = best_fit_solution(case.streams_solution, case.abstracts,
+                                         case.data['streams'], case.sessions)
+            timeblocks = self.timeblocks(case, solution)
+            pairs = sorted(set(timeblocks.values()))
+            for abstract in timeblocks:
+                for other_timeblock in pairs:
+                    if other_timeblock == timeblocks[abstract]:
+                        continue
+                    pair = (timeblocks[abstract], other_timeblock)
+                    members = kempe.chain(timeblocks, abstract,
+                                          other_timeblock)
+                    self.assertIn(abstract, members)
+                    for member in members:
+                        self.assertIn(timeblocks[member], pair)
+                        target = (pair[1] if timeblocks[member] == pair[0]
+                                  else pair[0])
+                        for clash in kempe._clashes[member]:
+                            if timeblocks.get(clash) == target:
+                                self.assertIn(clash, members)
+                    checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_swaps_exchange_timeblocks(self):
+        """a swap moves every member, and only the members, into the
+        other timeblock of the pair, in a session of its own stream
+        """
+        swapped = 0
+        for seed in range(10):
+            case = Case(seed)
+            kempe = self.kempe(case)
+            solution = best_fit_solution(case.streams_solution, case.abstracts,
+                                         case.data['streams'], case.sessions)
+            neighbourhood = kempe.neighbourhood(solution)
+            for _ in range(20):
+                changes = next(neighbourhood, None)
+                if changes is None:
+                    break
+                before = self.timeblocks(case, solution)
+                new_solution = apply_changes(solution, changes, inplace=False)
+                after = self.timeblocks(case, new_solution)
+                self.assertEqual(set(before), set(after))
+                moved = {abstract for abstract in before
+                         if before[abstract] != after[abstract]}
+                self.assertGreater(len(moved), 0)
+                self.assertEqual(len({frozenset((before[abstract],
+                                                 after[abstract]))
+                                      for abstract in moved}), 1)
+                for abstract, (start, room, count) in abstracts_positions(
+                        new_solution).items():
+                    if abstract not in moved:
+                        continue
+                    self.assertEqual(count, kempe._buckets.lengths[abstract])
+                    self.assertEqual(case.streams_solution[after[abstract],
+                                                           room],
+                                     kempe._buckets.streams[abstract])
+                swapped += 1
+        self.assertGreater(swapped, 0)
+
+    def test_stops_without_clashes(self):
+        case = Case(3)
+        abstracts = case.abstracts.copy()
+        clashes_start = abstracts.columns.get_loc('Clash')
+        abstracts.iloc[:, clashes_start:] = 0
+        kempe = KempeChains(case.streams_solution, case.data['streams'],
+                            abstracts, case.sessions)
+        solution = best_fit_solution(case.streams_solution, abstracts,
+                                     case.data['streams'], case.sessions)
+        self.assertIsNone(next(kempe.neighbourhood(solution), None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from conference_scheduling.scheduler.placement import AbstractsPlacement
+
+
+class AbstractsPlacementTest(unittest.TestCase):
+    def setUp(self):
+        self.lengths = [2, 1, 3, 2]
+        # abstract 3 is split over two rooms, abstract 1 is unscheduled
+        self.grid = np.array([[0, 3],
+                              [0, -1],
+                              [2, -1],
+                              [2, 3],
+                              [2, -1]])
+
+    def test_round_trip(self):
+        placement = AbstractsPlacement.from_grid(self.grid, self.lengths)
+        np.testing.assert_array_equal(placement.grid, self.grid)
+        self.assertEqual(list(placement.starts), [0, -1, 2, 0])
+        self.assertEqual(list(placement.rooms), [0, -1, 0, 1])
+        self.assertEqual(set(placement.split), {3})
+
+    def test_keeps_required_lengths(self):
+        grid = np.array([[0, -1], [-1, -1], [0, -1]])
+        placement = AbstractsPlacement.from_grid(grid, [2])
+        self.assertTrue(placement.is_split(0))
+        self.assertEqual(placement.lengths[0], 2)
+        np.testing.assert_array_equal(placement.grid, grid)
+
+        placement.schedule(0, 1, 1)
+        self.assertFalse(placement.is_split(0))
+        np.testing.assert_array_equal(placement.grid,
+                                      [[-1, -1], [-1, 0], [-1, 0]])
+
+    def test_moves(self):
+        placement = AbstractsPlacement.from_grid(self.grid, self.lengths)
+        placement.swap(0, 3)
+        placement.unschedule(2)
+        placement.schedule(1, 4, 1)
+        self.assertFalse(placement.is_scheduled(2))
+        self.assertFalse(placement.split)
+        np.testing.assert_array_equal(placement.grid,
+                                      [[3, 0],
+                                       [3, 0],
+                                       [-1, -1],
+                                       [-1, -1],
+                                       [-1, 1]])
+
+    def test_grid_is_read_only(self):
+        placement = AbstractsPlacement.from_grid(self.grid, self.lengths)
+        with self.assertRaises(ValueError):
+            placement.grid[0, 0] = 1
+
+    def test_empty(self):
+        placement = AbstractsPlacement.from_grid(np.full((3, 2), -1),
+                                                 self.lengths)
+        self.assertFalse(any(placement.is_scheduled(abstract)
+                             for abstract in range(len(self.lengths))))
+        np.testing.assert_array_equal(placement.grid, np.full((3, 2), -1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,290 @@
+import importlib.util
+import os
+import random
+import tempfile
+import unittest
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from conference_scheduling.generator import generate_data, write_data
+from conference_scheduling.heuristics import streams_population
+from conference_scheduling.scheduler.abstracts import initial_solution
+from conference_scheduling.readers import read_data, read_sheets
+from conference_scheduling.writers import (
+    format_abstracts_violations,
+    format_streams_violations,
+    schedule_frames,
+    write_tables,
+)
+
+HAS_PARQUET = any(importlib.util.find_spec(engine) is not None
+                  for engine in ('pyarrow', 'fastparquet'))
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.data = generate_data(num_days=2,
+                                  timeblocks_per_day=2,
+                                  num_rooms=3,
+                                  num_streams=5,
+                                  num_abstracts=30,
+                                  seed=0)
+        np.random.seed(0)
+        streams_solution = streams_population(self.data, 1)[0]
+        abstracts_solution = initial_solution(streams_solution,
+                                              self.data['abstracts'],
+                                              self.data['streams'],
+                                              self.data['sessions'])
+        self.schedules = schedule_frames(streams_solution,
+                                         abstracts_solution,
+                                         self.data['abstracts'],
+                                         self.data['streams'],
+                                         self.data['sessions'],
+                                         self.data['rooms'])
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_schedules(self, name):
+        path = os.path.join(self.directory.name, name)
+        write_tables(path, self.schedules)
+        tables = read_sheets(path, list(self.schedules), index_col=0)
+        for sheet, schedule in self.schedules.items():
+            pd.testing.assert_frame_equal(tables[sheet], schedule,
+                                          check_dtype=False,
+                                          check_names=False)
+
+    def test_excel(self):
+        self.check_schedules('schedule.xlsx')
+
+    def test_json(self):
+        self.check_schedules('schedule.json')
+
+    def test_csv(self):
+        self.check_schedules('schedule')
+
+    @unittest.skipUnless(HAS_PARQUET, 'needs pyarrow or fastparquet')
+    def test_parquet(self):
+        self.check_schedules('schedule.parquet')
+
+    def test_missing_sheet(self):
+        path = os.path.join(self.directory.name, 'schedule.json')
+        write_tables(path, self.schedules)
+        with self.assertRaises(KeyError):
+            read_sheets(path, ['missing'])
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            write_tables(os.path.join(self.directory.name, 'schedule.txt'),
+                         self.schedules)
+        with self.assertRaises(ValueError):
+            read_sheets(os.path.join(self.directory.name, 'schedule.txt'))
+
+    def test_instance(self):
+        path = os.path.join(self.directory.name, 'instance.xlsx')
+        write_data(path, self.data)
+        data = read_data(path)
+        for sheet, table in self.data.items():
+            pd.testing.assert_frame_equal(data[sheet], table,
+                                          check_dtype=False)
+
+
+StreamsViolations = namedtuple(
+    'StreamsViolations', ['parallel', 'number_of_rooms', 'streams_sessions',
+                          'streams_rooms', 'sessions_rooms', 'streams_streams',
+                          'consecutive', 'scheduled'])
+AbstractsViolations = namedtuple(
+    'AbstractsViolations', ['scheduled', 'order', 'sessions', 'conflicts'])
+
+
+def reference_streams_violations(penalties, streams, sessions, rooms):
+    """the f-string formatting of the streams violations, as it was
+    before the vectorized writers, with `pd.concat` in place of the
+    removed `DataFrame.append`
+    """
+    violations = pd.concat((
+        pd.Series(name='Stream VS Session', dtype=object, data=[
+            f'"{streams.at[stream]}" VS "{sessions.at[session]}" ({penalty})'
+            for stream, session, penalty in penalties.streams_sessions
+        ]),
+        pd.Series(name='Stream VS Room', dtype=object, data=[
+            f'"{streams.at[stream]}" VS "{rooms.at[room]}" ({penalty})'
+            for stream, room, penalty in penalties.streams_rooms
+        ]),
+        pd.Series(name='Session VS Room', dtype=object, data=[
+            f'"{sessions.at[session]}" VS "{rooms.at[room]}" ({penalty})'
+            for session, room, penalty in penalties.sessions_rooms
+        ]),
+        pd.Series(name='Stream VS Stream', dtype=object, data=[
+            f'"{streams.at[stream]}" VS "{streams.at[other]}"'
+            f' in "{sessions.at[session]}" ({penalty})'
+            for stream, other, session, penalty in penalties.streams_streams
+        ]),
+        pd.Series(name='Parallel', dtype=object, data=[
+            f'{streams.at[stream]} ({penalty})'
+            for stream, penalty in penalties.parallel
+        ]),
+        pd.Series(name='Unscheduled', dtype=object, data=[
+            f'{streams.at[stream]}'
+            for stream in penalties.scheduled
+        ]),
+        pd.Series(name='Number of Rooms', dtype=object, data=[
+            f'{streams.at[stream]} ({penalty})'
+            for stream, penalty in penalties.number_of_rooms
+        ]),
+        pd.Series(name='Non-Consecutive Sessions', dtype=object, data=[
+            f'"{streams.at[stream]}" in "{rooms.at[room]}" ({penalty})'
+            for stream, room, penalty in penalties.consecutive
+        ]),
+    ), axis=1)
+
+    counts = (
+        map(lambda p: p[2], penalties.streams_sessions),
+        map(lambda p: p[2], penalties.streams_rooms),
+        map(lambda p: p[2], penalties.sessions_rooms),
+        map(lambda p: p[3], penalties.streams_streams),
+        map(lambda p: p[1], penalties.parallel),
+        map(lambda _: 1, penalties.scheduled),
+        map(lambda p: p[1], penalties.number_of_rooms),
+        map(lambda p: p[2], penalties.consecutive),
+    )
+
+    totals = pd.Series([f'Total = {sum(c)}' for c in counts],
+                       index=violations.columns)
+
+    return pd.concat((violations, totals.to_frame().T), ignore_index=True)
+
+
+def reference_abstracts_violations(penalties, abstracts, sessions):
+    """the f-string formatting of the abstracts violations, as it was
+    before the vectorized writers
+    """
+    violations = pd.concat((
+        pd.Series(name='Unscheduled', dtype=object, data=[
+            f'{abstracts.at[abstract]}'
+            for abstract in penalties.scheduled
+        ]),
+        pd.Series(name='Order', dtype=object, data=[
+            f'{abstracts.at[abstract]} ({penalty})'
+            for abstract, penalty in penalties.order
+        ]),
+        pd.Series(name='Abstract VS Session', dtype=object, data=[
+            f'{abstracts.at[abstract]} VS {sessions.at[session]}'
+            f' ({penalty})'
+            for abstract, session, penalty in penalties.sessions
+        ]),
+        pd.Series(name='Abstract VS Abstract', dtype=object, data=[
+            f'"{abstracts.at[abstract]}" VS "{abstracts.at[clash]}"'
+            f' in "{sessions.at[session]}"'
+            for abstract, clash, session in penalties.conflicts
+        ]),
+    ), axis=1)
+
+    counts = (
+        map(lambda _: 1, penalties.scheduled),
+        map(lambda p: p[1], penalties.order),
+        map(lambda p: p[2], penalties.sessions),
+        map(lambda p: 1, penalties.conflicts),
+    )
+    totals = pd.Series([f'Total = {sum(c)}' for c in counts],
+                       index=violations.columns)
+    return pd.concat((violations, totals.to_frame().T), ignore_index=True)
+
+
+class ViolationsFormatTest(unittest.TestCase):
+    """the vectorized violation tables match the f-string formatting"""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.streams = pd.Series([f'Stream{i}' for i in range(6)])
+        self.sessions = pd.Series([f'sess{i}' for i in range(4)])
+        self.rooms = pd.Series([f'room{i}' for i in range(3)])
+        self.abstracts = pd.Series([f'T{i}' for i in range(20)])
+
+    def items(self, names, count):
+        return [self.rng.randrange(len(names)) for _ in range(count)]
+
+    def costs(self, count):
+        return [float(self.rng.choice((1, 10, 100, 2.5)))
+                for _ in range(count)]
+
+    def streams_violations(self, count):
+        def rows(*columns):
+            return list(zip(*columns))
+        return StreamsViolations(
+            parallel=rows(self.items(self.streams, count),
+                          [np.float64(self.rng.randrange(1, 4)) / 2
+                           for _ in range(count)]),
+            number_of_rooms=rows(self.items(self.streams, count),
+                                 [self.rng.randrange(1, 3)
+                                  for _ in range(count)]),
+            streams_sessions=rows(self.items(self.streams, count),
+                                  self.items(self.sessions, count),
+                                  self.costs(count)),
+            streams_rooms=rows(self.items(self.streams, count),
+                               self.items(self.rooms, count),
+                               self.costs(count)),
+            sessions_rooms=rows(self.items(self.sessions, count),
+                                self.items(self.rooms, count),
+                                self.costs(count)),
+            streams_streams=rows(self.items(self.streams, count),
+                                 self.items(self.streams, count),
+                                 self.items(self.sessions, count),
+                                 self.costs(count)),
+            consecutive=rows(self.items(self.streams, count),
+                             self.items(self.rooms, count),
+                             [self.rng.randrange(1, 3)
+                              for _ in range(count)]),
+            scheduled=self.items(self.streams, count))
+
+    def abstracts_violations(self, count):
+        return AbstractsViolations(
+            scheduled=self.items(self.abstracts, count),
+            order=list(zip(self.items(self.abstracts, count),
+                           [self.rng.randrange(1, 4) for _ in range(count)])),
+            sessions=list(zip(self.items(self.abstracts, count),
+                              self.items(self.sessions, count),
+                              self.costs(count))),
+            conflicts=list(zip(self.items(self.abstracts, count),
+                               self.items(self.abstracts, count),
+                               self.items(self.sessions, count))))
+
+    def assert_same_table(self, table, expected):
+        pd.testing.assert_frame_equal(table.astype(object),
+                                      expected.astype(object),
+                                      check_column_type=False)
+
+    def test_streams_violations(self):
+        for count in (0, 1, 7):
+            with self.subTest(count=count):
+                penalties = self.streams_violations(count)
+                self.assert_same_table(
+                    format_streams_violations(penalties, self.streams,
+                                              self.sessions, self.rooms),
+                    reference_streams_violations(penalties, self.streams,
+                                                 self.sessions, self.rooms))
+
+    def test_abstracts_violations(self):
+        for count in (0, 1, 7):
+            with self.subTest(count=count):
+                penalties = self.abstracts_violations(count)
+                self.assert_same_table(
+                    format_abstracts_violations(penalties, self.abstracts,
+                                                self.sessions),
+                    reference_abstracts_violations(penalties, self.abstracts,
+                                                   self.sessions))
+
+    def test_uneven_columns(self):
+        """shorter columns are padded with missing values"""
+        penalties = self.streams_violations(5)._replace(
+            parallel=[], scheduled=[3], consecutive=[])
+        self.assert_same_table(
+            format_streams_violations(penalties, self.streams,
+                                      self.sessions, self.rooms),
+            reference_streams_violations(penalties, self.streams,
+                                         self.sessions, self.rooms))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from conference_scheduling.config import DEFAULT_WEIGHTS
+from conference_scheduling.differential import Case
+from conference_scheduling.exceptions import (
+    IncompatibleDimensionsError,
+    InvalidEditError,
+)
+from conference_scheduling.operators.buckets import abstracts_positions
+from conference_scheduling.scheduler.abstracts import best_fit_solution
+from conference_scheduling.repair import (
+    AddAbstract,
+    RemoveAbstract,
+    RemoveRoom,
+    read_edits,
+    repair_schedule,
+    solution_ids,
+    solution_shapes,
+)
+
+
+def saved_sheet(solution, names):
+    """a schedule as a sheet of names, None for the empty cells"""
+    names = list(names)
+    return pd.DataFrame([[names[item] if item != -1 else None
+                          for item in row]
+                         for row in solution.tolist()])
+
+
+class RepairTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        self.case = Case(3)
+        self.data = self.case.data
+        self.abstracts_solution = best_fit_solution(self.case.streams_solution,
+                                                    self.case.abstracts,
+                                                    self.data['streams'],
+                                                    self.case.sessions)
+        self.saved_streams = saved_sheet(self.case.streams_solution,
+                                         self.data['streams']['Streams'])
+        self.saved_abstracts = saved_sheet(self.abstracts_solution,
+                                           self.data['abstracts']['Reference'])
+
+    def repair(self, edits):
+        return repair_schedule(self.data, DEFAULT_WEIGHTS,
+                               self.saved_streams, self.saved_abstracts,
+                               edits, max_iters=20)
+
+    def test_solution_ids_round_trip(self):
+        streams_shape, abstracts_shape = solution_shapes(self.data)
+        np.testing.assert_array_equal(
+            solution_ids(self.saved_abstracts,
+                         list(self.data['abstracts']['Reference']),
+                         abstracts_shape),
+            self.abstracts_solution)
+        np.testing.assert_array_equal(
+            solution_ids(self.saved_streams,
+                         list(self.data['streams']['Streams']),
+                         streams_shape),
+            self.case.streams_solution)
+
+    def test_solution_ids_rejects_unknown_names(self):
+        saved = self.saved_streams.copy()
+        saved.iloc[0, 0] = 'no such stream'
+        with self.assertRaises(IncompatibleDimensionsError):
+            solution_ids(saved, list(self.data['streams']['Streams']))
+
+    def test_solution_ids_rejects_other_shapes(self):
+        streams_shape, _ = solution_shapes(self.data)
+        with self.assertRaises(IncompatibleDimensionsError):
+            solution_ids(self.saved_streams.iloc[:, 1:],
+                         list(self.data['streams']['Streams']),
+                         streams_shape)
+
+    def test_add_abstract_rejects_unknown_references(self):
+        stream = self.data['streams']['Streams'].iloc[0]
+        with self.assertRaises(InvalidEditError):
+            self.repair([AddAbstract('new', stream, 1,
+                                     session_costs={'no such session': 1})])
+        with self.assertRaises(InvalidEditError):
+            self.repair([AddAbstract('new', stream, 1,
+                                     clashes=['no such abstract'])])
+
+    def test_read_edits_rejects_unknown_edits(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'edits.json')
+            with open(path, 'w') as edits_file:
+                json.dump([{'edit': 'rename_room', 'room': 'room1'}],
+                          edits_file)
+            with self.assertRaises(InvalidEditError):
+                read_edits(path)
+
+    def test_remove_room_keeps_undisturbed_abstracts(self):
+        room = self.data['rooms']['Rooms'].iloc[0]
+        input_data, streams_scheduler, abstracts_scheduler = self.repair(
+            [RemoveRoom(room)])
+        num_rooms = self.case.streams_solution.shape[1] - 1
+        self.assertEqual(streams_scheduler.solution.shape[1], num_rooms)
+        self.assertEqual(abstracts_scheduler.solution.shape[1], num_rooms)
+        self.assertEqual(len(input_data['rooms'].index), num_rooms)
+
+        # the abstracts of streams that lost nothing stay in place
+        positions = abstracts_positions(abstracts_scheduler.solution)
+        movable = set(abstracts_scheduler._movable)
+        for abstract, published in abstracts_scheduler.published.items():
+            if abstract not in movable:
+                self.assertEqual(positions.get(abstract), published)
+
+    def test_remove_abstract_renumbers_the_schedule(self):
+        reference = self.data['abstracts']['Reference'].iloc[0]
+        input_data, _, abstracts_scheduler = self.repair(
+            [RemoveAbstract(reference)])
+        self.assertNotIn(reference, set(input_data['abstracts']['Reference']))
+        self.assertLess(abstracts_scheduler.solution.max(),
+                        len(input_data['abstracts'].index))
+
+
+if __name__ == '__main__':
+    unittest.main()
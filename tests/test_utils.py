@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from conference_scheduling.utils import run_lengths, column_run_lengths
+
+
+def naive_runs(column, breaks=()):
+    """the (start, length, value) of every run, one cell at a time"""
+    runs = []
+    for row, value in enumerate(column):
+        if runs and row not in breaks and runs[-1][2] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([row, 1, value])
+    return [tuple(run) for run in runs]
+
+
+class RunLengthsTest(unittest.TestCase):
+    def test_empty(self):
+        starts, lengths, values = run_lengths(np.array([], dtype=int))
+        self.assertEqual((len(starts), len(lengths), len(values)), (0, 0, 0))
+
+    def test_runs(self):
+        starts, lengths, values = run_lengths([-1, -1, 3, 3, 3, 5, -1])
+        self.assertEqual(list(starts), [0, 2, 5, 6])
+        self.assertEqual(list(lengths), [2, 3, 1, 1])
+        self.assertEqual(list(values), [-1, 3, 5, -1])
+
+    def test_random(self):
+        rng = np.random.RandomState(0)
+        for _ in range(100):
+            column = rng.randint(-1, 3, rng.randint(1, 15))
+            runs = list(zip(*(array.tolist()
+                              for array in run_lengths(column))))
+            self.assertEqual(runs, naive_runs(column.tolist()))
+
+
+class ColumnRunLengthsTest(unittest.TestCase):
+    def check(self, array, breaks=()):
+        starts, lengths, values, columns = column_run_lengths(array, breaks)
+        expected = [(column, *run)
+                    for column in range(array.shape[1])
+                    for run in naive_runs(array[:, column].tolist(), breaks)]
+        self.assertEqual(list(zip(columns.tolist(), starts.tolist(),
+                                  lengths.tolist(), values.tolist())),
+                         expected)
+
+    def test_empty(self):
+        for shape in [(0, 3), (3, 0)]:
+            runs = column_run_lengths(np.zeros(shape, dtype=int))
+            self.assertTrue(all(len(array) == 0 for array in runs))
+
+    def test_runs_do_not_span_columns(self):
+        self.check(np.array([[1, 1], [1, 1]]))
+        self.check(np.array([[2], [2], [2]]))
+
+    def test_random(self):
+        rng = np.random.RandomState(0)
+        for _ in range(100):
+            array = rng.randint(-1, 2, (rng.randint(1, 10), rng.randint(1, 5)))
+            breaks = sorted(set(rng.randint(0, array.shape[0] + 1,
+                                            rng.randint(0, 4)).tolist()))
+            self.check(array, breaks)
+
+
+if __name__ == '__main__':
+    unittest.main()
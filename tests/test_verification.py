@@ -0,0 +1,91 @@
+import random
+import unittest
+from collections import namedtuple
+import numpy as np
+from conference_scheduling.config import DEFAULT_WEIGHTS
+from conference_scheduling.differential import Case
+from conference_scheduling.exceptions import EvaluationDriftError
+from conference_scheduling.heuristics import slot_tabu_search
+from conference_scheduling.scheduler import AbstractsScheduler
+from conference_scheduling.verification import DriftCheck
+
+Penalties = namedtuple('Penalties', ['total', 'scheduled'])
+
+
+def evaluate(solution):
+    return Penalties(float(solution[solution != -1].sum()),
+                     float(np.count_nonzero(solution != -1)))
+
+
+def partial_evaluate(solution, changes):
+    items, timeslots, rooms = changes
+    old = solution[timeslots, rooms]
+    new = np.asarray(items)
+    return Penalties(float(new[new != -1].sum() - old[old != -1].sum()),
+                     float(np.count_nonzero(new != -1)
+                           - np.count_nonzero(old != -1)))
+
+
+def drifting_partial_evaluate(solution, changes):
+    """miscounts the scheduled items of every change into cell (0, 0)"""
+    penalties = partial_evaluate(solution, changes)
+    if (0, 0) in zip(changes[1], changes[2]):
+        return penalties._replace(scheduled=penalties.scheduled + 1)
+    return penalties
+
+
+def moves(solution, count, rng):
+    """random single cell changes, the last one into cell (0, 0)"""
+    for i in range(count):
+        if i == count - 1:
+            timeslot, room = 0, 0
+        else:
+            timeslot = rng.randrange(1, solution.shape[0])
+            room = rng.randrange(solution.shape[1])
+        yield ([rng.randrange(-1, 5)], [timeslot], [room])
+
+
+class DriftCheckTest(unittest.TestCase):
+    def run_moves(self, check, count=20):
+        rng = random.Random(0)
+        solution = np.full((4, 3), -1)
+        check.begin(solution)
+        for changes in moves(solution, count, rng):
+            check.accept(solution, changes)
+            solution[changes[1], changes[2]] = changes[0]
+        return solution
+
+    def test_consistent_evaluation(self):
+        check = DriftCheck(evaluate, partial_evaluate, period=3)
+        solution = self.run_moves(check)
+        check.verify(solution)
+        self.assertGreater(check.verifications, 1)
+
+    def test_drift_names_the_move_and_component(self):
+        check = DriftCheck(evaluate, drifting_partial_evaluate, period=5)
+        with self.assertRaises(EvaluationDriftError) as raised:
+            solution = self.run_moves(check, count=7)
+            check.verify(solution)
+        error = raised.exception
+        self.assertEqual(error.component, 'scheduled')
+        self.assertEqual((error.changes[1], error.changes[2]), ([0], [0]))
+        self.assertEqual(error.actual, error.expected + 1)
+
+    def test_abstracts_search_does_not_drift(self):
+        random.seed(0)
+        np.random.seed(0)
+        case = Case(3)
+        scheduler = AbstractsScheduler(case.data, DEFAULT_WEIGHTS,
+                                       case.streams_solution)
+        scheduler.initialize(best_fit=True)
+        scheduler.verify(period=1)
+        scheduler.improve(slot_tabu_search,
+                          neighbourhood=scheduler.feasible_neighbourhood,
+                          explore_size=10,
+                          min_iters=20,
+                          max_iters=20)
+        self.assertGreater(scheduler._drift_check.verifications, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
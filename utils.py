@@ -1,150 +1,6 @@
 import sys
-from itertools import dropwhile, takewhile
 import numpy as np
 import pandas as pd
-from .config import (
-    SOLUTION_STREAMS_SHEET,
-    SOLUTION_ABSTRACTS_SHEET,
-    SOLUTION_STREAMS_VIOLATIONS_SHEET,
-    SOLUTION_ABSTRACTS_VIOLATIONS_SHEET,
-)
-
-
-def write_schedule(path,
-                   streams_scheduler, abstracts_scheduler,
-                   abstracts_df, streams_df, sessions_df, rooms_df):
-    streams_solution = streams_scheduler.solution
-    abstracts_solution = abstracts_scheduler.solution
-    streams = streams_df['Streams']
-    abstracts = abstracts_df['Reference']
-    rooms = rooms_df['Rooms']
-
-    sessions = sessions_df['Sessions']
-    streams_schedule = pd.DataFrame(
-        streams.to_numpy()[streams_solution].reshape(streams_solution.shape),
-        index=sessions,
-        columns=rooms
-    ).mask(streams_solution == -1)
-
-    timeslots = [sessions_df.at[session, 'Sessions']
-                 for session in timeslot_to_session_map(sessions_df)]
-    abstracts_schedule = pd.DataFrame(
-        abstracts.to_numpy()[abstracts_solution].reshape(
-            abstracts_solution.shape),
-        index=timeslots,
-        columns=rooms
-    ).mask(abstracts_solution == -1)
-
-    streams_violations = format_streams_violations(
-        streams_scheduler.violations,
-        streams,
-        sessions,
-        rooms)
-    abstracts_violations = format_abstracts_violations(
-        abstracts_scheduler.violations,
-        abstracts,
-        sessions)
-
-    with pd.ExcelWriter(path, mode='w') as writer:  # pylint: disable=abstract-class-instantiated
-        streams_schedule.to_excel(
-            writer,
-            SOLUTION_STREAMS_SHEET)
-        abstracts_schedule.to_excel(
-            writer,
-            SOLUTION_ABSTRACTS_SHEET)
-        streams_violations.to_excel(
-            writer,
-            SOLUTION_STREAMS_VIOLATIONS_SHEET)
-        abstracts_violations.to_excel(
-            writer,
-            SOLUTION_ABSTRACTS_VIOLATIONS_SHEET)
-
-
-def format_streams_violations(penalties, streams, sessions, rooms):
-    violations = pd.concat((
-        pd.Series(name='Stream VS Session', data=[
-            f'"{streams.at[stream]}" VS "{sessions.at[session]}" ({penalty})'
-            for stream, session, penalty in penalties.streams_sessions
-        ]),
-        pd.Series(name='Stream VS Room', data=[
-            f'"{streams.at[stream]}" VS "{rooms.at[room]}" ({penalty})'
-            for stream, room, penalty in penalties.streams_rooms
-        ]),
-        pd.Series(name='Session VS Room', data=[
-            f'"{sessions.at[session]}" VS "{rooms.at[room]}" ({penalty})'
-            for session, room, penalty in penalties.sessions_rooms
-        ]),
-        pd.Series(name='Stream VS Stream', data=[
-            f'"{streams.at[stream]}" VS "{streams.at[other]}"'
-            f' in "{sessions.at[session]}" ({penalty})'
-            for stream, other, session, penalty in penalties.streams_streams
-        ]),
-        pd.Series(name='Parallel', data=[
-            f'{streams.at[stream]} ({penalty})'
-            for stream, penalty in penalties.parallel
-        ]),
-        pd.Series(name='Unscheduled', data=[
-            f'{streams.at[stream]}'
-            for stream in penalties.scheduled
-        ]),
-        pd.Series(name='Number of Rooms', data=[
-            f'{streams.at[stream]} ({penalty})'
-            for stream, penalty in penalties.number_of_rooms
-        ]),
-        pd.Series(name='Non-Consecutive Sessions', data=[
-            f'"{streams.at[stream]}" in "{rooms.at[room]}" ({penalty})'
-            for stream, room, penalty in penalties.consecutive
-        ]),
-    ), axis=1)
-
-    counts = (
-        map(lambda p: p[2], penalties.streams_sessions),
-        map(lambda p: p[2], penalties.streams_rooms),
-        map(lambda p: p[2], penalties.sessions_rooms),
-        map(lambda p: p[3], penalties.streams_streams),
-        map(lambda p: p[1], penalties.parallel),
-        map(lambda _: 1, penalties.scheduled),
-        map(lambda p: p[1], penalties.number_of_rooms),
-        map(lambda p: p[2], penalties.consecutive),
-    )
-
-    totals = pd.Series([f'Total = {sum(c)}' for c in counts],
-                       index=violations.columns)
-
-    return violations.append(totals, ignore_index=True)
-
-
-def format_abstracts_violations(penalties, abstracts, sessions):
-    violations = pd.concat((
-        pd.Series(name='Unscheduled', data=[
-            f'{abstracts.at[abstract]}'
-            for abstract in penalties.scheduled
-        ]),
-        pd.Series(name='Order', data=[
-            f'{abstracts.at[abstract]} ({penalty})'
-            for abstract, penalty in penalties.order
-        ]),
-        pd.Series(name='Abstract VS Session', data=[
-            f'{abstracts.at[abstract]} VS {sessions.at[session]}'
-            f' ({penalty})'
-            for abstract, session, penalty in penalties.sessions
-        ]),
-        pd.Series(name='Abstract VS Abstract', data=[
-            f'"{abstracts.at[abstract]}" VS "{abstracts.at[clash]}"'
-            f' in "{sessions.at[session]}"'
-            for abstract, clash, session in penalties.conflicts
-        ]),
-    ), axis=1)
-
-    counts = (
-        map(lambda _: 1, penalties.scheduled),
-        map(lambda p: p[1], penalties.order),
-        map(lambda p: p[2], penalties.sessions),
-        map(lambda p: 1, penalties.conflicts),
-    )
-    totals = pd.Series([f'Total = {sum(c)}' for c in counts],
-                       index=violations.columns)
-    return violations.append(totals, ignore_index=True)
 
 
 def get_stream_timeslots(stream, all_abstracts):
@@ -211,33 +67,54 @@ def session_to_timeslots_map(sessions):
     return list(zip(start_slots, finish_slots))
 
 
+def session_days(sessions):
+    """the day of every session, sessions without a 'Day' column
+    all belong to a single day
+    """
+    if 'Day' not in sessions.columns:
+        return pd.Series(0, index=sessions.index)
+    return sessions['Day']
+
+
 def arreq_in_list(myarr, list_arrays):
     return next((True for elem in list_arrays if np.array_equal(elem, myarr)), False)
 
 
-def unscheduled_1d(iterable):
-
-    iterator = enumerate(iterable)
-    while True:
-        iterator = dropwhile(lambda x: x[1] != -1, iterator)
-        empty = [index
-                 for index, _ in takewhile(lambda x: x[1] == -1, iterator)]
-        if empty:
-            yield empty[0], len(empty)
-        else:
-            break
-
-
-def scheduled_1d(iterable):
-    iterator = enumerate(iterable)
-    while True:
-        iterator = dropwhile(lambda x: x[1] == -1, iterator)
-        scheduled = list(takewhile(lambda x: x[1] != -1, iterator))
-        if not scheduled:
-            break
-        while scheduled:
-            index, item = scheduled[0]
-            consecutive = list(takewhile(lambda x: x[1] == item, scheduled))
-            length = len(consecutive)
-            yield index, length
-            scheduled = scheduled[length:]
+def run_lengths(column):
+    """Run-length encodes a 1-D array,
+    returns the start, length and value of every run
+    """
+    column = np.asarray(column)
+    if len(column) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, column[:0]
+    starts = np.flatnonzero(column[1:] != column[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.append(starts, len(column)))
+    return starts, lengths, column[starts]
+
+
+def column_run_lengths(array, breaks=()):
+    """Run-length encodes every column of a 2-D array at once,
+    returns the start, length, value and column of every run,
+    ordered by column then start. Runs never span two columns,
+    and a new run always starts at the rows in `breaks`
+    """
+    array = np.asarray(array)
+    num_rows, num_columns = array.shape
+    if num_rows == 0 or num_columns == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, array.ravel()[:0], empty
+    flat = array.T.ravel()
+    changes = flat[1:] != flat[:-1]
+    # a new column always starts a new run
+    changes[num_rows - 1::num_rows] = True
+    rows = np.asarray(breaks, dtype=np.int64)
+    rows = rows[(rows > 0) & (rows < num_rows)]
+    if len(rows) > 0:
+        column_starts = np.arange(num_columns) * num_rows
+        changes[(column_starts[:, None] + rows[None, :] - 1).ravel()] = True
+    starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+    lengths = np.diff(np.append(starts, len(flat)))
+    columns, starts_in_column = np.divmod(starts, num_rows)
+    return starts_in_column, lengths, flat[starts], columns
@@ -0,0 +1,122 @@
+"""
+Verification of the incremental evaluation: the component deltas of
+the accepted moves of a local search are summed into a running score,
+which is compared with a full evaluation on a schedule
+"""
+import random
+from contextlib import contextmanager
+import numpy as np
+from .operators import apply_changes
+from .exceptions import EvaluationDriftError
+
+# the drift check of the local searches, None when verification is off
+_active = None
+
+
+class DriftCheck:
+    """Keeps the running per-component score of a search and compares
+    it with `evaluate` every `period` accepted moves, or after every
+    accepted move with probability `probability`. On a mismatch the
+    moves since the last comparison are replayed one by one to find
+    the offending move and component, and EvaluationDriftError is raised
+    """
+
+    def __init__(self, evaluate, partial_evaluate,
+                 period=None, probability=None, tolerance=1e-6):
+        self.period = period
+        self.probability = probability
+        self.tolerance = tolerance
+        self.verifications = 0
+        self._evaluate = evaluate
+        self._partial_evaluate = partial_evaluate
+        self._running = None
+        self._checkpoint = None
+        self._moves = []
+        self._fields = None
+
+    def begin(self, solution):
+        self._running = self._components(self._evaluate(solution))
+        self._checkpoint = np.copy(solution)
+        self._moves = []
+
+    def accept(self, solution, changes):
+        """adds the deltas of the changes, about to be applied to
+        `solution`, and verifies the result when it is due
+        """
+        self._running += self._components(
+            self._partial_evaluate(solution, changes))
+        self._moves.append(changes)
+        if self._due():
+            self.verify(apply_changes(solution, changes, inplace=False))
+
+    def verify(self, solution):
+        self.verifications += 1
+        expected = self._components(self._evaluate(solution))
+        if np.allclose(self._running, expected,
+                       rtol=0, atol=self.tolerance):
+            self._checkpoint = np.copy(solution)
+            self._moves = []
+            return
+        self._replay()
+        # the moves are consistent one by one, the drift is in the sum
+        component = int(np.argmax(np.abs(self._running - expected)))
+        raise EvaluationDriftError(self._moves[-1],
+                                   self._name(component),
+                                   expected[component],
+                                   self._running[component])
+
+    def _due(self):
+        if self.period is not None and len(self._moves) >= self.period:
+            return True
+        return (self.probability is not None
+                and random.random() < self.probability)
+
+    def _replay(self):
+        """raises for the first move since the last verification whose
+        deltas differ from the difference of the full evaluations
+        """
+        solution = self._checkpoint
+        before = self._components(self._evaluate(solution))
+        for changes in self._moves:
+            delta = self._components(self._partial_evaluate(solution,
+                                                            changes))
+            solution = apply_changes(solution, changes, inplace=False)
+            after = self._components(self._evaluate(solution))
+            drift = np.abs(before + delta - after)
+            if np.any(drift > self.tolerance):
+                component = int(np.argmax(drift))
+                raise EvaluationDriftError(changes,
+                                           self._name(component),
+                                           after[component],
+                                           before[component]
+                                           + delta[component])
+            before = after
+
+    def _components(self, penalties):
+        self._fields = getattr(penalties, '_fields', self._fields)
+        return np.array(penalties, dtype=float)
+
+    def _name(self, component):
+        if self._fields is None:
+            return str(component)
+        return self._fields[component]
+
+
+@contextmanager
+def verifying(check):
+    """verifies the local searches with `check` while inside the block,
+    verification carries on with the current check when `check` is None
+    """
+    global _active  # pylint: disable=global-statement
+    if check is None:
+        yield _active
+        return
+    previous, _active = _active, check
+    try:
+        yield check
+    finally:
+        _active = previous
+
+
+def active_check():
+    return _active
@@ -0,0 +1,254 @@
+"""
+Writers of the schedules and their violations. The format follows the
+extension of the output path: an Excel workbook (.xlsx), a JSON
+document (.json), a directory of Parquet files (.parquet) or, without
+an extension, a directory of CSV files, with a file per sheet
+"""
+import json
+import os
+import numpy as np
+import pandas as pd
+import openpyxl
+from .utils import timeslot_to_session_map
+from .config import (
+    SOLUTION_STREAMS_SHEET,
+    SOLUTION_ABSTRACTS_SHEET,
+    SOLUTION_STREAMS_VIOLATIONS_SHEET,
+    SOLUTION_ABSTRACTS_VIOLATIONS_SHEET,
+)
+
+
+def write_schedule(path,
+                   streams_scheduler, abstracts_scheduler,
+                   abstracts_df, streams_df, sessions_df, rooms_df):
+    write_tables(path, schedule_tables(streams_scheduler,
+                                       abstracts_scheduler,
+                                       abstracts_df, streams_df,
+                                       sessions_df, rooms_df))
+
+
+def schedule_tables(streams_scheduler, abstracts_scheduler,
+                    abstracts_df, streams_df, sessions_df, rooms_df):
+    """the schedules and their violations by sheet name"""
+    tables = schedule_frames(streams_scheduler.solution,
+                             abstracts_scheduler.solution,
+                             abstracts_df, streams_df,
+                             sessions_df, rooms_df)
+    tables[SOLUTION_STREAMS_VIOLATIONS_SHEET] = format_streams_violations(
+        streams_scheduler.violations,
+        streams_df['Streams'],
+        sessions_df['Sessions'],
+        rooms_df['Rooms'])
+    tables[SOLUTION_ABSTRACTS_VIOLATIONS_SHEET] = format_abstracts_violations(
+        abstracts_scheduler.violations,
+        abstracts_df['Reference'],
+        sessions_df['Sessions'])
+    return tables
+
+
+def schedule_frames(streams_solution, abstracts_solution,
+                    abstracts_df, streams_df, sessions_df, rooms_df):
+    """the streams and abstracts schedules by sheet name, as tables of
+    the names of the scheduled items, without the abstracts schedule
+    when `abstracts_solution` is None
+    """
+    rooms = rooms_df['Rooms']
+    sessions = sessions_df['Sessions']
+    schedules = {SOLUTION_STREAMS_SHEET: pd.DataFrame(
+        streams_df['Streams'].to_numpy()[streams_solution],
+        index=sessions,
+        columns=rooms
+    ).mask(streams_solution == -1)}
+    if abstracts_solution is None:
+        return schedules
+
+    timeslots = sessions.to_numpy()[timeslot_to_session_map(sessions_df)]
+    schedules[SOLUTION_ABSTRACTS_SHEET] = pd.DataFrame(
+        abstracts_df['Reference'].to_numpy()[abstracts_solution],
+        index=timeslots,
+        columns=rooms
+    ).mask(abstracts_solution == -1)
+    return schedules
+
+
+def format_streams_violations(penalties, streams, sessions, rooms):
+    streams, sessions, rooms = _names(streams), _names(sessions), _names(rooms)
+    streams_sessions = _table(penalties.streams_sessions,
+                              ('stream', 'session', 'penalty'))
+    streams_rooms = _table(penalties.streams_rooms,
+                           ('stream', 'room', 'penalty'))
+    sessions_rooms = _table(penalties.sessions_rooms,
+                            ('session', 'room', 'penalty'))
+    streams_streams = _table(penalties.streams_streams,
+                             ('stream', 'other', 'session', 'penalty'))
+    parallel = _table(penalties.parallel, ('stream', 'penalty'))
+    scheduled = _table(penalties.scheduled, ('stream',))
+    number_of_rooms = _table(penalties.number_of_rooms, ('stream', 'penalty'))
+    consecutive = _table(penalties.consecutive, ('stream', 'room', 'penalty'))
+
+    columns = {
+        'Stream VS Session': (
+            '"' + streams[streams_sessions['stream']]
+            + '" VS "' + sessions[streams_sessions['session']]
+            + '" (' + _text(streams_sessions['penalty']) + ')',
+            streams_sessions['penalty']),
+        'Stream VS Room': (
+            '"' + streams[streams_rooms['stream']]
+            + '" VS "' + rooms[streams_rooms['room']]
+            + '" (' + _text(streams_rooms['penalty']) + ')',
+            streams_rooms['penalty']),
+        'Session VS Room': (
+            '"' + sessions[sessions_rooms['session']]
+            + '" VS "' + rooms[sessions_rooms['room']]
+            + '" (' + _text(sessions_rooms['penalty']) + ')',
+            sessions_rooms['penalty']),
+        'Stream VS Stream': (
+            '"' + streams[streams_streams['stream']]
+            + '" VS "' + streams[streams_streams['other']]
+            + '" in "' + sessions[streams_streams['session']]
+            + '" (' + _text(streams_streams['penalty']) + ')',
+            streams_streams['penalty']),
+        'Parallel': (
+            streams[parallel['stream']]
+            + ' (' + _text(parallel['penalty']) + ')',
+            parallel['penalty']),
+        'Unscheduled': (
+            streams[scheduled['stream']],
+            np.ones(len(scheduled['stream']), dtype=int)),
+        'Number of Rooms': (
+            streams[number_of_rooms['stream']]
+            + ' (' + _text(number_of_rooms['penalty']) + ')',
+            number_of_rooms['penalty']),
+        'Non-Consecutive Sessions': (
+            '"' + streams[consecutive['stream']]
+            + '" in "' + rooms[consecutive['room']]
+            + '" (' + _text(consecutive['penalty']) + ')',
+            consecutive['penalty']),
+    }
+    return _violations_frame(columns)
+
+
+def format_abstracts_violations(penalties, abstracts, sessions):
+    abstracts, sessions = _names(abstracts), _names(sessions)
+    scheduled = _table(penalties.scheduled, ('abstract',))
+    order = _table(penalties.order, ('abstract', 'penalty'))
+    abstracts_sessions = _table(penalties.sessions,
+                                ('abstract', 'session', 'penalty'))
+    conflicts = _table(penalties.conflicts, ('abstract', 'clash', 'session'))
+
+    columns = {
+        'Unscheduled': (
+            abstracts[scheduled['abstract']],
+            np.ones(len(scheduled['abstract']), dtype=int)),
+        'Order': (
+            abstracts[order['abstract']]
+            + ' (' + _text(order['penalty']) + ')',
+            order['penalty']),
+        'Abstract VS Session': (
+            abstracts[abstracts_sessions['abstract']]
+            + ' VS ' + sessions[abstracts_sessions['session']]
+            + ' (' + _text(abstracts_sessions['penalty']) + ')',
+            abstracts_sessions['penalty']),
+        'Abstract VS Abstract': (
+            '"' + abstracts[conflicts['abstract']]
+            + '" VS "' + abstracts[conflicts['clash']]
+            + '" in "' + sessions[conflicts['session']] + '"',
+            np.ones(len(conflicts['abstract']), dtype=int)),
+    }
+    return _violations_frame(columns)
+
+
+def _names(names):
+    """the names as an object array, which concatenates with strings"""
+    return names.astype(str).to_numpy(dtype=object)
+
+
+def _table(violations, fields):
+    """the fields of the violations as arrays"""
+    array = np.array(violations, dtype=object).reshape(-1, len(fields))
+    table = {}
+    for column, field in enumerate(fields):
+        values = array[:, column].tolist()
+        table[field] = (np.array(values) if field == 'penalty'
+                        else np.array(values, dtype=int))
+    return table
+
+
+def _text(penalties):
+    """the penalties as they print"""
+    return penalties.astype(str).astype(object)
+
+
+def _violations_frame(columns):
+    """the violations of every column one below the other,
+    followed by the total of each column
+    """
+    violations = pd.concat([pd.Series(name=name, data=labels)
+                            for name, (labels, _penalties) in columns.items()],
+                           axis=1)
+    totals = pd.DataFrame([[f'Total = {sum(penalties.tolist())}'
+                            for _labels, penalties in columns.values()]],
+                          columns=violations.columns)
+    return pd.concat((violations, totals), ignore_index=True)
+
+
+def write_tables(path, tables):
+    """writes the tables in the format of the extension of `path`"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Cannot write {path}: the supported extensions"
+                         f" are {', '.join(ext for ext in WRITERS if ext)}"
+                         f" or none for a directory of CSV files")
+    WRITERS[extension](path, tables)
+
+
+def write_excel(path, tables):
+    """writes the tables to a workbook in openpyxl's write-only mode,
+    which streams the rows rather than building every cell
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet, table in tables.items():
+        worksheet = workbook.create_sheet(sheet)
+        worksheet.append([table.index.name, *table.columns])
+        for label, row in zip(table.index.tolist(), _rows(table)):
+            worksheet.append([label, *row])
+    workbook.save(path)
+
+
+def write_csv(path, tables):
+    os.makedirs(path, exist_ok=True)
+    for sheet, table in tables.items():
+        table.to_csv(os.path.join(path, f'{sheet}.csv'))
+
+
+def write_parquet(path, tables):
+    """writes a Parquet file per table, needs pyarrow or fastparquet"""
+    os.makedirs(path, exist_ok=True)
+    for sheet, table in tables.items():
+        table.rename(columns=str).to_parquet(
+            os.path.join(path, f'{sheet}.parquet'))
+
+
+def write_json(path, tables):
+    """writes a document mapping every sheet to its index,
+    columns and rows
+    """
+    document = {sheet: {'index': table.index.tolist(),
+                        'columns': table.columns.tolist(),
+                        'data': _rows(table)}
+                for sheet, table in tables.items()}
+    with open(path, 'w') as output_file:
+        json.dump(document, output_file)
+
+
+def _rows(table):
+    """the rows of the table as lists, with None for missing values"""
+    return table.astype(object).where(table.notna(), None).to_numpy().tolist()
+
+
+WRITERS = {
+    '.xlsx': write_excel,
+    '.json': write_json,
+    '.parquet': write_parquet,
+    '': write_csv,
+}